@@ -3,6 +3,12 @@
 # Number of unique teams a player must be selected in to be considered "hot".
 HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD: int = 10
 
+# Contest points multipliers applied to the captain and vice-captain of a team.
+CAPTAIN_MULTIPLIER: float = 2.0
+VICE_CAPTAIN_MULTIPLIER: float = 1.5
+
 __all__ = [
     "HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD",
+    "CAPTAIN_MULTIPLIER",
+    "VICE_CAPTAIN_MULTIPLIER",
 ]
@@ -0,0 +1,24 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from pymongo import IndexModel
+
+from app.utils.timezone import now_ist
+
+
+class CacheVersion(Document):
+    """Version counter of one in-process cache, shared by every worker.
+
+    Writers bump ``version``; workers compare it with the version they loaded
+    and reload when it moved.
+    """
+
+    key: str
+    version: int = 0
+    updated_at: datetime = Field(default_factory=now_ist)
+
+    class Settings:
+        name = "cache_versions"
+        indexes = [
+            IndexModel([("key", 1)], unique=True, name="key_unique"),
+        ]
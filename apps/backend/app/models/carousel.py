@@ -29,6 +29,8 @@ class CarouselImage(Document):
             [(("created_at", -1))],
             # Compound index for efficient querying of active images by order
             IndexModel([("active", 1), ("display_order", 1)]),
+            # Keyset paging of the public list
+            IndexModel([("active", 1), ("display_order", 1), ("created_at", 1), ("_id", 1)]),
         ]
 
     def __repr__(self):
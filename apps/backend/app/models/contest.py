@@ -25,7 +25,8 @@ class Contest(Document):
     status: ContestStatus = ContestStatus.LIVE
     visibility: ContestVisibility = ContestVisibility.PUBLIC
 
-    # points calculation mode (phase 1 uses baseline; ledger can come later)
+    # points calculation mode: TIME_WINDOW contests are fed from the points event
+    # ledger (events inside start_at..end_at); SNAPSHOT contests are set by admins
     points_scope: PointsScope = PointsScope.TIME_WINDOW
 
     # type of contest: daily or full tournament
@@ -33,6 +34,18 @@ class Contest(Document):
     # list of allowed real-world team names (Player.team) for daily contests
     allowed_teams: List[str] = Field(default_factory=list)
 
+    # bumped whenever the set of enrolled lineups changes (enrollments, team edits);
+    # in-process scoring caches are keyed on it so every worker sees the same lineups
+    lineup_version: int = 0
+    # bumped whenever contest player points are written; together with lineup_version
+    # it identifies one leaderboard snapshot (cache key and ETag)
+    points_version: int = 0
+    # bumped when leaderboard entries change without a score change (team renames,
+    # rank snapshots); part of the leaderboard ETag only, so scoring caches stay valid
+    display_version: int = 0
+    # leaderboard version last materialized onto enrollments (contest_points / rank)
+    standings_version: Optional[str] = None
+
     created_at: datetime = Field(default_factory=now_ist)
     updated_at: datetime = Field(default_factory=now_ist)
 
@@ -43,5 +56,7 @@ class Contest(Document):
             [("start_at", 1)],
             [("end_at", 1)],
             [("status", 1), ("start_at", -1)],
+            [("visibility", 1), ("start_at", -1), ("_id", -1)],  # Keyset paging of public contests
+            [("start_at", -1), ("_id", -1)],  # Keyset paging of the admin list
             [("contest_type", 1)],
         ]
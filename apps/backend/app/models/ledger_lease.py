@@ -0,0 +1,22 @@
+from beanie import Document, PydanticObjectId
+from datetime import datetime
+from pymongo import IndexModel
+
+
+class LedgerLease(Document):
+    """Lease on one player's points ledger entries, shared by every worker.
+
+    The worker whose ``owner`` token is stored may append events for the
+    player and rebuild their prefix sums until ``expires_at``. Leases are
+    deleted when the batch is done; an expired one may be taken over.
+    """
+
+    player_id: PydanticObjectId
+    owner: PydanticObjectId
+    expires_at: datetime
+
+    class Settings:
+        name = "ledger_leases"
+        indexes = [
+            IndexModel([("player_id", 1)], unique=True, name="player_id_unique"),
+        ]
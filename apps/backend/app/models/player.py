@@ -40,6 +40,7 @@ class Player(Document):
             "slot",
             [("points", -1)],  # Descending order for leaderboard
             [("price", 1)],
+            [("updated_at", -1)],  # player catalog points sync
         ]
 
     def __repr__(self):
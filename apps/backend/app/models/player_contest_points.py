@@ -1,4 +1,5 @@
 from beanie import Document, PydanticObjectId, Indexed
+from pymongo import IndexModel
 from pydantic import Field
 from datetime import datetime
 
@@ -21,5 +22,6 @@ class PlayerContestPoints(Document):
         indexes = [
             "player_id",
             "contest_id",
-            [("contest_id", 1), ("player_id", 1)],  # for lookups in a contest
+            # one document per player per contest; lets points writes upsert idempotently
+            IndexModel([("contest_id", 1), ("player_id", 1)], unique=True, name="contest_player_unique"),
         ]
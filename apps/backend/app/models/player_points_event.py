@@ -0,0 +1,40 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel
+
+from app.utils.timezone import now_ist
+
+
+class PlayerPointsEvent(Document):
+    """Append-only ledger entry: points a player scored in one scoring event.
+
+    ``cumulative`` is the player's running total up to and including this event
+    (ordered by ``occurred_at``, then ``_id``), so the points of any time window
+    are the difference of two prefix sums.
+    """
+
+    player_id: PydanticObjectId
+    points: float
+    occurred_at: datetime = Field(default_factory=now_ist)
+    cumulative: float = 0.0
+
+    # optional feed-supplied identifier; replays of the same event are ignored
+    event_id: Optional[str] = None
+    source: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=now_ist)
+
+    class Settings:
+        name = "player_points_events"
+        indexes = [
+            [("player_id", 1), ("occurred_at", -1), ("_id", -1)],  # prefix sum lookups
+            [("occurred_at", -1)],
+            IndexModel(
+                [("event_id", 1)],
+                unique=True,
+                name="event_id_unique",
+                partialFilterExpression={"event_id": {"$type": "string"}},
+            ),
+        ]
@@ -0,0 +1,35 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from datetime import datetime
+from typing import Optional, List
+
+from app.utils.timezone import now_ist
+
+
+class RankSnapshot(Document):
+    """Compact rank array of one leaderboard at one point in time.
+
+    Large leaderboards are split into chunks (documents sharing
+    ``snapshot_id``) to stay under the BSON document size limit.
+    ``team_ids[i]`` held rank ``offset + i + 1`` with ``points[i]`` when the
+    snapshot was taken. ``contest_id`` is None for the global leaderboard.
+    """
+
+    contest_id: Optional[PydanticObjectId] = None
+    # Contest leaderboard version (lineup_version.points_version) the ranks were computed from
+    version: Optional[str] = None
+    # shared by the chunks of one snapshot; None for snapshots stored as one document
+    snapshot_id: Optional[PydanticObjectId] = None
+    # ranks before this chunk; the chunk with offset 0 heads the snapshot
+    offset: int = 0
+    team_ids: List[PydanticObjectId] = []
+    points: List[float] = []
+
+    taken_at: datetime = Field(default_factory=now_ist)
+
+    class Settings:
+        name = "rank_snapshots"
+        indexes = [
+            [("contest_id", 1), ("taken_at", -1)],
+            [("snapshot_id", 1), ("offset", 1)],
+        ]
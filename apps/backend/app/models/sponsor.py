@@ -42,6 +42,8 @@ class Sponsor(Document):
             "tier",
             [("display_order", 1)],
             [("created_at", -1)],
+            # Keyset paging of the public list
+            IndexModel([("active", 1), ("priority", 1), ("created_at", -1), ("_id", -1)]),
             # Enforce uniqueness of priority per group (featured vs non-featured)
             # Partial index so it only applies when priority > 0 (before migration many docs have 0)
             IndexModel([("featured", 1), ("priority", 1)], unique=True, partialFilterExpression={"priority": {"$gt": 0}}),
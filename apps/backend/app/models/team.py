@@ -16,7 +16,7 @@ class Team(Document):
     
     user_id: PydanticObjectId  # Reference to User._id
     team_name: str
-    player_ids: List[str] = []  # List of selected player IDs
+    player_ids: List[PydanticObjectId] = []  # Selected Player._id values (legacy documents may hold strings)
     captain_id: Optional[str] = None
     vice_captain_id: Optional[str] = None
     total_points: float = 0.0
@@ -24,6 +24,7 @@ class Team(Document):
     rank: Optional[int] = None
     rank_change: Optional[int] = None  # positive = moved up, negative = moved down
     contest_id: Optional[str] = None  # Optional: reference to a contest
+    lineup_hash: Optional[str] = None  # Fingerprint of players + C/VC (app/utils/lineup.py)
     
     # Metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -34,6 +35,9 @@ class Team(Document):
         indexes = [
             "user_id",
             [("total_points", -1)],  # Descending order for leaderboard
+            [("total_points", -1), ("_id", 1)],  # Stable paging of the global leaderboard
             [("created_at", -1)],
+            [("user_id", 1), ("created_at", -1), ("_id", -1)],  # Keyset paging of a user's teams
             [("player_ids", 1)],  # Multikey index to speed up selection lookups
+            [("lineup_hash", 1)],  # Identical lineup lookups
         ]
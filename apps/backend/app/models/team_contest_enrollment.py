@@ -16,6 +16,12 @@ class TeamContestEnrollment(Document):
     enrolled_at: datetime = Field(default_factory=datetime.utcnow)
     removed_at: Optional[datetime] = None
 
+    # Contest standing, maintained by the scoring path (see services/scoring/standings.py)
+    contest_points: float = 0.0
+    rank: Optional[int] = None
+    # Move between the two latest rank snapshots
+    rank_change: Optional[int] = None  # positive = moved up, negative = moved down
+
     class Settings:
         name = "team_contest_enrollments"
         indexes = [
@@ -24,4 +30,6 @@ class TeamContestEnrollment(Document):
             "user_id",
             [("contest_id", 1), ("status", 1)],
             [("team_id", 1), ("contest_id", 1), ("status", 1)],
+            # index-sorted contest leaderboard pages (keyset cursors)
+            [("contest_id", 1), ("status", 1), ("contest_points", -1), ("team_id", 1)],
         ]
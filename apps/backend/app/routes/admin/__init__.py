@@ -3,6 +3,8 @@ from .slots import router as slots_router
 from .players_import import router as players_import_router
 from .contests import router as contests_router
 from .teams_users import router as users_teams_router
+from .leaderboard import router as leaderboard_router
+from .points_events import router as points_events_router
 
 __all__ = [
     "players_router",
@@ -10,4 +12,6 @@ __all__ = [
     "players_import_router",
     "contests_router",
     "users_teams_router",
+    "leaderboard_router",
+    "points_events_router",
 ]
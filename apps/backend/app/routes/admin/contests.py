@@ -25,7 +25,14 @@ from app.schemas.enrollment import (
     EnrollmentResponse,
 )
 from app.utils.dependencies import get_admin_user
+from app.utils.pagination import paginate
 from app.models.user import User
+from app.services.loaders import Loaders, get_loaders, to_object_id
+from app.services import catalog
+from app.services import contest_lifecycle
+from app.services import lineups as lineups_svc
+from app.services import scoring
+from app.services import team_locks
 
 router = APIRouter(prefix="/api/admin/contests", tags=["Admin - Contests"])
 
@@ -75,6 +82,8 @@ async def create_contest(
         updated_at=now,
     )
     await contest.insert()
+    await catalog.invalidate_contests()
+    contest_lifecycle.wake()
     return await to_response(contest)
 
 
@@ -84,6 +93,8 @@ async def list_contests(
     page_size: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching contests"),
     current_user: User = Depends(get_admin_user),
 ):
     query = Contest.find_all()
@@ -95,20 +106,29 @@ async def list_contests(
         conditions = Or(RegEx(Contest.code, search, options="i"), RegEx(Contest.name, search, options="i"))
         query = Contest.find(conditions)
 
-    total = await query.count()
-    skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort(-Contest.start_at).to_list()
+    try:
+        result = await paginate(
+            query,
+            [("start_at", -1)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     return {
-        "contests": [await to_response(c) for c in rows],
-        "total": total,
+        "contests": [await to_response(c) for c in result.items],
+        "total": result.total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": result.next_cursor,
     }
 
 
 @router.get("/{contest_id}", response_model=ContestResponse)
 async def get_contest(contest_id: str, current_user: User = Depends(get_admin_user)):
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
     return await to_response(contest)
@@ -139,6 +159,8 @@ async def update_contest(
         setattr(contest, k, v)
     contest.updated_at = now_ist()
     await contest.save()
+    await catalog.invalidate_contests()
+    contest_lifecycle.wake()
     return await to_response(contest)
 
 
@@ -171,6 +193,8 @@ async def delete_contest(
             raise HTTPException(status_code=409, detail="Contest has active enrollments. Use force=true to unenroll and delete.")
 
     await contest.delete()
+    # cached enrollments of this contest now point at no contest window, which never locks
+    await catalog.invalidate_contests()
     return {"message": "Contest deleted"}
 
 
@@ -179,8 +203,9 @@ async def enroll_teams(
     contest_id: str,
     body: EnrollmentBulkRequest,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -190,11 +215,11 @@ async def enroll_teams(
     created: List[EnrollmentResponse] = []
 
     for tid in body.team_ids:
-        try:
-            oid = PydanticObjectId(tid)
-        except Exception:
+        if to_object_id(tid) is None:
             raise HTTPException(status_code=400, detail=f"Invalid team id: {tid}")
-        team = await Team.get(oid)
+    teams = await loaders.teams.load_many(body.team_ids)
+
+    for tid, team in zip(body.team_ids, teams):
         if not team:
             raise HTTPException(status_code=404, detail=f"Team not found: {tid}")
 
@@ -236,16 +261,38 @@ async def enroll_teams(
             )
         )
 
+    if created:
+        await scoring.bump_lineup_version([contest.id])
+        team_locks.invalidate_teams(PydanticObjectId(c.team_id) for c in created)
     return created
 
 
+class DuplicateLineupGroup(BaseModel):
+    lineup_hash: str
+    team_ids: List[str]
+    user_ids: List[str]
+
+
+@router.get("/{contest_id}/duplicate-lineups", response_model=List[DuplicateLineupGroup])
+async def get_duplicate_lineups(
+    contest_id: str,
+    current_user: User = Depends(get_admin_user),
+):
+    """List lineups (players and C/VC) entered by more than one active team of the contest."""
+    contest = await catalog.get_contest(contest_id)
+    if not contest:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    return [DuplicateLineupGroup(**group) for group in await lineups_svc.contest_duplicate_lineups(contest)]
+
+
 @router.delete("/{contest_id}/enrollments")
 async def unenroll(
     contest_id: str,
     body: UnenrollBulkRequest,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -255,8 +302,7 @@ async def unenroll(
     affected_team_ids: Set[PydanticObjectId] = set()
 
     if body.enrollment_ids:
-        for eid in body.enrollment_ids:
-            enr = await TeamContestEnrollment.get(eid)
+        for enr in await loaders.enrollments.load_many(body.enrollment_ids):
             if enr and enr.contest_id == contest.id and enr.status == "active":
                 enr.status = "removed"
                 enr.removed_at = now_ist()
@@ -282,6 +328,10 @@ async def unenroll(
                 count += 1
                 affected_team_ids.add(toid)
 
+    if count:
+        await scoring.bump_lineup_version([contest.id])
+        team_locks.invalidate_teams(affected_team_ids)
+
     # Batch check and clear team.contest_id for teams with no remaining active enrollments
     if affected_team_ids:
         try:
@@ -296,8 +346,7 @@ async def unenroll(
 
             # Teams to clear = affected - still_active
             to_clear_ids = [tid for tid in affected_team_ids if tid not in still_active_team_ids]
-            for tid in to_clear_ids:
-                team = await Team.get(tid)
+            for team in await loaders.teams.load_many(to_clear_ids):
                 if team and team.contest_id is not None:
                     team.contest_id = None
                     team.updated_at = now_ist()
@@ -336,7 +385,7 @@ async def get_player_points(
     contest_id: str,
     current_user: User = Depends(get_admin_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -366,6 +415,7 @@ async def upsert_player_points(
     contest_id: str,
     body: PlayerPointsBulkUpsertRequest,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     contest = await Contest.get(contest_id)
     if not contest:
@@ -374,71 +424,29 @@ async def upsert_player_points(
     if not body.updates:
         return []
 
-    # Validate player ids and build list
-    valid_items: list[tuple[PydanticObjectId, float]] = []
+    # Validate player ids (a repeated player keeps its last value)
+    points_by_player: Dict[PydanticObjectId, float] = {}
     for item in body.updates:
         try:
             poid = PydanticObjectId(item.player_id)
         except Exception:
             raise HTTPException(status_code=400, detail=f"Invalid player id: {item.player_id}")
-        valid_items.append((poid, float(item.points)))
-
-    # Upsert
-    updated_docs: list[PlayerContestPoints] = []
-    now = now_ist()
-    for poid, pts in valid_items:
-        existing = await PlayerContestPoints.find_one({
-            "contest_id": contest.id,
-            "player_id": poid,
-        })
-        if existing:
-            existing.points = pts
-            existing.updated_at = now
-            await existing.save()
-            updated_docs.append(existing)
-        else:
-            doc = PlayerContestPoints(
-                contest_id=contest.id,
-                player_id=poid,
-                points=pts,
-                updated_at=now,
-            )
-            await doc.insert()
-            updated_docs.append(doc)
-
-    # Build response with player details
-    pid_set = [doc.player_id for doc in updated_docs]
-    players_by_id: Dict[str, Player] = {}
-    if pid_set:
-        players = await Player.find({"_id": {"$in": pid_set}}).to_list()
-        players_by_id = {str(p.id): p for p in players}
-
-    resp: list[PlayerPointsResponseItem] = []
-    for doc in updated_docs:
-        p = players_by_id.get(str(doc.player_id))
-        resp.append(PlayerPointsResponseItem(
-            player_id=str(doc.player_id),
-            name=(p.name if p else None) if p else None,
-            team=(p.team if p else None) if p else None,
-            points=float(doc.points or 0.0),
-            updated_at=doc.updated_at,
-        ))
-    # If this is a full contest (not daily), mirror these points into Player.points
-    try:
-        if contest.contest_type != "daily" and updated_docs:
-            # Batch update players so that Player.points equals the contest total for this contest
-            for doc in updated_docs:
-                try:
-                    player = await Player.get(doc.player_id)
-                    if player:
-                        player.points = float(doc.points or 0.0)
-                        player.updated_at = now_ist()
-                        await player.save()
-                except Exception:
-                    # continue best-effort for each player, do not fail the response
-                    continue
-    except Exception:
-        # Non-blocking
-        pass
-
-    return resp
+        points_by_player[poid] = float(item.points)
+
+    # One $in fetch of player details for the response
+    players = await loaders.players.load_many(points_by_player)
+
+    # One unordered bulk upsert, then the Player.points mirror for full contests
+    # (merged with other updates of this contest when a scoring tick is configured)
+    now = await scoring.points_coalescer.submit(contest, points_by_player)
+
+    return [
+        PlayerPointsResponseItem(
+            player_id=str(poid),
+            name=p.name if p else None,
+            team=p.team if p else None,
+            points=pts,
+            updated_at=now,
+        )
+        for (poid, pts), p in zip(points_by_player.items(), players)
+    ]
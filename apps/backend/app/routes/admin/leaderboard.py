@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+
+from app.models.user import User
+from app.schemas.admin.leaderboard import (
+    RankSnapshotRunResponse,
+    ScoringTickMetricsResponse,
+    TeamTotalsReconcileResponse,
+)
+from app.services import leaderboard as leaderboard_svc
+from app.services import rank_snapshots as rank_snapshots_svc
+from app.services import scoring
+from app.utils.dependencies import get_admin_user
+
+router = APIRouter(prefix="/api/admin/leaderboard", tags=["Admin - Leaderboard"])
+
+
+@router.post("/reconcile", response_model=TeamTotalsReconcileResponse)
+async def reconcile_team_totals(current_user: User = Depends(get_admin_user)):
+    """Recompute Team.total_points and total_value for all teams and report what changed."""
+    return await leaderboard_svc.reconcile_team_totals()
+
+
+@router.post("/snapshot", response_model=RankSnapshotRunResponse)
+async def take_rank_snapshots(current_user: User = Depends(get_admin_user)):
+    """Snapshot the global and live contest leaderboards and refresh rank / rank_change."""
+    return await rank_snapshots_svc.take_rank_snapshots()
+
+
+@router.get("/scoring-metrics", response_model=ScoringTickMetricsResponse)
+async def get_scoring_metrics(current_user: User = Depends(get_admin_user)):
+    """Return scoring-tick coalescer metrics (batch sizes and tick latency) for this worker."""
+    return scoring.points_coalescer.snapshot()
@@ -4,9 +4,8 @@ from beanie.operators import RegEx, Or, And
 from datetime import datetime
 
 from app.models.admin.player import Player
-from app.models.team import Team
-from app.models.player import Player as PublicPlayer
-from beanie import PydanticObjectId
+from app.services import catalog
+from app.services import leaderboard as leaderboard_svc
 from app.schemas.admin.player import (
     PlayerCreate,
     PlayerUpdate,
@@ -14,6 +13,7 @@ from app.schemas.admin.player import (
     PlayerListResponse,
 )
 from app.utils.dependencies import get_admin_user
+from app.utils.pagination import paginate
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/players", tags=["Admin - Players"]) 
@@ -27,6 +27,8 @@ async def get_players(
     status: Optional[str] = Query(None, description="Filter by status"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching players"),
     current_user: User = Depends(get_admin_user),
 ):
     """
@@ -53,16 +55,19 @@ async def get_players(
     else:
         query = Player.find_all()
     
-    # Get total count
-    total = await query.count()
-    
-    # Apply sorting
+    # Sort, then page by cursor (or page number); total only on request
     sort_direction = -1 if sort_order == "desc" else 1
-    query = query.sort((sort_by, sort_direction))
-    
-    # Apply pagination
-    skip = (page - 1) * page_size
-    players = await query.skip(skip).limit(page_size).to_list()
+    try:
+        result = await paginate(
+            query,
+            [(sort_by, sort_direction)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
     # Convert to response format
     player_responses = [
@@ -79,14 +84,15 @@ async def get_players(
             created_at=player.created_at,
             updated_at=player.updated_at,
         )
-        for player in players
+        for player in result.items
     ]
     
     return PlayerListResponse(
         players=player_responses,
-        total=total,
+        total=result.total,
         page=page,
         page_size=page_size,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -151,6 +157,7 @@ async def create_player(
     )
     
     await player.insert()
+    await catalog.invalidate_player_catalog()
     
     return PlayerResponse(
         id=str(player.id),
@@ -186,46 +193,14 @@ async def update_player(
     update_data = player_data.model_dump(exclude_unset=True)
     
     if update_data:
-        for field, value in update_data.items():
-            setattr(player, field, value)
-        
-        player.updated_at = datetime.utcnow()
-        await player.save()
+        # $set only the provided fields so a concurrent scoring write to other fields is kept
+        await player.set({**update_data, "updated_at": datetime.utcnow()})
+        await catalog.invalidate_player_catalog()
 
-        # If points changed, recompute totals for all impacted teams
+        # If points changed, recompute the totals of impacted teams from current player points
+        # (a delta against the points loaded above could race with the scoring mirror)
         if "points" in update_data:
-            # Teams store player_ids as strings of ObjectId
-            impacted_teams = await Team.find({"player_ids": player_id}).to_list()
-
-            # Collect all needed player ObjectIds in one pass
-            all_player_ids = set()
-            team_player_ids_map = {}
-            for team in impacted_teams:
-                player_object_ids = []
-                for pid in team.player_ids:
-                    try:
-                        obj_id = PydanticObjectId(pid)
-                        player_object_ids.append(obj_id)
-                        all_player_ids.add(obj_id)
-                    except Exception:
-                        continue
-                team_player_ids_map[team.id] = player_object_ids
-
-            # Fetch all players needed across all teams in a single query
-            players = []
-            if all_player_ids:
-                players = await PublicPlayer.find({"_id": {"$in": list(all_player_ids)}}).to_list()
-
-            # Build lookup of player -> points
-            player_points_map = {p.id: float(p.points or 0.0) for p in players}
-
-            # Update each team's total using the pre-fetched points
-            for team in impacted_teams:
-                player_object_ids = team_player_ids_map.get(team.id, [])
-                total = sum(player_points_map.get(obj_id, 0.0) for obj_id in player_object_ids)
-                team.total_points = total
-                team.updated_at = datetime.utcnow()
-                await team.save()
+            await leaderboard_svc.refresh_team_totals([str(player.id)])
     
     return PlayerResponse(
         id=str(player.id),
@@ -257,5 +232,8 @@ async def delete_player(
         raise HTTPException(status_code=404, detail="Player not found")
     
     await player.delete()
+    await catalog.invalidate_player_catalog()
+    # Teams that still reference the deleted player no longer score its points
+    await leaderboard_svc.refresh_team_totals([str(player.id)])
     
     return None
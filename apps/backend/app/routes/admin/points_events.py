@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional, List
+from datetime import datetime
+
+from app.models.player_points_event import PlayerPointsEvent
+from app.models.user import User
+from app.schemas.admin.points_events import (
+    PointsEventBatchRequest,
+    PointsEventBatchResponse,
+    PointsEventResponse,
+)
+from app.services.loaders import to_object_id
+from app.services.scoring import ledger
+from app.utils.dependencies import get_admin_user
+from app.utils.timezone import now_ist
+
+router = APIRouter(prefix="/api/admin/points-events", tags=["Admin - Points Ledger"])
+
+
+@router.post("", response_model=PointsEventBatchResponse)
+async def record_points_events(
+    body: PointsEventBatchRequest,
+    current_user: User = Depends(get_admin_user),
+):
+    """Append scoring events to the points ledger and refresh every overlapping time-window contest."""
+    now = now_ist()
+    events: List[PlayerPointsEvent] = []
+    for item in body.events:
+        player_oid = to_object_id(item.player_id)
+        if player_oid is None:
+            raise HTTPException(status_code=400, detail=f"Invalid player id: {item.player_id}")
+        events.append(PlayerPointsEvent(
+            player_id=player_oid,
+            points=item.points,
+            occurred_at=item.occurred_at or now,
+            event_id=item.event_id,
+            source=item.source,
+        ))
+    return await ledger.record_points_events(events)
+
+
+@router.get("", response_model=List[PointsEventResponse])
+async def list_points_events(
+    player_id: str,
+    start_at: Optional[datetime] = Query(None),
+    end_at: Optional[datetime] = Query(None),
+    limit: int = Query(200, ge=1, le=1000),
+    current_user: User = Depends(get_admin_user),
+):
+    """List a player's ledger entries, newest first."""
+    player_oid = to_object_id(player_id)
+    if player_oid is None:
+        raise HTTPException(status_code=400, detail=f"Invalid player id: {player_id}")
+    events = await ledger.get_player_events(player_oid, start_at, end_at, limit)
+    return [
+        PointsEventResponse(
+            id=str(e.id),
+            player_id=str(e.player_id),
+            points=e.points,
+            cumulative=e.cumulative,
+            occurred_at=e.occurred_at,
+            event_id=e.event_id,
+            source=e.source,
+        )
+        for e in events
+    ]
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional, List
 from datetime import datetime
@@ -18,7 +19,10 @@ from app.schemas.admin.player import (
     PlayerListResponse,
 )
 from app.utils.dependencies import get_admin_user
+from app.utils.pagination import paginate
 from app.models.user import User
+from app.services.loaders import Loaders, get_loaders
+from app.services import catalog
 
 router = APIRouter(prefix="/api/admin/slots", tags=["Admin - Slots"])
 
@@ -27,8 +31,8 @@ class PlayerIds(BaseModel):
     player_ids: List[str]
 
 
-async def build_slot_response(slot: Slot) -> SlotResponse:
-    player_count = await AdminPlayer.find(AdminPlayer.slot == str(slot.id)).count()
+async def build_slot_response(slot: Slot, loaders: Loaders) -> SlotResponse:
+    player_count = await loaders.player_counts_by_slot.load(str(slot.id))
     return SlotResponse(
         id=str(slot.id),
         code=slot.code,
@@ -48,7 +52,10 @@ async def get_slots(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by code or name"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching slots"),
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     """List slots from the DB with computed player_count."""
     conditions = []
@@ -60,19 +67,27 @@ async def get_slots(
     else:
         query = Slot.find_all()
 
-    total = await query.count()
-    skip = (page - 1) * page_size
-    slots = await query.skip(skip).limit(page_size).to_list()
-
-    slot_responses = []
-    for slot in slots:
-        slot_responses.append(await build_slot_response(slot))
+    try:
+        result = await paginate(
+            query,
+            [("_id", 1)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Player counts for all slots on the page resolve in one grouped query
+    slot_responses = await asyncio.gather(*(build_slot_response(slot, loaders) for slot in result.items))
 
     return {
-        "slots": slot_responses,
-        "total": total,
+        "slots": list(slot_responses),
+        "total": result.total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": result.next_cursor,
     }
 
 
@@ -158,6 +173,8 @@ async def migrate_slots_from_players(
                 count = await query.count()
                 updated_counts[str(val)] = count
 
+    if created and not dry_run:
+        await catalog.invalidate_slot_catalog()
     return {
         "dry_run": dry_run,
         "created_slots": created,
@@ -169,6 +186,7 @@ async def migrate_slots_from_players(
 async def create_slot(
     data: SlotCreate,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     """Create and persist a new slot."""
     if data.min_select is not None and data.max_select is not None and data.min_select > data.max_select:
@@ -192,18 +210,20 @@ async def create_slot(
         updated_at=now,
     )
     await slot.insert()
-    return await build_slot_response(slot)
+    await catalog.invalidate_slot_catalog()
+    return await build_slot_response(slot, loaders)
 
 
 @router.get("/{slot_id}", response_model=SlotResponse)
 async def get_slot(
     slot_id: str,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     slot = await Slot.get(slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
-    return await build_slot_response(slot)
+    return await build_slot_response(slot, loaders)
 
 
 @router.put("/{slot_id}", response_model=SlotResponse)
@@ -211,6 +231,7 @@ async def update_slot(
     slot_id: str,
     data: SlotUpdate,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     slot = await Slot.get(slot_id)
     if not slot:
@@ -230,7 +251,8 @@ async def update_slot(
         setattr(slot, k, v)
     slot.updated_at = datetime.utcnow()
     await slot.save()
-    return await build_slot_response(slot)
+    await catalog.invalidate_slot_catalog()
+    return await build_slot_response(slot, loaders)
 
 
 @router.delete("/{slot_id}")
@@ -254,8 +276,10 @@ async def delete_slot(
             player.slot = None
             await player.save()
         unassigned = len(players_in_slot)
+        await catalog.invalidate_player_catalog()
 
     await slot.delete()
+    await catalog.invalidate_slot_catalog()
     return {"message": "Slot successfully deleted", "unassigned_players": unassigned}
 
 
@@ -310,17 +334,19 @@ async def assign_players_to_slot(
     slot_id: str,
     body: PlayerIds,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     slot = await Slot.get(slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
     assigned = 0
-    for pid in body.player_ids:
-        player = await AdminPlayer.get(pid)
+    for player in await loaders.admin_players.load_many(body.player_ids):
         if player:
             player.slot = str(slot.id)
             await player.save()
             assigned += 1
+    if assigned:
+        await catalog.invalidate_player_catalog()
     return {"assigned": assigned}
 
 
@@ -340,6 +366,7 @@ async def unassign_player_from_slot(
         return {"unassigned": 0}
     player.slot = None
     await player.save()
+    await catalog.invalidate_player_catalog()
     return {"unassigned": 1}
 
 
@@ -348,15 +375,17 @@ async def bulk_unassign_players_from_slot(
     slot_id: str,
     body: PlayerIds,
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     slot = await Slot.get(slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
     count = 0
-    for pid in body.player_ids:
-        player = await AdminPlayer.get(pid)
+    for player in await loaders.admin_players.load_many(body.player_ids):
         if player and player.slot == slot_id:
             player.slot = None
             await player.save()
             count += 1
+    if count:
+        await catalog.invalidate_player_catalog()
     return {"unassigned": count}
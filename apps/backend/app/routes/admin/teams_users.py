@@ -5,8 +5,9 @@ from beanie import PydanticObjectId
 from app.models.user import User
 from app.models.team import Team
 from app.models.team_contest_enrollment import TeamContestEnrollment
-from app.models.contest import Contest
 from app.utils.dependencies import get_admin_user
+from app.services import catalog
+from app.services.loaders import Loaders, get_loaders
 
 router = APIRouter(prefix="/api/admin", tags=["Admin - Users & Teams"])
 
@@ -17,6 +18,7 @@ async def users_with_teams(
     page_size: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None, description="Search username or full_name"),
     current_user: User = Depends(get_admin_user),
+    loaders: Loaders = Depends(get_loaders),
 ):
     # naive approach: filter users by search, then count teams per user
     q = User.find_all()
@@ -28,8 +30,8 @@ async def users_with_teams(
     users = await q.skip(skip).limit(page_size).to_list()
 
     results = []
-    for u in users:
-        count = await Team.find(Team.user_id == u.id).count()
+    counts = await loaders.team_counts_by_user.load_many(u.id for u in users)
+    for u, count in zip(users, counts):
         if count > 0:
             results.append({
                 "user_id": str(u.id),
@@ -70,7 +72,7 @@ async def get_user_teams_admin(
 
     enrollments_map = {}
     if contest_id:
-        contest = await Contest.get(contest_id)
+        contest = await catalog.get_contest(contest_id)
         if contest:
             team_ids = [t.id for t in teams]
             if team_ids:
@@ -14,6 +14,7 @@ from app.schemas.carousel import (
     ReorderRequest
 )
 from app.utils.dependencies import get_current_active_user
+from app.utils.pagination import paginate
 from app.utils.gridfs import (
     upload_carousel_image_to_gridfs,
     open_carousel_image_stream,
@@ -39,7 +40,9 @@ def carousel_to_response(carousel: CarouselImage) -> dict:
 async def get_carousel_images(
     active: Optional[bool] = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(100, ge=1, le=100, description="Items per page")
+    page_size: int = Query(100, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching images"),
 ):
     """
     Get carousel images with optional filters (Public endpoint)
@@ -47,6 +50,8 @@ async def get_carousel_images(
     - **active**: Filter by active status (default: true, only active images)
     - **page**: Page number for pagination
     - **page_size**: Number of items per page (max 100)
+    - **cursor**: next_cursor of the previous page (takes precedence over page)
+    - **include_total**: Also return the total count
     """
     # Build query
     query = {}
@@ -54,21 +59,25 @@ async def get_carousel_images(
     if active is not None:
         query["active"] = active
     
-    # Get total count
-    total = await CarouselImage.find(query).count()
-    
     # Get carousel images with pagination, sorted by display_order and created_at
-    images = await CarouselImage.find(query)\
-        .sort("+display_order", "+created_at")\
-        .skip((page - 1) * page_size)\
-        .limit(page_size)\
-        .to_list()
+    try:
+        result = await paginate(
+            CarouselImage.find(query),
+            [("display_order", 1), ("created_at", 1)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
     
     return CarouselImagesListResponse(
-        images=[CarouselImageResponse(**carousel_to_response(img)) for img in images],
-        total=total,
+        images=[CarouselImageResponse(**carousel_to_response(img)) for img in result.items],
+        total=result.total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=result.next_cursor,
     )
 
 
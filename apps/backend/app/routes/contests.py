@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from typing import Optional, List, Dict, Annotated
 from beanie import PydanticObjectId
 from beanie.operators import Or, RegEx
@@ -6,20 +6,27 @@ from datetime import datetime
 from pydantic import BaseModel
 from bson import ObjectId
 from app.utils.timezone import now_ist, to_ist
+from app.utils.pagination import encode_cursor, decode_cursor, paginate
 
 from app.models.contest import Contest
 from app.models.team_contest_enrollment import TeamContestEnrollment
 from app.models.team import Team
 from app.models.user import User
-from app.models.player import Player
-from app.models.player_contest_points import PlayerContestPoints
 from app.utils.security import decode_token
 from app.schemas.contest import ContestListResponse, ContestResponse
 from app.schemas.leaderboard import LeaderboardResponseSchema, LeaderboardEntrySchema
 from app.utils.dependencies import get_current_active_user
 from app.schemas.enrollment import EnrollmentResponse
+from app.services.loaders import Loaders, get_loaders, to_object_id
+from app.services import catalog
+from app.services import contest_lifecycle
+from app.services import scoring
+from app.services import rank_snapshots as rank_snapshots_svc
+from app.services import team_locks
+from app.services import team_validation
 from app.common.enums.contests import ContestVisibility, ContestStatus
 from app.common.enums.enrollments import EnrollmentStatus
+from config.settings import settings
 
 router = APIRouter(prefix="/api/contests", tags=["contests"])
 
@@ -45,27 +52,14 @@ class ContestTeamResponse(BaseModel):
     vice_captain_id: Optional[str] = None
     players: List[ContestTeamPlayerSchema]
 
-def _compute_status(contest: Contest) -> ContestStatus:
-    now = now_ist()
-    # Ensure contest times are in IST for comparison
-    start = to_ist(contest.start_at)
-    end = to_ist(contest.end_at)
-    if end <= now:
-        return ContestStatus.COMPLETED
-    if start <= now < end:
-        return ContestStatus.ONGOING
-    return ContestStatus.LIVE
-
 
 async def to_contest_response(contest: Contest, skip_save: bool = False) -> ContestResponse:
     # Derive status from time window to reflect real-time lifecycle
-    computed = _compute_status(contest)
-    # Update in-memory status without persisting (saves go to DB asynchronously)
+    computed = contest_lifecycle.compute_status(contest)
+    # Update in-memory status only; the lifecycle scheduler persists it at each boundary
     if contest.status != computed and contest.status != ContestStatus.ARCHIVED:
         contest.status = computed
         contest.updated_at = now_ist()
-        # Skip immediate save for performance; status updates are idempotent
-        # and will be persisted on next write operation or background task
     return ContestResponse(
         id=str(contest.id),
         code=contest.code,
@@ -106,7 +100,15 @@ async def list_public_contests(
     page_size: Annotated[int, Query(ge=1, le=100)] = 10,
     status: Annotated[ContestStatus | None, Query()] = None,
     q: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page; replaces page")] = None,
+    include_total: Annotated[bool, Query(description="Also count all matching contests")] = False,
 ):
+    # q is a regex pattern, so it is keyed verbatim (e.g. \d and \D differ only in case)
+    cache_key = (status.value if status else None, q or None, page, page_size, cursor, include_total)
+    body = await catalog.get_contest_list(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
     conditions = [Contest.visibility == ContestVisibility.PUBLIC]
 
     # Map status to filter clauses
@@ -130,18 +132,34 @@ async def list_public_contests(
         for cond in conditions:
             query = query.find(cond)
 
-    total = await query.count()
-    skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort("-start_at").to_list()
+    try:
+        result = await paginate(
+            query,
+            [("start_at", -1)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
     # Convert to responses with computed status
-    items = [await to_contest_response(c) for c in rows]
-    return {
-        "contests": items,
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-    }
+    items = [await to_contest_response(c) for c in result.items]
+    body = ContestListResponse(
+        contests=items,
+        total=result.total,
+        page=page,
+        page_size=page_size,
+        next_cursor=result.next_cursor,
+    ).model_dump_json().encode()
+    # a shown contest starting or ending changes its computed status
+    boundaries = [
+        t for c in result.items for t in (to_ist(c.start_at), to_ist(c.end_at)) if t > now
+    ]
+    max_age = (min(boundaries) - now).total_seconds() if boundaries else None
+    catalog.put_contest_list(cache_key, body, max_age)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/enrollments/me", response_model=List[EnrollmentResponse])
@@ -168,7 +186,7 @@ async def list_my_enrollments(current_user: User = Depends(get_current_active_us
 
 @router.get("/{contest_id}", response_model=ContestResponse)
 async def get_public_contest(contest_id: str):
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest or contest.visibility != ContestVisibility.PUBLIC:
         raise HTTPException(status_code=404, detail="Contest not found")
     return await to_contest_response(contest)
@@ -177,7 +195,7 @@ async def get_public_contest(contest_id: str):
 @router.get("/{contest_id}/me", response_model=ContestResponse)
 async def get_contest_if_enrolled(contest_id: str, current_user: User = Depends(get_current_active_user)):
     """Return contest details if it's public OR the current user is enrolled (active)."""
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
     if contest.visibility == ContestVisibility.PUBLIC:
@@ -193,131 +211,173 @@ async def get_contest_if_enrolled(contest_id: str, current_user: User = Depends(
     return await to_contest_response(contest)
 
 
-@router.get("/{contest_id}/leaderboard", response_model=LeaderboardResponseSchema)
-async def contest_leaderboard(
-    contest_id: str,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=200),
-    current_user: Optional[User] = Depends(get_optional_current_user),
-):
-    contest = await Contest.get(contest_id)
+async def _ranked_entries(
+    contest: Contest,
+    ranked: List[scoring.RankedRow],
+    loaders: Loaders,
+) -> List[LeaderboardEntrySchema]:
+    """Hydrate ``(rank, team_id, user_id, points)`` rows into leaderboard entries."""
+    teams = await loaders.teams.load_many(tid for _, tid, _, _ in ranked)
+    users = await loaders.users.load_many(uid for _, _, uid, _ in ranked)
+    # rank movement within the contest, stored on enrollments by the rank snapshot job
+    rank_changes = await rank_snapshots_svc.get_contest_rank_changes(contest.id, (tid for _, tid, _, _ in ranked))
+    entries: List[LeaderboardEntrySchema] = []
+    for (rank, _, _, points), team, user in zip(ranked, teams, users):
+        if not team or not user:
+            continue
+        entries.append(LeaderboardEntrySchema(
+            rank=rank,
+            username=user.username,
+            displayName=user.full_name or user.username,
+            teamName=team.team_name,
+            points=points,
+            rankChange=rank_changes.get(str(team.id)),
+            avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
+            teamId=str(team.id),
+        ))
+    return entries
+
+
+async def _get_public_contest_or_404(contest_id: str) -> Contest:
+    contest = await catalog.get_contest(contest_id)
     if not contest or contest.visibility != ContestVisibility.PUBLIC:
         raise HTTPException(status_code=404, detail="Contest not found")
+    return contest
 
-    # fetch active enrollments
-    enrollments = await TeamContestEnrollment.find({
-        "contest_id": contest.id,
-        "status": EnrollmentStatus.ACTIVE,
-    }).to_list()
 
-    if not enrollments:
-        return LeaderboardResponseSchema(entries=[], currentUserEntry=None)
+def _leaderboard_etag(contest: Contest, viewer: str) -> str:
+    """Weak ETag of a leaderboard response: one per snapshot version, display version and viewer.
 
-    team_ids = [enr.team_id for enr in enrollments]
+    Team names are covered (renames bump the display version). User profile
+    fields (``username``, ``displayName``, ``avatarUrl``) are not: clients see
+    profile edits with the next points, lineup or display change.
+    """
+    version = f"{scoring.leaderboard_version(contest)}.{int(contest.display_version or 0)}"
+    return f'W/"{contest.id}-{version}-{viewer}"'
 
-    # fetch teams in batch
-    teams = await Team.find({"_id": {"$in": team_ids}}).to_list()
-    teams_by_id: Dict[str, Team] = {str(t.id): t for t in teams}
 
-    # fetch users in batch
-    user_ids = list({t.user_id for t in teams})
-    users = await User.find({"_id": {"$in": user_ids}}).to_list()
-    users_by_id: Dict[str, User] = {str(u.id): u for u in users}
+def _check_leaderboard_etag(response: Response, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """Set caching headers and return a 304 response when the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Authorization"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
 
-    # compute points and build entries using per-contest player points
-    # 1) Collect all player ObjectIds across enrolled teams
-    from bson import ObjectId as _OID
-    all_player_ids: set[PydanticObjectId] = set()
-    team_player_oids_map: Dict[str, list[PydanticObjectId]] = {}
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        oids: list[PydanticObjectId] = []
-        for pid in team.player_ids:
-            if _OID.is_valid(pid):
-                try:
-                    oids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-        team_player_oids_map[str(enr.team_id)] = oids
-        all_player_ids.update(oids)
-
-    # 2) Fetch all PlayerContestPoints for this contest once
-    pcp_docs = []
-    if all_player_ids:
-        pcp_docs = await PlayerContestPoints.find({
-            "contest_id": contest.id,
-            "player_id": {"$in": list(all_player_ids)},
-        }).to_list()
-
-    # 3) Build lookup: player_id(str) -> points(float)
-    pcp_points_map: Dict[str, float] = {str(doc.player_id): float(doc.points or 0.0) for doc in pcp_docs}
-
-    # 4) Sum per team and build computed list (apply C/VC multipliers)
-    computed = []
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        user = users_by_id.get(str(team.user_id))
-        if not user:
-            continue
-        oids = team_player_oids_map.get(str(enr.team_id), [])
-        # Sum using string form to match map keys, with captain/vice multipliers
-        total = 0.0
-        captain_id = str(team.captain_id) if team.captain_id else None
-        vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
-        for oid in oids:
-            pid = str(oid)
-            base = float(pcp_points_map.get(pid, 0.0))
-            if captain_id and pid == captain_id:
-                base *= 2.0
-            elif vice_id and pid == vice_id:
-                base *= 1.5
-            total += base
-        points = float(total)
-        computed.append((team, user, float(points)))
-
-    # sort by points desc
-    computed.sort(key=lambda tup: tup[2], reverse=True)
-
-    # pagination
-    sliced = computed[skip: skip + limit]
 
-    entries: List[LeaderboardEntrySchema] = []
-    current_user_entry: Optional[LeaderboardEntrySchema] = None
+def _uses_leaderboard_pipeline() -> bool:
+    return settings.contest_leaderboard_mode == "pipeline"
 
-    for idx, (team, user, points) in enumerate(sliced, start=skip + 1):
-        entry = LeaderboardEntrySchema(
-            rank=idx,
-            username=user.username,
-            displayName=user.full_name or user.username,
-            teamName=team.team_name,
-            points=points,
-            rankChange=team.rank_change,
-            avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            teamId=str(team.id),
+
+def _around_skip(rank: int, size: int, total: int) -> int:
+    return max(0, min(rank - 1 - size // 2, total - size))
+
+
+@router.get("/{contest_id}/leaderboard", response_model=LeaderboardResponseSchema)
+async def contest_leaderboard(
+    contest_id: str,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+    around_me: int = Query(0, ge=0, le=100, description="Also return this many entries around the caller's best team"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page; replaces skip"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    loaders: Loaders = Depends(get_loaders),
+):
+    contest = await _get_public_contest_or_404(contest_id)
+    # the ETag changes whenever points, enrollments, lineups or team names of the contest change
+    etag = _leaderboard_etag(contest, str(current_user.id) if current_user else "anon")
+    not_modified = _check_leaderboard_etag(response, etag, if_none_match)
+    if not_modified:
+        return not_modified
+
+    around_rows: List[scoring.RankedRow] = []
+    if cursor:
+        # keyset page over the standings materialized on enrollments (index range read)
+        try:
+            key = decode_cursor(cursor)
+            after = (float(key["p"]), str(key["t"]))
+            if not ObjectId.is_valid(after[1]):
+                raise ValueError("Invalid cursor")
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        await scoring.ensure_standings(contest)
+        page_rows = await scoring.standings_page(contest, after, limit)
+        me_row = await scoring.user_standing(contest, current_user.id) if current_user else None
+        total = await scoring.count_standings(contest)
+    elif _uses_leaderboard_pipeline():
+        # ranking runs inside MongoDB; only the page and the caller's row are transferred
+        result = await scoring.aggregate_contest_leaderboard(
+            contest, skip, limit, user_id=current_user.id if current_user else None
         )
-        entries.append(entry)
-
-    if current_user:
-        # find current user's best-ranked team entry within this contest
-        for rank_idx, (team, user, points) in enumerate(computed, start=1):
-            if str(user.id) == str(current_user.id):
-                current_user_entry = LeaderboardEntrySchema(
-                    rank=rank_idx,
-                    username=user.username,
-                    displayName=user.full_name or user.username,
-                    teamName=team.team_name,
-                    points=points,
-                    rankChange=team.rank_change,
-                    avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-                    teamId=str(team.id),
-                )
-                break
-
-    return LeaderboardResponseSchema(entries=entries, currentUserEntry=current_user_entry)
+        total, page_rows, me_row = result.total, result.rows, result.me
+        if me_row and around_me:
+            around = await scoring.aggregate_contest_leaderboard(
+                contest, _around_skip(me_row[0], around_me, total), around_me
+            )
+            around_rows = around.rows
+    else:
+        # rank index over (points, team_id); pages and ranks are slices / binary searches
+        index = await scoring.get_rank_index(contest)
+        total, page_rows = len(index), index.page(skip, limit)
+        best_team_id = index.best_team_of(str(current_user.id)) if current_user else None
+        me_row = index.row(best_team_id) if best_team_id else None
+        if best_team_id and around_me:
+            around_rows = index.around(best_team_id, around_me)
+
+    entries = await _ranked_entries(contest, page_rows, loaders)
+
+    # current user's best-ranked team entry within this contest
+    current_user_entry: Optional[LeaderboardEntrySchema] = None
+    around_entries: Optional[List[LeaderboardEntrySchema]] = None
+    if me_row:
+        me = await _ranked_entries(contest, [me_row], loaders)
+        current_user_entry = me[0] if me else None
+        if around_me:
+            around_entries = await _ranked_entries(contest, around_rows, loaders)
+
+    next_cursor = None
+    if len(page_rows) == limit:
+        _, last_team_id, _, last_points = page_rows[-1]
+        next_cursor = encode_cursor({"p": last_points, "t": last_team_id})
+
+    return LeaderboardResponseSchema(
+        entries=entries,
+        currentUserEntry=current_user_entry,
+        aroundMe=around_entries,
+        total=total,
+        nextCursor=next_cursor,
+    )
+
+
+@router.get("/{contest_id}/leaderboard/teams/{team_id}", response_model=LeaderboardEntrySchema)
+async def contest_team_rank(
+    contest_id: str,
+    team_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """Return the current rank entry of one team in a contest."""
+    contest = await _get_public_contest_or_404(contest_id)
+    not_modified = _check_leaderboard_etag(response, _leaderboard_etag(contest, team_id), if_none_match)
+    if not_modified:
+        return not_modified
+    if _uses_leaderboard_pipeline():
+        team_oid = to_object_id(team_id)
+        row = None
+        if team_oid is not None:
+            row = (await scoring.aggregate_contest_leaderboard(contest, 0, 0, team_id=team_oid)).me
+    else:
+        row = (await scoring.get_rank_index(contest)).row(team_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Team is not enrolled in this contest")
+    entries = await _ranked_entries(contest, [row], loaders)
+    if not entries:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return entries[0]
+
 
 @router.post("/{contest_id}/enroll", response_model=EnrollmentResponse)
 async def enroll_in_contest(
@@ -333,7 +393,7 @@ async def enroll_in_contest(
     - Team must belong to the current user
     - Idempotent: if already enrolled and active, return existing enrollment
     """
-    contest = await Contest.get(contest_id)
+    contest = await catalog.get_contest(contest_id)
     if not contest or contest.visibility != "public":
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -350,28 +410,16 @@ async def enroll_in_contest(
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Only allow non-owners to view when contest is ONGOING
-    computed_status = _compute_status(contest)
+    computed_status = contest_lifecycle.compute_status(contest)
     is_owner = current_user is not None and str(team.user_id) == str(current_user.id)
     if not is_owner and computed_status != ContestStatus.ONGOING:
         raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing")
 
     # If daily contest with restrictions: validate team players belong to allowed teams
-    if contest.contest_type == "daily" and contest.allowed_teams:
-        # Load players of the team and ensure their real-world team is allowed
-        from bson import ObjectId as _OID
-        pid_oids = [PydanticObjectId(pid) for pid in team.player_ids if _OID.is_valid(pid)]
-        if pid_oids:
-            player_docs = await Player.find({"_id": {"$in": pid_oids}}).to_list()
-            disallowed = [p.name for p in player_docs if p.team and p.team not in contest.allowed_teams]
-            if disallowed:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": "Team contains players from disallowed teams for this daily contest",
-                        "disallowed_players": disallowed,
-                        "allowed_teams": contest.allowed_teams,
-                    },
-                )
+    rules = await team_validation.compile_rules(contest)
+    disallowed = rules.check_allowed_teams([p for p in rules.players.get_many(team.player_ids) if p])
+    if disallowed is not None:
+        raise HTTPException(status_code=400, detail=disallowed.http_detail)
 
     # Idempotent check
     existing = await TeamContestEnrollment.find_one({
@@ -402,6 +450,8 @@ async def enroll_in_contest(
         enrolled_at=now_ist(),
     )
     await enr.insert()  # type: ignore
+    await scoring.bump_lineup_version([contest.id])
+    team_locks.invalidate_teams([team.id])
 
     return EnrollmentResponse(
         id=str(enr.id),
@@ -415,8 +465,12 @@ async def enroll_in_contest(
 
 
 @router.get("/{contest_id}/teams/{team_id}", response_model=ContestTeamResponse)
-async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optional[User] = Depends(get_optional_current_user)):
-    contest = await Contest.get(contest_id)
+async def get_team_in_contest(
+    contest_id: str,
+    team_id: str,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+):
+    contest = await catalog.get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -428,7 +482,7 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Allow team owner anytime; others only when contest is ONGOING or COMPLETED
-    computed_status = _compute_status(contest)
+    computed_status = contest_lifecycle.compute_status(contest)
     is_owner = current_user is not None and str(team.user_id) == str(current_user.id)
     if not is_owner and computed_status not in (ContestStatus.ONGOING, ContestStatus.COMPLETED):
         raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing or completed")
@@ -442,33 +496,24 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
         raise HTTPException(status_code=404, detail="Team is not enrolled in this contest")
 
     # Load players for price/name/team details
-    player_ids_valid = [PydanticObjectId(pid) for pid in team.player_ids if ObjectId.is_valid(pid)]
-    players = await Player.find({"_id": {"$in": player_ids_valid}}).to_list()
-
-    players_by_id: Dict[str, Player] = {str(p.id): p for p in players}
+    player_ids = [str(pid) for pid in team.player_ids]
+    player_catalog = await catalog.get_player_catalog()
+    players_by_id: Dict[str, catalog.PlayerEntry] = {
+        p.id: p for p in player_catalog.get_many(player_ids) if p
+    }
 
     # Fetch per-contest points for these players
-    pcp_docs = []
-    if player_ids_valid:
-        pcp_docs = await PlayerContestPoints.find({
-            "contest_id": contest.id,
-            "player_id": {"$in": player_ids_valid},
-        }).to_list()
-    pcp_points_map: Dict[str, float] = {str(doc.player_id): float(doc.points or 0.0) for doc in pcp_docs}
+    pcp_points_map: Dict[str, float] = await scoring.load_contest_points(contest, player_ids)
 
     player_items: List[ContestTeamPlayerSchema] = []
     captain_id = str(team.captain_id) if team.captain_id else None
     vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
-    for pid in team.player_ids:
+    for pid in player_ids:
         p = players_by_id.get(pid)
         if not p:
             continue
         # Apply multipliers for this player's contest points if C/VC
-        contest_pts = float(pcp_points_map.get(pid, 0.0))
-        if captain_id and pid == captain_id:
-            contest_pts *= 2.0
-        elif vice_id and pid == vice_id:
-            contest_pts *= 1.5
+        contest_pts = float(pcp_points_map.get(pid, 0.0)) * scoring.player_multiplier(pid, captain_id, vice_id)
         player_items.append(ContestTeamPlayerSchema(
             id=pid,
             name=p.name,
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
-from typing import Optional, List, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Optional, List
+from datetime import datetime
 from app.models.user import User
 from app.models.team import Team
-from app.schemas.leaderboard import LeaderboardResponseSchema, LeaderboardEntrySchema
+from app.schemas.leaderboard import (
+    LeaderboardResponseSchema,
+    LeaderboardEntrySchema,
+    RankHistoryEntrySchema,
+    RankHistoryResponseSchema,
+)
 from app.utils.security import decode_token
-from beanie import PydanticObjectId
-from app.models.player import Player as PublicPlayer
-from datetime import datetime
+from app.services import leaderboard as leaderboard_svc
+from app.services import rank_snapshots as rank_snapshots_svc
+from app.services.loaders import Loaders, get_loaders, to_object_id
 
 router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
 
@@ -33,108 +39,80 @@ async def get_optional_current_user(authorization: Optional[str] = Header(None))
         return None
 
 
-async def _compute_team_points(team: Team) -> float:
-    """Sum current points of all players in a team."""
-    player_object_ids = []
-    for pid in team.player_ids:
-        try:
-            player_object_ids.append(PydanticObjectId(pid))
-        except Exception:
-            continue
-    if not player_object_ids:
-        return 0.0
-    players = await PublicPlayer.find({"_id": {"$in": player_object_ids}}).to_list()
-    return float(sum(float(p.points or 0.0) for p in players))
-
-
 @router.get("", response_model=LeaderboardResponseSchema)
 async def get_leaderboard(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
     current_user: Optional[User] = Depends(get_optional_current_user),
+    loaders: Loaders = Depends(get_loaders),
 ) -> LeaderboardResponseSchema:
     """
-    Get the global leaderboard with all teams ranked by total points.
-    If user is authenticated, also returns their position.
+    Get the global leaderboard with teams ranked by total points.
+    If user is authenticated, also returns their best-ranked team.
+
+    Totals are read from the materialized Team.total_points (kept up to date by
+    the player points write paths), so each call is a single indexed page read.
     """
-    try:
-        # Fetch all teams
-        teams = await Team.find_all().to_list()
+    teams = await leaderboard_svc.get_leaderboard_page(skip=skip, limit=limit)
 
-        # If no teams exist, return mock data for development
-        if not teams:
-            return _get_mock_leaderboard(current_user)
+    # fetch users for this page in batch
+    users = await loaders.users.load_many(t.user_id for t in teams)
 
-        # Build leaderboard entries
-        entries = []
-        current_user_entry = None
-        
-        # Compute points for all teams with a single players query to avoid N+1
-        # 1) Collect all player ObjectIds across teams
-        all_player_ids: set[PydanticObjectId] = set()
-        team_player_ids_map: dict[str, list[PydanticObjectId]] = {}
-        for team in teams:
-            obj_ids: list[PydanticObjectId] = []
-            for pid in team.player_ids:
-                try:
-                    obj_ids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-            team_player_ids_map[str(team.id)] = obj_ids
-            all_player_ids.update(obj_ids)
+    entries: List[LeaderboardEntrySchema] = []
+    for rank, (team, user) in enumerate(zip(teams, users), start=skip + 1):
+        if not user:
+            continue
+        entries.append(_to_entry(team, user, rank))
 
-        # 2) Fetch all needed players once
-        players = []
-        if all_player_ids:
-            players = await PublicPlayer.find({"_id": {"$in": list(all_player_ids)}}).to_list()
+    current_user_entry = None
+    if current_user:
+        best_team = await leaderboard_svc.get_user_best_team(current_user.id)
+        if best_team:
+            rank = await leaderboard_svc.get_team_rank(best_team)
+            current_user_entry = _to_entry(best_team, current_user, rank)
 
-        # 3) Build a points lookup
-        player_points_map = {str(p.id): float(p.points or 0.0) for p in players}
+    return LeaderboardResponseSchema(
+        entries=entries,
+        currentUserEntry=current_user_entry
+    )
 
-        # 4) Compute per-team totals using the lookup and optionally sync stored totals
-        team_points_list: List[Tuple[Team, float]] = []
-        for team in teams:
-            ids_for_team = team_player_ids_map.get(str(team.id), [])
-            computed_points = sum(player_points_map.get(str(obj_id), 0.0) for obj_id in ids_for_team)
-            team_points_list.append((team, float(computed_points)))
-            # Sync stored total if differs
-            try:
-                if float(team.total_points or 0.0) != float(computed_points):
-                    team.total_points = float(computed_points)
-                    team.updated_at = datetime.utcnow()
-                    await team.save()
-            except Exception:
-                pass
 
-        # Sort by computed points desc
-        team_points_list.sort(key=lambda x: x[1], reverse=True)
+@router.get("/teams/{team_id}/history", response_model=RankHistoryResponseSchema)
+async def get_team_rank_history(
+    team_id: str,
+    contest_id: Optional[str] = Query(None, description="Contest leaderboard; omit for the global leaderboard"),
+    at: Optional[datetime] = Query(None, description="Only snapshots taken at or before this time"),
+    limit: int = Query(50, ge=1, le=500),
+) -> RankHistoryResponseSchema:
+    """Return a team's rank at past rank snapshots, newest first."""
+    team_oid = to_object_id(team_id)
+    if team_oid is None:
+        raise HTTPException(status_code=400, detail="Invalid team id")
+    contest_oid = None
+    if contest_id is not None:
+        contest_oid = to_object_id(contest_id)
+        if contest_oid is None:
+            raise HTTPException(status_code=400, detail="Invalid contest id")
 
-        for idx, (team, points) in enumerate(team_points_list):
-            rank = idx + 1
-            # Get user info for this team
-            user = await User.get(team.user_id)
-            if not user:
-                continue
-            
-            entry = LeaderboardEntrySchema(
-                rank=rank,
-                username=user.username,
-                displayName=user.full_name or user.username,
-                teamName=team.team_name,
-                points=points,
-                rankChange=team.rank_change,
-                avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            )
-            
-            entries.append(entry)
-            
-            # Check if this is the current user's team
-            if current_user and str(team.user_id) == str(current_user.id):
-                current_user_entry = entry
-        
-        return LeaderboardResponseSchema(
-            entries=entries,
-            currentUserEntry=current_user_entry
-        )
-    except Exception as e:
-        # In case of error, return mock data
-        print(f"Error fetching leaderboard: {e}")
-        return _get_mock_leaderboard(current_user)
\ No newline at end of file
+    rows = await rank_snapshots_svc.get_team_rank_history(team_oid, contest_oid, at=at, limit=limit)
+    return RankHistoryResponseSchema(
+        teamId=team_id,
+        contestId=contest_id,
+        entries=[
+            RankHistoryEntrySchema(takenAt=r["taken_at"], rank=r.get("rank"), points=r.get("points"))
+            for r in rows
+        ],
+    )
+
+
+def _to_entry(team: Team, user: User, rank: int) -> LeaderboardEntrySchema:
+    return LeaderboardEntrySchema(
+        rank=rank,
+        username=user.username,
+        displayName=user.full_name or user.username,
+        teamName=team.team_name,
+        points=float(team.total_points or 0.0),
+        rankChange=team.rank_change,
+        avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
+        teamId=str(team.id),
+    )
@@ -1,14 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
-from beanie import PydanticObjectId
-from app.models.player import Player
-from app.models.contest import Contest
+from bson import ObjectId
 from app.schemas.player import PlayerOut
+from app.services import catalog
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
-def serialize_player(player: Player) -> PlayerOut:
-    """Convert Player model to PlayerOut schema"""
+def serialize_player(player: catalog.PlayerEntry) -> PlayerOut:
+    """Convert a player catalog entry to PlayerOut schema"""
     return PlayerOut(
         id=str(player.id),
         name=player.name,
@@ -32,33 +31,28 @@ async def list_players(
     skip: int = Query(0, ge=0),
 ):
     """Get list of players with optional filtering by slot (ObjectId string)."""
-    query = {}
-    if slot is not None:
-        query = {"slot": str(slot)}
     # If contest_id provided and contest is daily with restrictions, apply allowed team filter
+    allowed_teams = None
     if contest_id:
-        try:
-            contest = await Contest.get(PydanticObjectId(contest_id))
-        except Exception:
-            contest = None
+        contest = await catalog.get_contest(contest_id)
         if contest and contest.contest_type == "daily" and contest.allowed_teams:
-            # add team in allowed_teams filter together with slot if present
-            team_filter = {"team": {"$in": contest.allowed_teams}}
-            if query:
-                query = {"$and": [query, team_filter]}
-            else:
-                query = team_filter
+            allowed_teams = contest.allowed_teams
 
-    players = await Player.find(query).sort("+name").skip(skip).limit(limit).to_list()
+    player_catalog = await catalog.get_player_catalog()
+    players = player_catalog.select(
+        slot=str(slot) if slot is not None else None,
+        teams=allowed_teams,
+        skip=skip,
+        limit=limit,
+    )
     return [serialize_player(player) for player in players]
 
 @router.get("/{id}", response_model=PlayerOut)
 async def get_player(id: str):
-    try:
-        player = await Player.get(PydanticObjectId(id))
-    except Exception:
+    if not ObjectId.is_valid(id):
         raise HTTPException(status_code=400, detail="Invalid player ID")
-    
+
+    player = (await catalog.get_player_catalog()).get(id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
@@ -1,17 +1,17 @@
 from typing import List, Optional, Literal
 from fastapi import APIRouter, HTTPException, Query
-from beanie import PydanticObjectId
+from bson import ObjectId
 
 from app.schemas.player_hot import PlayerHot, PlayerHotIds, PlayerHotSingle
 from app.schemas.player import PlayerOut
-from app.models.player import Player
+from app.services import catalog
 from app.services import hot_players as svc
 from app.common.consts.index import HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
 
 router = APIRouter(prefix="/api/players", tags=["players", "hot"])
 
 
-def _serialize_player(player: Player) -> PlayerOut:
+def _serialize_player(player: catalog.PlayerEntry) -> PlayerOut:
     return PlayerOut(
         id=str(player.id),
         name=player.name,
@@ -48,17 +48,12 @@ async def list_hot_players(
     else:
         rows = await svc.aggregate_hot_global(skip=skip, limit=limit)
 
-    player_ids = [r["_id"] for r in rows if r.get("_id")]
-    # Fetch Players in one query
-    players = await Player.find({"_id": {"$in": [PydanticObjectId(pid) for pid in player_ids if pid]}}).to_list()
-    players_by_id = {str(p.id): p for p in players}
+    # Hydrate from the player catalog (no player queries)
+    player_catalog = await catalog.get_player_catalog()
+    players = player_catalog.get_many(r.get("_id") for r in rows)
 
     items: List[PlayerHot] = []
-    for r in rows:
-        pid = r.get("_id")
-        if not pid:
-            continue
-        p = players_by_id.get(pid)
+    for r, p in zip(rows, players):
         if not p:
             # Player might be deleted; skip
             continue
@@ -103,11 +98,9 @@ async def get_player_hot(
     thr = threshold or HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
 
     # Validate player exists
-    try:
-        p = await Player.get(PydanticObjectId(player_id))
-    except Exception:
+    if not ObjectId.is_valid(player_id):
         raise HTTPException(status_code=400, detail="Invalid player ID")
-    if not p:
+    if player_id not in await catalog.get_player_catalog():
         raise HTTPException(status_code=404, detail="Player not found")
 
     global_count = await svc.count_global(player_id)
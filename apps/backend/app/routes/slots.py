@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 
 from app.models.admin.slot import Slot
 from app.models.player import Player
 from app.schemas.slot import SlotPublic, SlotListPublic
+from app.services.loaders import Loaders, get_loaders
 
 router = APIRouter(prefix="/api/slots", tags=["slots"])
 
@@ -27,15 +28,14 @@ def to_public(slot: Slot, player_count: int) -> SlotPublic:
 async def list_slots(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    loaders: Loaders = Depends(get_loaders),
 ):
     total = await Slot.find_all().count()
     skip = (page - 1) * page_size
     slots = await Slot.find_all().skip(skip).limit(page_size).to_list()
 
-    results: list[SlotPublic] = []
-    for s in slots:
-        cnt = await Player.find(Player.slot == str(s.id)).count()
-        results.append(to_public(s, cnt))
+    counts = await loaders.player_counts_by_slot.load_many(str(s.id) for s in slots)
+    results: list[SlotPublic] = [to_public(s, cnt) for s, cnt in zip(slots, counts)]
 
     return {"slots": results, "total": total}
 
@@ -14,6 +14,7 @@ from app.schemas.sponsor import (
     UploadResponse
 )
 from app.utils.dependencies import get_current_active_user
+from app.utils.pagination import paginate
 from app.utils.gridfs import (
     upload_sponsor_logo_to_gridfs,
     open_sponsor_logo_stream,
@@ -83,7 +84,9 @@ async def get_sponsors(
     featured: Optional[bool] = Query(None, description="Filter by featured status"),
     active: Optional[bool] = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(100, ge=1, le=100, description="Items per page")
+    page_size: int = Query(100, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching sponsors"),
 ):
     """
     Get all sponsors with optional filters
@@ -93,6 +96,8 @@ async def get_sponsors(
     - **active**: Filter by active status (default: true)
     - **page**: Page number for pagination
     - **page_size**: Number of items per page (max 100)
+    - **cursor**: next_cursor of the previous page (takes precedence over page)
+    - **include_total**: Also return the total count
     """
     # Build query
     query = {}
@@ -112,21 +117,25 @@ async def get_sponsors(
     if active is not None:
         query["active"] = active
     
-    # Get total count
-    total = await Sponsor.find(query).count()
-    
     # Get sponsors with pagination, sorted by priority and created_at
-    sponsors = await Sponsor.find(query)\
-        .sort("+priority", "-created_at")\
-        .skip((page - 1) * page_size)\
-        .limit(page_size)\
-        .to_list()
+    try:
+        result = await paginate(
+            Sponsor.find(query),
+            [("priority", 1), ("created_at", -1)],
+            page_size,
+            cursor=cursor,
+            skip=(page - 1) * page_size,
+            include_total=include_total,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
     
     return SponsorsListResponse(
-        sponsors=[SponsorResponse(**sponsor_to_response(s)) for s in sponsors],
-        total=total,
+        sponsors=[SponsorResponse(**sponsor_to_response(s)) for s in result.items],
+        total=result.total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -137,9 +146,19 @@ async def get_sponsors_no_slash(
     featured: Optional[bool] = Query(None, description="Filter by featured status"),
     active: Optional[bool] = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(100, ge=1, le=100, description="Items per page")
+    page_size: int = Query(100, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also count all matching sponsors"),
 ):
-    return await get_sponsors(tier=tier, featured=featured, active=active, page=page, page_size=page_size)
+    return await get_sponsors(
+        tier=tier,
+        featured=featured,
+        active=active,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+    )
 
 
 @router.get("/{sponsor_id}", response_model=SponsorDetailResponse)
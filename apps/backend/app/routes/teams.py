@@ -1,20 +1,67 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import List, Optional
 from beanie import PydanticObjectId
+from bson import ObjectId
 from datetime import datetime
 
 from app.models.team import Team
-from app.models.player import Player
 from app.models.team_contest_enrollment import TeamContestEnrollment
-from app.models.contest import Contest
 from app.models.user import User
-from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamsListResponse
+from app.common.enums.enrollments import EnrollmentStatus
+from app.utils.timezone import now_ist
+from app.utils.lineup import lineup_hash
+from app.utils.pagination import paginate
+from app.schemas.team import (
+    TeamCreate,
+    TeamUpdate,
+    TeamResponse,
+    TeamsListResponse,
+    TeamBulkCreateRequest,
+    TeamBulkCreateResponse,
+    TeamBulkCreateResult,
+    TeamValidateBatchRequest,
+    TeamValidateBatchResponse,
+    TeamLineupValidation,
+    LineupErrorSchema,
+    TeamLineupTwinsResponse,
+    TeamOptimizeRequest,
+    TeamOptimizeResponse,
+)
 from app.utils.dependencies import get_current_active_user
-from app.models.admin.slot import Slot
+from app.services import catalog
+from app.services import lineup_optimizer
+from app.services import lineups as lineups_svc
+from app.services import scoring
+from app.services import team_locks
+from app.services import team_validation
 
 router = APIRouter(prefix="/api/teams", tags=["teams"])
 
 
+def _raise_for_lineup_errors(errors: List[team_validation.LineupError]) -> None:
+    """Reject a lineup with the first failed rule."""
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors[0].http_detail)
+
+
+def _team_response(team: Team) -> TeamResponse:
+    return TeamResponse(
+        id=str(team.id),
+        user_id=str(team.user_id),
+        team_name=team.team_name,
+        player_ids=[str(pid) for pid in team.player_ids],
+        captain_id=team.captain_id,
+        vice_captain_id=team.vice_captain_id,
+        total_points=team.total_points,
+        total_value=team.total_value,
+        rank=team.rank,
+        rank_change=team.rank_change,
+        contest_id=team.contest_id,
+        created_at=team.created_at,
+        updated_at=team.updated_at,
+    )
+
+
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
 async def create_team(
     team_data: TeamCreate,
@@ -23,97 +70,10 @@ async def create_team(
     """
     Create a new fantasy team for the current user
     """
-    # Validate that captain and vice-captain are in the player list
-    if team_data.captain_id not in team_data.player_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Captain must be one of the selected players"
-        )
-    
-    if team_data.vice_captain_id not in team_data.player_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Vice-captain must be one of the selected players"
-        )
-    
-    if team_data.captain_id == team_data.vice_captain_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Captain and vice-captain must be different players"
-        )
-    
-    # Calculate total value of the team
-    # Convert string IDs to PydanticObjectId
-    player_object_ids = []
-    for pid in team_data.player_ids:
-        try:
-            player_object_ids.append(PydanticObjectId(pid))
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid player ID: {pid}"
-            )
-    
-    players = await Player.find({"_id": {"$in": player_object_ids}}).to_list()
-    total_value = sum(player.price for player in players)
-    
-    # Verify all player IDs are valid
-    if len(players) != len(team_data.player_ids):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Some player IDs are invalid"
-        )
-
-    # Enforce per-slot constraints
-    # Count players per slot (ignore players without a slot)
-    slot_counts: Dict[str, int] = {}
-    for p in players:
-        if p.slot:
-            slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
-
-    # Build validation set: slots present in selection + all slots with min_select > 0
-    present_slot_ids = list(slot_counts.keys())
-    present_slot_oids = []
-    for sid in present_slot_ids:
-        try:
-            present_slot_oids.append(PydanticObjectId(sid))
-        except Exception:
-            # If slot id is malformed, skip; it won't be validated
-            continue
-    slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-    slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-    # Merge unique slots by id
-    slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-    for s in slots_with_min:
-        slots_by_id.setdefault(str(s.id), s)
-
-    violations = []
-    for sid, slot in slots_by_id.items():
-        count = slot_counts.get(sid, 0)
-        if count < slot.min_select or count > slot.max_select:
-            violations.append(
-                {
-                    "slot": {"id": sid, "code": slot.code, "name": slot.name},
-                    "expected": {"min_select": slot.min_select, "max_select": slot.max_select},
-                    "actual": count,
-                }
-            )
-    if violations:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "message": "Team violates per-slot selection constraints",
-                "violations": violations,
-            },
-        )
-
-    # If tied to a contest, enforce allowed teams for daily contests
+    # If tied to a contest, its rules (allowed teams for daily contests) apply too
+    contest = None
     if team_data.contest_id:
-        try:
-            contest = await Contest.get(PydanticObjectId(team_data.contest_id))
-        except Exception:
-            contest = None
+        contest = await catalog.get_contest(team_data.contest_id)
         if not contest:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
 
@@ -126,17 +86,10 @@ async def create_team(
                 detail="Cannot create a team for an ongoing contest.",
             )
 
-        if contest.contest_type == "daily" and contest.allowed_teams:
-            disallowed = [p.name for p in players if p.team and p.team not in contest.allowed_teams]
-            if disallowed:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        "message": "Selected players include teams disallowed for this daily contest",
-                        "disallowed_players": disallowed,
-                        "allowed_teams": contest.allowed_teams,
-                    },
-                )
+    # Captain/vice-captain, known players, per-slot limits and allowed teams (no DB reads)
+    rules = await team_validation.compile_rules(contest)
+    check = rules.check(team_data.player_ids, team_data.captain_id, team_data.vice_captain_id)
+    _raise_for_lineup_errors(check.errors)
     
     # Create team document
     team = Team(
@@ -145,64 +98,211 @@ async def create_team(
         player_ids=team_data.player_ids,
         captain_id=team_data.captain_id,
         vice_captain_id=team_data.vice_captain_id,
-        total_value=total_value,
-        contest_id=team_data.contest_id
+        total_points=check.total_points,
+        total_value=check.total_value,
+        contest_id=team_data.contest_id,
+        lineup_hash=lineup_hash(team_data.player_ids, team_data.captain_id, team_data.vice_captain_id),
     )
     
     await team.insert()
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
+    return _team_response(team)
+
+
+@router.post("/bulk", response_model=TeamBulkCreateResponse)
+async def create_teams_bulk(
+    body: TeamBulkCreateRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create several teams for the current user in one call, optionally enrolling them in a contest.
+    Every lineup is validated against the same player/slot snapshot; invalid ones are reported
+    per team and the valid ones are still created.
+    """
+    if body.enroll and not body.contest_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="contest_id is required to enroll")
+
+    contest = None
+    if body.contest_id:
+        contest = await catalog.get_contest(body.contest_id)
+        if not contest:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
+
+        # Prevent joining an ongoing contest (same rule as single create)
+        now = datetime.utcnow()
+        if contest.status == "ongoing" and contest.start_at <= now < contest.end_at:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Cannot create a team for an ongoing contest.",
+            )
+        if body.enroll:
+            if contest.visibility != "public":
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contest not found")
+            if contest.status in ("completed", "archived"):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contest is not open for enrollment")
+
+    rules = await team_validation.compile_rules(contest)
+    results: List[TeamBulkCreateResult] = []
+    teams: List[Team] = []
+    for index, item in enumerate(body.teams):
+        check = rules.check(item.player_ids, item.captain_id, item.vice_captain_id)
+        if not check.valid:
+            results.append(TeamBulkCreateResult(
+                index=index,
+                created=False,
+                errors=[LineupErrorSchema(**err.as_dict()) for err in check.errors],
+            ))
+            continue
+        team = Team(
+            id=PydanticObjectId(),
+            user_id=current_user.id,
+            team_name=item.team_name,
+            player_ids=item.player_ids,
+            captain_id=item.captain_id,
+            vice_captain_id=item.vice_captain_id,
+            total_points=check.total_points,
+            total_value=check.total_value,
+            contest_id=body.contest_id,
+            lineup_hash=lineup_hash(item.player_ids, item.captain_id, item.vice_captain_id),
+        )
+        teams.append(team)
+        results.append(TeamBulkCreateResult(index=index, created=True, team=_team_response(team)))
+
+    # Ids are assigned up front, so one insert_many covers every team
+    if teams:
+        await Team.insert_many(teams)
+
+    enrolled_count = 0
+    if body.enroll and teams:
+        enrollments = [
+            TeamContestEnrollment(
+                id=PydanticObjectId(),
+                team_id=team.id,
+                contest_id=contest.id,
+                user_id=current_user.id,
+                status=EnrollmentStatus.ACTIVE,
+                enrolled_at=now_ist(),
+            )
+            for team in teams
+        ]
+        await TeamContestEnrollment.insert_many(enrollments)
+        await scoring.bump_lineup_version([contest.id])
+        team_locks.invalidate_teams(team.id for team in teams)
+        enrollment_by_team = {str(enr.team_id): str(enr.id) for enr in enrollments}
+        for result in results:
+            if result.team is not None:
+                result.enrollment_id = enrollment_by_team.get(result.team.id)
+        enrolled_count = len(enrollments)
+
+    return TeamBulkCreateResponse(
+        results=results,
+        created_count=len(teams),
+        enrolled_count=enrolled_count,
+    )
+
+
+@router.post("/validate-batch", response_model=TeamValidateBatchResponse)
+async def validate_team_batch(
+    body: TeamValidateBatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Validate many draft lineups in one call, using the same rules as team create
+    """
+    contest = None
+    if body.contest_id:
+        contest = await catalog.get_contest(body.contest_id)
+        if not contest:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
+
+    rules = await team_validation.compile_rules(contest)
+    results: List[TeamLineupValidation] = []
+    for index, draft in enumerate(body.lineups):
+        check = rules.check(draft.player_ids, draft.captain_id, draft.vice_captain_id)
+        results.append(TeamLineupValidation(
+            index=index,
+            valid=check.valid,
+            total_value=check.total_value,
+            total_points=check.total_points,
+            errors=[LineupErrorSchema(**err.as_dict()) for err in check.errors],
+        ))
+
+    return TeamValidateBatchResponse(
+        results=results,
+        valid_count=sum(1 for r in results if r.valid),
+    )
+
+
+@router.post("/optimize", response_model=TeamOptimizeResponse)
+async def optimize_team(
+    body: TeamOptimizeRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Build the lineup with the highest objective within the budget, satisfying the same rules as team create
+    """
+    contest = None
+    if body.contest_id:
+        contest = await catalog.get_contest(body.contest_id)
+        if not contest:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
+
+    rules = await team_validation.compile_rules(contest)
+    try:
+        lineup = await lineup_optimizer.optimize_lineup(
+            rules,
+            body.budget,
+            objective=body.objective,
+            locked_ids=body.locked_player_ids,
+            excluded_ids=body.excluded_player_ids,
+            contest_id=body.contest_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if lineup is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No lineup satisfies the budget and slot constraints",
+        )
+
+    return TeamOptimizeResponse(
+        player_ids=lineup.player_ids,
+        captain_id=lineup.captain_id,
+        vice_captain_id=lineup.vice_captain_id,
+        total_value=lineup.total_value,
+        objective=body.objective,
+        objective_value=lineup.objective_value,
     )
 
 
 @router.get("/", response_model=TeamsListResponse)
 async def get_user_teams(
     current_user: User = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    include_total: bool = Query(False, description="Also count all teams of the user"),
 ):
     """
-    Get all teams created by the current user
+    Get all teams created by the current user, newest first
     """
-    teams = await Team.find(
-        Team.user_id == current_user.id
-    ).sort("-created_at").skip(skip).limit(limit).to_list()
-    
-    total = await Team.find(Team.user_id == current_user.id).count()
-    
-    team_responses = [
-        TeamResponse(
-            id=str(team.id),
-            user_id=str(team.user_id),
-            team_name=team.team_name,
-            player_ids=team.player_ids,
-            captain_id=team.captain_id,
-            vice_captain_id=team.vice_captain_id,
-            total_points=team.total_points,
-            total_value=team.total_value,
-            rank=team.rank,
-            rank_change=team.rank_change,
-            contest_id=team.contest_id,
-            created_at=team.created_at,
-            updated_at=team.updated_at
+    try:
+        page = await paginate(
+            Team.find(Team.user_id == current_user.id),
+            [("created_at", -1)],
+            limit,
+            cursor=cursor,
+            skip=skip,
+            include_total=include_total,
         )
-        for team in teams
-    ]
-    
-    return TeamsListResponse(teams=team_responses, total=total)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    return TeamsListResponse(
+        teams=[_team_response(team) for team in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
+    )
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
@@ -234,20 +334,47 @@ async def get_team(
             detail="You don't have permission to access this team"
         )
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
+    return _team_response(team)
+
+
+@router.get("/{team_id}/lineup-twins", response_model=TeamLineupTwinsResponse)
+async def get_team_lineup_twins(
+    team_id: str,
+    contest_id: Optional[str] = Query(None, description="Only count teams enrolled in this contest"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Count how many other teams and users picked exactly this team's lineup
+    """
+    try:
+        team = await Team.get(PydanticObjectId(team_id))
+    except Exception:
+        team = None
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found"
+        )
+
+    if team.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this team"
+        )
+
+    contest_oid = None
+    if contest_id:
+        if not ObjectId.is_valid(contest_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
+        contest_oid = ObjectId(contest_id)
+
+    counts = await lineups_svc.count_lineup_twins(team, contest_oid)
+    return TeamLineupTwinsResponse(
+        team_id=str(team.id),
+        lineup_hash=lineups_svc.team_lineup_hash(team),
+        contest_id=contest_id,
+        other_teams=counts["other_teams"],
+        other_users=counts["other_users"],
     )
 
 
@@ -282,26 +409,12 @@ async def update_team(
         )
     
     # Lock edits only if team is enrolled in a contest that is currently ongoing
-    active_enrs = await TeamContestEnrollment.find({
-        "team_id": team.id,
-        "status": "active",
-    }).to_list()
-    if active_enrs:
-        from datetime import datetime as _dt
-        contest_ids = [enr.contest_id for enr in active_enrs]
-        # Ongoing = status active AND start_at <= now < end_at
-        now = _dt.utcnow()
-        active_contest_count = await Contest.find({
-            "_id": {"$in": contest_ids},
-            "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
-        }).count()
-        if active_contest_count > 0:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
-            )
+    # (Ongoing = not archived AND start_at <= now < end_at; cached per team)
+    if await team_locks.is_team_locked(team.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
+        )
     
     # Update fields
     update_data = team_data.model_dump(exclude_unset=True)
@@ -309,99 +422,26 @@ async def update_team(
     if update_data:
         # Validate captain/vice-captain if being updated
         if "player_ids" in update_data or "captain_id" in update_data or "vice_captain_id" in update_data:
-            player_ids = update_data.get("player_ids", team.player_ids)
+            player_ids = [str(pid) for pid in update_data.get("player_ids", team.player_ids)]
             captain_id = update_data.get("captain_id", team.captain_id)
             vice_captain_id = update_data.get("vice_captain_id", team.vice_captain_id)
             
-            if captain_id and captain_id not in player_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Captain must be one of the selected players"
-                )
-            
-            if vice_captain_id and vice_captain_id not in player_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Vice-captain must be one of the selected players"
-                )
-            
-            if captain_id and vice_captain_id and captain_id == vice_captain_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Captain and vice-captain must be different players"
-                )
-            
-            # Recalculate total value and validate per-slot constraints if player_ids changed
             if "player_ids" in update_data:
-                # Convert string IDs to PydanticObjectId
-                player_object_ids = []
-                for pid in player_ids:
-                    try:
-                        player_object_ids.append(PydanticObjectId(pid))
-                    except Exception:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Invalid player ID: {pid}"
-                        )
-                players = await Player.find({"_id": {"$in": player_object_ids}}).to_list()
-                update_data["total_value"] = sum(player.price for player in players)
-
-                # If team belongs to a daily contest with restrictions, enforce allowed teams
+                # Full lineup check; recalculates totals from the new players
+                contest = None
                 if team.contest_id:
-                    try:
-                        contest = await Contest.get(PydanticObjectId(team.contest_id))
-                    except Exception:
-                        contest = None
-                    if contest and contest.contest_type == "daily" and contest.allowed_teams:
-                        disallowed = [p.name for p in players if p.team and p.team not in contest.allowed_teams]
-                        if disallowed:
-                            raise HTTPException(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                detail={
-                                    "message": "Selected players include teams disallowed for this daily contest",
-                                    "disallowed_players": disallowed,
-                                    "allowed_teams": contest.allowed_teams,
-                                },
-                            )
-
-                # Per-slot constraints validation (same as create)
-                slot_counts: Dict[str, int] = {}
-                for p in players:
-                    if p.slot:
-                        slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
-                present_slot_ids = list(slot_counts.keys())
-                present_slot_oids = []
-                for sid in present_slot_ids:
-                    try:
-                        present_slot_oids.append(PydanticObjectId(sid))
-                    except Exception:
-                        continue
-                slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-                slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-                slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-                for s in slots_with_min:
-                    slots_by_id.setdefault(str(s.id), s)
-
-                violations = []
-                for sid, slot in slots_by_id.items():
-                    count = slot_counts.get(sid, 0)
-                    if count < slot.min_select or count > slot.max_select:
-                        violations.append(
-                            {
-                                "slot": {"id": sid, "code": slot.code, "name": slot.name},
-                                "expected": {"min_select": slot.min_select, "max_select": slot.max_select},
-                                "actual": count,
-                            }
-                        )
-                if violations:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={
-                            "message": "Team violates per-slot selection constraints",
-                            "violations": violations,
-                        },
-                    )
+                    contest = await catalog.get_contest(team.contest_id)
+                rules = await team_validation.compile_rules(contest)
+                check = rules.check(player_ids, captain_id, vice_captain_id, require_roles=False)
+                _raise_for_lineup_errors(check.errors)
+                update_data["player_ids"] = [PydanticObjectId(pid) for pid in player_ids]
+                update_data["total_value"] = check.total_value
+                update_data["total_points"] = check.total_points
+            else:
+                _raise_for_lineup_errors(
+                    team_validation.check_captains(player_ids, captain_id, vice_captain_id, require_roles=False)
+                )
+            update_data["lineup_hash"] = lineup_hash(player_ids, captain_id, vice_captain_id)
         
         update_data["updated_at"] = datetime.utcnow()
         
@@ -409,22 +449,15 @@ async def update_team(
             setattr(team, key, value)
         
         await team.save()
+
+        # Contest leaderboards score the lineup, so enrolled contests must rebuild their matrices
+        if {"player_ids", "captain_id", "vice_captain_id"} & update_data.keys():
+            await scoring.bump_team_lineup_versions(team.id)
+        elif "team_name" in update_data:
+            # leaderboards show the team name; refresh their ETags without rescoring
+            await scoring.bump_team_display_versions(team.id)
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
-    )
+    return _team_response(team)
 
 
 @router.patch("/{team_id}/rename", response_model=TeamResponse)
@@ -470,46 +503,20 @@ async def rename_team(
         )
     
     # Lock edits only if team is enrolled in a contest that is currently ongoing
-    active_enrs = await TeamContestEnrollment.find({
-        "team_id": team.id,
-        "status": "active",
-    }).to_list()
-    if active_enrs:
-        from datetime import datetime as _dt
-        contest_ids = [enr.contest_id for enr in active_enrs]
-        now = _dt.utcnow()
-        active_contest_count = await Contest.find({
-            "_id": {"$in": contest_ids},
-            "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
-        }).count()
-        if active_contest_count > 0:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
-            )
+    # (Ongoing = not archived AND start_at <= now < end_at; cached per team)
+    if await team_locks.is_team_locked(team.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
+        )
     
     # Update team name
     team.team_name = team_name.strip()
     team.updated_at = datetime.utcnow()
     await team.save()
+    await scoring.bump_team_display_versions(team.id)
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
-    )
+    return _team_response(team)
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -553,6 +560,8 @@ async def delete_team(
             enr.status = "removed"
             enr.removed_at = now
             await enr.save()
+        await scoring.bump_lineup_version(enr.contest_id for enr in active_enrollments)
+    team_locks.invalidate_teams([team.id])
 
     await team.delete()
     
@@ -48,6 +48,7 @@ class ContestResponse(ContestBase):
 
 class ContestListResponse(BaseModel):
     contests: list[ContestResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
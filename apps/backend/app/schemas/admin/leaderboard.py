@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class TeamTotalsReconcileResponse(BaseModel):
+    scanned: int
+    changed: int
+    duration_ms: float
+
+
+class ScoringTickMetricsResponse(BaseModel):
+    tick_seconds: float
+    running: bool
+    pending_contests: int
+    ticks: int
+    updates: int
+    players_written: int
+    last_batch_size: int
+    max_batch_size: int
+    avg_batch_size: float
+    last_tick_latency_ms: float
+    max_tick_latency_ms: float
+    avg_tick_latency_ms: float
+
+
+class RankSnapshotRunResponse(BaseModel):
+    contests: int
+    taken: int
+    duration_ms: float
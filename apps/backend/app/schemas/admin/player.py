@@ -40,6 +40,7 @@ class PlayerResponse(PlayerBase):
 
 class PlayerListResponse(BaseModel):
     players: list[PlayerResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class PointsEventItem(BaseModel):
+    player_id: str
+    points: float
+    occurred_at: Optional[datetime] = None  # defaults to now
+    event_id: Optional[str] = None  # replays with the same id are ignored
+    source: Optional[str] = None
+
+
+class PointsEventBatchRequest(BaseModel):
+    events: List[PointsEventItem] = Field(..., min_length=1)
+
+
+class PointsEventBatchResponse(BaseModel):
+    recorded: int
+    duplicates: int
+    contests: int
+
+
+class PointsEventResponse(BaseModel):
+    id: str
+    player_id: str
+    points: float
+    cumulative: float
+    occurred_at: datetime
+    event_id: Optional[str] = None
+    source: Optional[str] = None
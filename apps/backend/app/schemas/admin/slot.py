@@ -43,6 +43,7 @@ class SlotResponse(BaseModel):
 
 class SlotListResponse(BaseModel):
     slots: list[SlotResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
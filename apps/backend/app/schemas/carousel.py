@@ -39,9 +39,10 @@ class CarouselImageResponse(BaseModel):
 class CarouselImagesListResponse(BaseModel):
     """Schema for paginated list of carousel images"""
     images: List[CarouselImageResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class UploadResponse(BaseModel):
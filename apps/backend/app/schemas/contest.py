@@ -101,6 +101,7 @@ class ContestResponse(BaseModel):
 
 class ContestListResponse(BaseModel):
     contests: List[ContestResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # None on the last page
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
+from datetime import datetime
 
 
 class LeaderboardEntrySchema(BaseModel):
@@ -30,6 +31,12 @@ class LeaderboardResponseSchema(BaseModel):
     """Schema for leaderboard response"""
     entries: List[LeaderboardEntrySchema]
     currentUserEntry: Optional[LeaderboardEntrySchema] = None
+    # Entries surrounding the current user's best team (when requested)
+    aroundMe: Optional[List[LeaderboardEntrySchema]] = None
+    # Number of ranked teams (when cheaply known)
+    total: Optional[int] = None
+    # Keyset cursor of the next page (pass as ?cursor=...), None on the last page
+    nextCursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -47,3 +54,17 @@ class LeaderboardResponseSchema(BaseModel):
                 "currentUserEntry": None
             }
         }
+
+
+class RankHistoryEntrySchema(BaseModel):
+    """A team's position in one rank snapshot"""
+    takenAt: datetime
+    rank: Optional[int] = None  # None when the team was not ranked in that snapshot
+    points: Optional[float] = None
+
+
+class RankHistoryResponseSchema(BaseModel):
+    """Schema for a team's rank history, newest snapshot first"""
+    teamId: str
+    contestId: Optional[str] = None
+    entries: List[RankHistoryEntrySchema]
@@ -67,9 +67,10 @@ class SponsorResponse(SponsorBase):
 class SponsorsListResponse(BaseModel):
     """Schema for list of sponsors response"""
     sponsors: list[SponsorResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
     page: int = 1
     page_size: int = 100
+    next_cursor: Optional[str] = None  # None on the last page
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -88,7 +88,8 @@ class TeamResponse(BaseModel):
 class TeamsListResponse(BaseModel):
     """Schema for list of teams response"""
     teams: List[TeamResponse]
-    total: int
+    total: Optional[int] = None  # only counted with include_total=true
+    next_cursor: Optional[str] = None  # None on the last page
 
     class Config:
         json_schema_extra = {
@@ -110,6 +111,144 @@ class TeamsListResponse(BaseModel):
                         "updated_at": "2024-01-01T00:00:00"
                     }
                 ],
-                "total": 1
+                "total": 1,
+                "next_cursor": None
             }
         }
+
+
+class TeamBulkCreateItem(BaseModel):
+    """One team of a bulk create request"""
+    team_name: str = Field(..., min_length=1, max_length=100)
+    player_ids: List[str] = Field(..., min_length=1, max_length=16, description="List of player IDs (1-16 players)")
+    captain_id: str
+    vice_captain_id: str
+
+
+class TeamBulkCreateRequest(BaseModel):
+    """Schema for creating several teams (optionally enrolled in one contest) in one call"""
+    contest_id: Optional[str] = None
+    enroll: bool = Field(False, description="Also enroll every created team in contest_id")
+    teams: List[TeamBulkCreateItem] = Field(..., min_length=1, max_length=50)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "contest_id": "contest123",
+                "enroll": True,
+                "teams": [
+                    {
+                        "team_name": "Entry 1",
+                        "player_ids": ["player1", "player2", "player3", "player4"],
+                        "captain_id": "player1",
+                        "vice_captain_id": "player2"
+                    }
+                ]
+            }
+        }
+
+
+class TeamLineupDraft(BaseModel):
+    """One draft lineup to validate"""
+    player_ids: List[str]
+    captain_id: Optional[str] = None
+    vice_captain_id: Optional[str] = None
+
+
+class TeamValidateBatchRequest(BaseModel):
+    """Schema for validating many draft lineups against the same rules"""
+    contest_id: Optional[str] = Field(None, description="Apply this contest's rules (allowed teams for daily contests)")
+    lineups: List[TeamLineupDraft] = Field(..., min_length=1, max_length=200)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "contest_id": "contest123",
+                "lineups": [
+                    {
+                        "player_ids": ["player1", "player2", "player3", "player4"],
+                        "captain_id": "player1",
+                        "vice_captain_id": "player2"
+                    }
+                ]
+            }
+        }
+
+
+class LineupErrorSchema(BaseModel):
+    """One failed lineup rule"""
+    code: str
+    message: str
+    details: Optional[dict] = None
+
+
+class TeamLineupValidation(BaseModel):
+    """Validation outcome of one draft lineup (same order as the request)"""
+    index: int
+    valid: bool
+    total_value: float = 0.0
+    total_points: float = 0.0
+    errors: List[LineupErrorSchema] = []
+
+
+class TeamValidateBatchResponse(BaseModel):
+    """Schema for batch lineup validation response"""
+    results: List[TeamLineupValidation]
+    valid_count: int
+
+
+class TeamOptimizeRequest(BaseModel):
+    """Schema for building the best lineup within a budget"""
+    contest_id: Optional[str] = Field(None, description="Apply this contest's rules (allowed teams for daily contests)")
+    budget: float = Field(..., gt=0, description="Maximum total price of the lineup")
+    objective: Literal["points", "form", "ownership"] = Field(
+        "points", description="Per-player value to maximize (ownership counts selections in the contest, or globally)"
+    )
+    locked_player_ids: List[str] = Field([], max_length=16, description="Players the lineup must include")
+    excluded_player_ids: List[str] = Field([], max_length=500, description="Players the lineup must not include")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "contest_id": "contest123",
+                "budget": 100.0,
+                "objective": "points",
+                "locked_player_ids": ["player1"],
+                "excluded_player_ids": []
+            }
+        }
+
+
+class TeamOptimizeResponse(BaseModel):
+    """Best lineup for an optimize request; captain and vice-captain are chosen by the optimizer"""
+    player_ids: List[str]
+    captain_id: str
+    vice_captain_id: str
+    total_value: float
+    objective: str
+    objective_value: float
+
+
+class TeamBulkCreateResult(BaseModel):
+    """Outcome of one team of a bulk create request (same order as the request)"""
+    index: int
+    created: bool
+    team: Optional[TeamResponse] = None
+    enrollment_id: Optional[str] = None
+    errors: List[LineupErrorSchema] = []
+
+
+class TeamBulkCreateResponse(BaseModel):
+    """Schema for bulk team creation response"""
+    results: List[TeamBulkCreateResult]
+    created_count: int
+    enrolled_count: int
+
+
+class TeamLineupTwinsResponse(BaseModel):
+    """How many other teams picked exactly this lineup (players and C/VC)"""
+    team_id: str
+    lineup_hash: str
+    contest_id: Optional[str] = None
+    other_teams: int
+    other_users: int
@@ -0,0 +1,45 @@
+"""In-process reference data catalogs"""
+from app.services.catalog.contests import (
+    forget_contests,
+    get_contest,
+    get_contest_list,
+    get_contests,
+    invalidate_contests,
+    put_contest_list,
+)
+from app.services.catalog.players import (
+    PlayerCatalog,
+    PlayerEntry,
+    get_player_catalog,
+    invalidate_player_catalog,
+    load_player_catalog,
+    update_player_points,
+)
+from app.services.catalog.slots import (
+    SlotCatalog,
+    get_slot_catalog,
+    invalidate_slot_catalog,
+    load_slot_catalog,
+)
+from app.services.catalog.versions import bump_version, get_version
+
+__all__ = [
+    "PlayerCatalog",
+    "PlayerEntry",
+    "SlotCatalog",
+    "bump_version",
+    "forget_contests",
+    "get_contest",
+    "get_contest_list",
+    "get_contests",
+    "get_player_catalog",
+    "get_slot_catalog",
+    "get_version",
+    "invalidate_contests",
+    "invalidate_player_catalog",
+    "invalidate_slot_catalog",
+    "load_player_catalog",
+    "load_slot_catalog",
+    "put_contest_list",
+    "update_player_points",
+]
@@ -0,0 +1,139 @@
+"""In-process contest cache.
+
+Player listings, team create, enrollment, leaderboards and contest team
+views all start by reading one small contest document (its time window,
+``allowed_teams`` and leaderboard versions). This read-through cache keeps
+contests by id for ``CONTEST_CACHE_TTL_SECONDS``.
+
+Admin contest writes drop the cache and bump the shared ``contests`` cache
+version, which other workers check at most every
+``VERSION_CHECK_INTERVAL_SECONDS``. Leaderboard version bumps drop the
+contests they touch on the worker that made them. Other workers see those
+bumps within the TTL, so keep the TTL short.
+
+Callers get a copy of the cached document, so they may change it in memory
+(e.g. a computed status) without affecting other requests. Code that writes
+a contest back should load it with ``Contest.get`` instead.
+
+The public contest list keeps serialized response bodies here too, keyed by
+the normalized query. They share the ``contests`` version, so the same
+writes and status transitions drop them. A body also expires after
+``CONTEST_LIST_CACHE_TTL_SECONDS``, or earlier when a contest it shows
+starts or ends, since its computed status would change then.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.models.contest import Contest
+from app.services.catalog.versions import bump_version, get_version
+from config.settings import settings
+
+CACHE_KEY = "contests"
+# Upper bound on how stale another worker's contest edits can be here
+VERSION_CHECK_INTERVAL_SECONDS = 2.0
+# Contests kept before the cache is cleared
+MAX_CACHED_CONTESTS = 10_000
+
+# Serialized list responses kept before that cache is cleared
+MAX_CACHED_LISTS = 1_000
+
+# contest id -> (loaded at, document or None when it does not exist)
+_entries: Dict[ObjectId, Tuple[float, Optional[Contest]]] = {}
+# normalized list query -> (expires at, serialized response body)
+_lists: Dict[Hashable, Tuple[float, bytes]] = {}
+_version: Optional[int] = None
+_checked_at = 0.0
+
+
+def _to_oid(contest_id: object) -> Optional[ObjectId]:
+    if isinstance(contest_id, ObjectId):
+        return contest_id
+    if contest_id is not None and ObjectId.is_valid(str(contest_id)):
+        return ObjectId(str(contest_id))
+    return None
+
+
+async def _check_version() -> None:
+    global _version, _checked_at
+    if time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL_SECONDS:
+        return
+    _checked_at = time.monotonic()
+    version = await get_version(CACHE_KEY)
+    if version != _version:
+        _entries.clear()
+        _lists.clear()
+        _version = version
+
+
+async def get_contests(contest_ids: Iterable[object]) -> List[Optional[Contest]]:
+    """Return the contests of ``contest_ids`` in order (None for unknown or invalid ids)."""
+    await _check_version()
+    oids = [_to_oid(cid) for cid in contest_ids]
+    now = time.monotonic()
+    ttl = settings.contest_cache_ttl_seconds
+    missing = list({
+        oid for oid in oids
+        if oid is not None and (oid not in _entries or now - _entries[oid][0] >= ttl)
+    })
+    if missing:
+        found = {c.id: c for c in await Contest.find({"_id": {"$in": missing}}).to_list()}
+        if len(_entries) + len(missing) > MAX_CACHED_CONTESTS:
+            _entries.clear()
+        for oid in missing:
+            _entries[oid] = (now, found.get(oid))
+    out: List[Optional[Contest]] = []
+    for oid in oids:
+        entry = _entries.get(oid) if oid is not None else None
+        contest = entry[1] if entry else None
+        out.append(contest.model_copy() if contest is not None else None)
+    return out
+
+
+async def get_contest(contest_id: object) -> Optional[Contest]:
+    """Return the contest with ``contest_id`` (str or ObjectId), or None."""
+    return (await get_contests([contest_id]))[0]
+
+
+def forget_contests(contest_ids: Iterable[object]) -> None:
+    """Drop ``contest_ids`` from this worker's cache (after leaderboard version bumps)."""
+    for cid in contest_ids:
+        oid = _to_oid(cid)
+        if oid is not None:
+            _entries.pop(oid, None)
+
+
+async def get_contest_list(key: Hashable) -> Optional[bytes]:
+    """Return the cached response body of the contest list query ``key``, or None."""
+    await _check_version()
+    entry = _lists.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() >= entry[0]:
+        _lists.pop(key, None)
+        return None
+    return entry[1]
+
+
+def put_contest_list(key: Hashable, body: bytes, max_age: Optional[float] = None) -> None:
+    """Cache ``body`` for the contest list query ``key`` (at most ``max_age`` seconds when given)."""
+    ttl = settings.contest_list_cache_ttl_seconds
+    if ttl <= 0:
+        return
+    if max_age is not None:
+        ttl = min(ttl, max_age)
+    if len(_lists) >= MAX_CACHED_LISTS:
+        _lists.clear()
+    _lists[key] = (time.monotonic() + ttl, body)
+
+
+async def invalidate_contests() -> None:
+    """Call after contest writes: bumps the shared version and drops this worker's cache."""
+    global _version, _checked_at
+    _version = await bump_version(CACHE_KEY)
+    _entries.clear()
+    _lists.clear()
+    _checked_at = time.monotonic()
@@ -0,0 +1,216 @@
+"""In-process player catalog.
+
+Team validation, daily-contest team checks, player listings and hot-player
+hydration all need the same few player attributes. Instead of an ``$in``
+query per request they read this catalog, which keeps every player in
+column arrays (one list per attribute, prices and points in ``array('d')``)
+plus an ``id -> row`` index, so lookups are dictionary hits.
+
+Like the slot catalog it is loaded at startup, dropped by player writes
+(admin CRUD, slot assignment, imports) on the worker that made them, and
+reloaded by the other workers once they see the shared ``players`` cache
+version move.
+
+Points change every scoring tick during a match, so the contest points
+mirror does not go through that path. :func:`update_player_points` patches
+the points column in place and bumps the separate ``player_points`` version;
+other workers then re-read only the points of players updated since their
+last sync.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Collection, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from app.models.player import Player
+from app.services.catalog.versions import bump_version, get_version
+from app.utils.timezone import now_ist
+
+CACHE_KEY = "players"
+POINTS_CACHE_KEY = "player_points"
+# Upper bound on how stale another worker's player edits can be here
+VERSION_CHECK_INTERVAL_SECONDS = 2.0
+# Points syncs re-read players updated this long before the last sync (clock skew between workers)
+POINTS_SYNC_MARGIN = timedelta(seconds=30)
+
+
+class PlayerEntry(NamedTuple):
+    """One catalog row; attribute names match the ``Player`` document."""
+
+    id: str
+    name: str
+    team: Optional[str]
+    slot: Optional[str]
+    price: float
+    points: float
+    status: Optional[str]
+    is_available: bool
+    stats: Optional[Dict[str, Any]]
+    form: Optional[str]
+    injury_status: Optional[str]
+    image_url: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+class PlayerCatalog:
+    """Snapshot of every player at one cache version; only the points column is patched in place."""
+
+    def __init__(self, version: int, docs: List[dict], points_version: int = 0, synced_at: Optional[datetime] = None):
+        self.version = version
+        self.points_version = points_version
+        # points of players updated before this time (minus POINTS_SYNC_MARGIN) are loaded
+        self.points_synced_at = synced_at or now_ist()
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.teams: List[Optional[str]] = []
+        self.slots: List[Optional[str]] = []
+        self.statuses: List[Optional[str]] = []
+        self.available: List[bool] = []
+        self.prices = array("d")
+        self.points = array("d")
+        # rarely read attributes, only needed to serialize a full player
+        self._details: List[tuple] = []
+        for doc in docs:
+            self.ids.append(str(doc["_id"]))
+            self.names.append(doc.get("name") or "")
+            self.teams.append(doc.get("team"))
+            slot = doc.get("slot")
+            self.slots.append(str(slot) if slot is not None else None)
+            self.statuses.append(doc.get("status"))
+            self.available.append(bool(doc.get("is_available", True)))
+            self.prices.append(float(doc.get("price") or 0.0))
+            self.points.append(float(doc.get("points") or 0.0))
+            self._details.append((
+                doc.get("stats"),
+                doc.get("form"),
+                doc.get("injury_status"),
+                doc.get("image_url"),
+                doc.get("created_at"),
+                doc.get("updated_at"),
+            ))
+        self.index_by_id: Dict[str, int] = {pid: i for i, pid in enumerate(self.ids)}
+        # row numbers in listing order (name, then id)
+        self.by_name: List[int] = sorted(range(len(self.ids)), key=lambda i: (self.names[i], self.ids[i]))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id: object) -> bool:
+        return str(player_id) in self.index_by_id
+
+    def _entry(self, i: int) -> PlayerEntry:
+        return PlayerEntry(
+            self.ids[i],
+            self.names[i],
+            self.teams[i],
+            self.slots[i],
+            self.prices[i],
+            self.points[i],
+            self.statuses[i],
+            self.available[i],
+            *self._details[i],
+        )
+
+    def patch_points(self, points_by_player: Mapping[object, float]) -> None:
+        """Overwrite the points of the given players (unknown ids are ignored)."""
+        for player_id, points in points_by_player.items():
+            i = self.index_by_id.get(str(player_id))
+            if i is not None:
+                self.points[i] = float(points)
+
+    def get(self, player_id: object) -> Optional[PlayerEntry]:
+        """Return the player with ``player_id`` (str or ObjectId), or None."""
+        i = self.index_by_id.get(str(player_id))
+        return self._entry(i) if i is not None else None
+
+    def get_many(self, player_ids: Iterable[object]) -> List[Optional[PlayerEntry]]:
+        """Return the players of ``player_ids`` in order (None for unknown ids)."""
+        return [self.get(pid) for pid in player_ids]
+
+    def select(
+        self,
+        slot: Optional[str] = None,
+        teams: Optional[Collection[str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[PlayerEntry]:
+        """Return players ordered by name, optionally restricted to one slot and to real teams."""
+        allowed = set(teams) if teams is not None else None
+        rows = (
+            i for i in self.by_name
+            if (slot is None or self.slots[i] == slot)
+            and (allowed is None or self.teams[i] in allowed)
+        )
+        out: List[PlayerEntry] = []
+        for n, i in enumerate(rows):
+            if n < skip:
+                continue
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self._entry(i))
+        return out
+
+
+_catalog: Optional[PlayerCatalog] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def load_player_catalog() -> PlayerCatalog:
+    """(Re)load the catalog from the database."""
+    global _catalog, _checked_at
+    async with _lock:
+        version = await get_version(CACHE_KEY)
+        points_version = await get_version(POINTS_CACHE_KEY)
+        synced_at = now_ist()
+        docs = await Player.get_motor_collection().find({}).to_list(length=None)
+        _catalog = PlayerCatalog(version, docs, points_version, synced_at)
+        _checked_at = time.monotonic()
+        return _catalog
+
+
+async def _sync_points(catalog: PlayerCatalog, points_version: int) -> None:
+    """Re-read the points of players updated since the last sync."""
+    synced_at = now_ist()
+    docs = await Player.get_motor_collection().find(
+        {"updated_at": {"$gte": catalog.points_synced_at - POINTS_SYNC_MARGIN}},
+        projection={"points": 1},
+    ).to_list(length=None)
+    catalog.patch_points({d["_id"]: float(d.get("points") or 0.0) for d in docs})
+    catalog.points_version = points_version
+    catalog.points_synced_at = synced_at
+
+
+async def get_player_catalog() -> PlayerCatalog:
+    """Return the catalog, reloading it when another worker changed players."""
+    global _checked_at
+    catalog = _catalog
+    if catalog is None:
+        return await load_player_catalog()
+    if time.monotonic() - _checked_at >= VERSION_CHECK_INTERVAL_SECONDS:
+        _checked_at = time.monotonic()
+        if await get_version(CACHE_KEY) != catalog.version:
+            return await load_player_catalog()
+        points_version = await get_version(POINTS_CACHE_KEY)
+        if points_version != catalog.points_version:
+            await _sync_points(catalog, points_version)
+    return catalog
+
+
+async def update_player_points(points_by_player: Mapping[object, float]) -> None:
+    """Call after ``Player.points`` writes: patches this worker's copy and signals the others."""
+    await bump_version(POINTS_CACHE_KEY)
+    if _catalog is not None:
+        _catalog.patch_points(points_by_player)
+
+
+async def invalidate_player_catalog() -> None:
+    """Call after any player write: bumps the shared version and drops this worker's copy."""
+    global _catalog, _checked_at
+    await bump_version(CACHE_KEY)
+    _catalog = None
+    _checked_at = 0.0
@@ -0,0 +1,101 @@
+"""In-process slot catalog.
+
+Slots change a few times per season, so team create/update validates per-slot
+selection limits against an in-memory catalog instead of querying ``slots``.
+The catalog is loaded at startup, dropped by admin slot writes on the worker
+that made them, and reloaded by the other workers once they see the shared
+``slots`` cache version move (checked at most every
+``VERSION_CHECK_INTERVAL_SECONDS``).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Mapping, Optional
+
+from app.models.admin.slot import Slot
+from app.services.catalog.versions import bump_version, get_version
+
+CACHE_KEY = "slots"
+# Upper bound on how stale another worker's slot edits can be here
+VERSION_CHECK_INTERVAL_SECONDS = 2.0
+
+
+class SlotConstraint:
+    """Compiled selection limits of one slot."""
+
+    __slots__ = ("id", "code", "name", "min_select", "max_select")
+
+    def __init__(self, slot: Slot):
+        self.id = str(slot.id)
+        self.code = slot.code
+        self.name = slot.name
+        self.min_select = int(slot.min_select)
+        self.max_select = int(slot.max_select)
+
+
+class SlotCatalog:
+    """Immutable snapshot of every slot's constraints at one cache version."""
+
+    def __init__(self, version: int, slots: List[Slot]):
+        self.version = version
+        self.by_id: Dict[str, SlotConstraint] = {str(s.id): SlotConstraint(s) for s in slots}
+        # slots every team must fill, whether or not the selection touches them
+        self.required: List[SlotConstraint] = [c for c in self.by_id.values() if c.min_select > 0]
+
+    def violations(self, slot_counts: Mapping[str, int]) -> List[dict]:
+        """Return the per-slot constraint violations of a selection (``slot_id -> players``)."""
+        checked: Dict[str, SlotConstraint] = {c.id: c for c in self.required}
+        for sid in slot_counts:
+            constraint = self.by_id.get(sid)
+            if constraint is not None:
+                checked.setdefault(sid, constraint)
+        violations = []
+        for sid, c in checked.items():
+            count = slot_counts.get(sid, 0)
+            if count < c.min_select or count > c.max_select:
+                violations.append(
+                    {
+                        "slot": {"id": sid, "code": c.code, "name": c.name},
+                        "expected": {"min_select": c.min_select, "max_select": c.max_select},
+                        "actual": count,
+                    }
+                )
+        return violations
+
+
+_catalog: Optional[SlotCatalog] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def load_slot_catalog() -> SlotCatalog:
+    """(Re)load the catalog from the database."""
+    global _catalog, _checked_at
+    async with _lock:
+        version = await get_version(CACHE_KEY)
+        slots = await Slot.find_all().to_list()
+        _catalog = SlotCatalog(version, slots)
+        _checked_at = time.monotonic()
+        return _catalog
+
+
+async def get_slot_catalog() -> SlotCatalog:
+    """Return the catalog, reloading it when another worker changed slots."""
+    global _checked_at
+    catalog = _catalog
+    if catalog is None:
+        return await load_slot_catalog()
+    if time.monotonic() - _checked_at >= VERSION_CHECK_INTERVAL_SECONDS:
+        _checked_at = time.monotonic()
+        if await get_version(CACHE_KEY) != catalog.version:
+            return await load_slot_catalog()
+    return catalog
+
+
+async def invalidate_slot_catalog() -> None:
+    """Call after any slot write: bumps the shared version and drops this worker's copy."""
+    global _catalog, _checked_at
+    await bump_version(CACHE_KEY)
+    _catalog = None
+    _checked_at = 0.0
@@ -0,0 +1,25 @@
+"""Shared cache version counters (one ``cache_versions`` document per cache key)."""
+from __future__ import annotations
+
+from pymongo import ReturnDocument
+
+from app.models.cache_version import CacheVersion
+from app.utils.timezone import now_ist
+
+
+async def get_version(key: str) -> int:
+    """Return the current version of ``key`` (0 when it was never bumped)."""
+    doc = await CacheVersion.get_motor_collection().find_one({"key": key}, projection={"version": 1})
+    return int(doc.get("version") or 0) if doc else 0
+
+
+async def bump_version(key: str) -> int:
+    """Increment the version of ``key`` and return the new value."""
+    doc = await CacheVersion.get_motor_collection().find_one_and_update(
+        {"key": key},
+        {"$inc": {"version": 1}, "$set": {"updated_at": now_ist()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        projection={"version": 1},
+    )
+    return int(doc.get("version") or 0)
@@ -0,0 +1,149 @@
+"""Contest lifecycle scheduler.
+
+``Contest.status`` follows the contest's time window: ``live`` before
+``start_at``, ``ongoing`` until ``end_at``, then ``completed``. ``archived``
+is set by admins and never changed here. The scheduler sleeps until the next
+``start_at`` / ``end_at`` boundary and then persists every due transition,
+so status filters and the ``(status, start_at)`` index read current data.
+
+Every worker runs the scheduler. Each contest is flipped with its own
+guarded update, so exactly one worker flips it. That worker invalidates the
+contest cache and runs the hooks registered for the new status with the
+contests it moved, once per flip. Built in: ``completed`` runs settlement,
+which writes the final standings to the enrollments. Team edit locks follow
+the time window directly and do not wait for the flip.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.common.enums.contests import ContestStatus
+from app.models.contest import Contest
+from app.services import catalog
+from app.services import scoring
+from app.utils.timezone import now_ist, to_ist
+
+logger = logging.getLogger(__name__)
+
+TransitionHook = Callable[[List[Contest]], Awaitable[None]]
+
+_hooks: Dict[ContestStatus, List[TransitionHook]] = {}
+_wake = asyncio.Event()
+
+
+def compute_status(contest: Contest, now: Optional[datetime] = None) -> ContestStatus:
+    """Return the status the time window of ``contest`` implies at ``now``."""
+    now = now or now_ist()
+    start = to_ist(contest.start_at)
+    end = to_ist(contest.end_at)
+    if end <= now:
+        return ContestStatus.COMPLETED
+    if start <= now < end:
+        return ContestStatus.ONGOING
+    return ContestStatus.LIVE
+
+
+def _due_query(target: ContestStatus, now: datetime) -> dict:
+    """Contests whose window implies ``target`` at ``now`` but whose stored status differs."""
+    windows = {
+        ContestStatus.LIVE: {"start_at": {"$gt": now}},
+        ContestStatus.ONGOING: {"start_at": {"$lte": now}, "end_at": {"$gt": now}},
+        ContestStatus.COMPLETED: {"end_at": {"$lte": now}},
+    }
+    return {
+        **windows[target],
+        "status": {"$nin": [target.value, ContestStatus.ARCHIVED.value]},
+    }
+
+
+def on_transition(status: ContestStatus) -> Callable[[TransitionHook], TransitionHook]:
+    """Register a hook run with the contests that just moved to ``status``."""
+    def register(hook: TransitionHook) -> TransitionHook:
+        _hooks.setdefault(status, []).append(hook)
+        return hook
+    return register
+
+
+async def apply_transitions(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Persist every due status transition and run its hooks; returns ``status -> contests moved``."""
+    now = now or now_ist()
+    moved: Dict[str, int] = {}
+    for target in (ContestStatus.LIVE, ContestStatus.ONGOING, ContestStatus.COMPLETED):
+        query = _due_query(target, now)
+        candidates = await Contest.find(query).to_list()
+        if not candidates:
+            continue
+        # the status guard keeps a concurrent worker's flip (or an archive) intact;
+        # one guarded update per contest tells which flips this worker made
+        coll = Contest.get_motor_collection()
+        contests: List[Contest] = []
+        for contest in candidates:
+            result = await coll.update_one(
+                {"_id": contest.id, "status": query["status"]},
+                {"$set": {"status": target.value, "updated_at": now}},
+            )
+            if result.modified_count:
+                contest.status = target
+                contest.updated_at = now
+                contests.append(contest)
+        if not contests:
+            continue
+        await catalog.invalidate_contests()
+        moved[target.value] = len(contests)
+        for hook in _hooks.get(target, []):
+            try:
+                await hook(contests)
+            except Exception:
+                logger.exception("Contest %s hook %s failed", target.value, getattr(hook, "__name__", hook))
+    return moved
+
+
+async def next_boundary(now: Optional[datetime] = None) -> Optional[datetime]:
+    """Return the earliest ``start_at`` / ``end_at`` after ``now``, or None when no contest has one."""
+    now = now or now_ist()
+    coll = Contest.get_motor_collection()
+    not_archived = {"$ne": ContestStatus.ARCHIVED.value}
+    boundaries = []
+    for field in ("start_at", "end_at"):
+        doc = await coll.find_one(
+            {field: {"$gt": now}, "status": not_archived},
+            projection={field: 1},
+            sort=[(field, 1)],
+        )
+        if doc:
+            boundaries.append(to_ist(doc[field]))
+    return min(boundaries) if boundaries else None
+
+
+def wake() -> None:
+    """Re-plan the scheduler on this worker now (call after contest windows change)."""
+    _wake.set()
+
+
+async def run_lifecycle_scheduler(max_sleep_seconds: float) -> None:
+    """Apply transitions, then sleep until the next boundary (at most ``max_sleep_seconds``), forever."""
+    while True:
+        try:
+            await apply_transitions()
+            boundary = await next_boundary()
+        except Exception:
+            logger.exception("Contest lifecycle run failed")
+            boundary = None
+        delay = max_sleep_seconds
+        if boundary is not None:
+            delay = min(delay, max(0.0, (boundary - now_ist()).total_seconds()))
+        _wake.clear()
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+@on_transition(ContestStatus.COMPLETED)
+async def settle_contests(contests: List[Contest]) -> None:
+    """Write the final standings of contests that just ended."""
+    for contest in contests:
+        await scoring.sync_standings(contest)
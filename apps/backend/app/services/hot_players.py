@@ -3,15 +3,40 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional
 from beanie import PydanticObjectId
 
+from app.models.player import Player
 from app.models.team import Team
 from app.models.team_contest_enrollment import TeamContestEnrollment
 from app.common.enums.enrollments import EnrollmentStatus
+from app.utils.lineup import player_id_match
+
+
+def _player_counts_stages(field: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+    """Group unwound ``field`` player ids, keep existing players (joined on ``_id``) and page by count."""
+    return [
+        # legacy string ids are normalized so both forms count as one player
+        {"$group": {
+            "_id": {"$convert": {"input": f"${field}", "to": "objectId", "onError": None, "onNull": None}},
+            "selection_count": {"$sum": 1},
+        }},
+        {"$match": {"_id": {"$ne": None}}},
+        {"$sort": {"selection_count": -1, "_id": 1}},
+        {"$lookup": {
+            "from": Player.get_motor_collection().name,
+            "localField": "_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"_id": 1}}],
+            "as": "player",
+        }},
+        {"$match": {"player": {"$ne": []}}},
+        {"$project": {"player": 0}},
+        {"$skip": max(0, int(skip))},
+        {"$limit": max(0, int(limit))},
+    ]
 
 
 async def count_global(player_id: str) -> int:
     """Count how many unique Team documents include the given player globally."""
-    # player_ids is a list of string ObjectIds in Team
-    return await Team.find({"player_ids": str(player_id)}).count()
+    return await Team.find({"player_ids": {"$in": player_id_match([player_id])}}).count()
 
 
 async def count_in_contest(player_id: str, contest_id: str) -> int:
@@ -35,23 +60,20 @@ async def count_in_contest(player_id: str, contest_id: str) -> int:
     team_ids = list({enr.team_id for enr in enrollments if enr.team_id})
     return await Team.find({
         "_id": {"$in": team_ids},
-        "player_ids": str(player_id),
+        "player_ids": {"$in": player_id_match([player_id])},
     }).count()
 
 
 async def aggregate_hot_global(skip: int = 0, limit: int = 200) -> List[Dict[str, Any]]:
     """Aggregate global hotness counts for all players.
 
-    Returns list of documents: {"_id": player_id_str, "selection_count": int}
-    sorted by selection_count desc.
+    Returns list of documents: {"_id": player_oid, "selection_count": int}
+    sorted by selection_count desc; deleted players are left out.
     """
     coll = Team.get_motor_collection()
     pipeline = [
         {"$unwind": "$player_ids"},
-        {"$group": {"_id": "$player_ids", "selection_count": {"$sum": 1}}},
-        {"$sort": {"selection_count": -1}},
-        {"$skip": max(0, int(skip))},
-        {"$limit": max(0, int(limit))},
+        *_player_counts_stages("player_ids", skip, limit),
     ]
     return await coll.aggregate(pipeline).to_list(length=limit)
 
@@ -59,8 +81,8 @@ async def aggregate_hot_global(skip: int = 0, limit: int = 200) -> List[Dict[str
 async def aggregate_hot_in_contest(contest_id: str, skip: int = 0, limit: int = 200) -> List[Dict[str, Any]]:
     """Aggregate contest-specific hotness counts for all players in a contest.
 
-    Returns list of documents: {"_id": player_id_str, "selection_count": int}
-    sorted by selection_count desc.
+    Returns list of documents: {"_id": player_oid, "selection_count": int}
+    sorted by selection_count desc; deleted players are left out.
     """
     try:
         contest_oid = PydanticObjectId(contest_id)
@@ -81,9 +103,6 @@ async def aggregate_hot_in_contest(contest_id: str, skip: int = 0, limit: int =
         },
         {"$unwind": "$team"},
         {"$unwind": "$team.player_ids"},
-        {"$group": {"_id": "$team.player_ids", "selection_count": {"$sum": 1}}},
-        {"$sort": {"selection_count": -1}},
-        {"$skip": max(0, int(skip))},
-        {"$limit": max(0, int(limit))},
+        *_player_counts_stages("team.player_ids", skip, limit),
     ]
     return await enr_coll.aggregate(pipeline).to_list(length=limit)
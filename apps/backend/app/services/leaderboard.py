@@ -0,0 +1,194 @@
+"""Global leaderboard read model.
+
+``Team.total_points`` is the materialized global score of a team (the plain sum
+of its players' ``Player.points``). It is maintained by the write paths that
+change player points, so the leaderboard GET only has to walk the
+``(total_points desc, _id asc)`` index one page at a time.
+
+When the previous points of the changed players are known, writers apply the
+difference with :func:`apply_player_points_deltas` (an ``$inc`` per player
+resolved server-side through the multikey ``player_ids`` index) instead of
+re-summing every impacted team; :func:`refresh_team_totals` remains the
+recompute path.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
+
+from app.models.player import Player
+from app.models.team import Team
+from app.utils.lineup import player_id_match, player_oid
+from app.utils.timezone import now_ist
+
+logger = logging.getLogger(__name__)
+
+# Number of teams loaded and written per round trip while refreshing totals
+TEAM_TOTALS_BATCH_SIZE = 1000
+# Number of per-player $inc operations sent per bulk write
+POINTS_DELTA_BATCH_SIZE = 500
+
+
+async def refresh_team_totals(player_ids: Iterable[str]) -> int:
+    """Recompute ``total_points`` for every team that contains any of ``player_ids``.
+
+    Returns the number of teams whose stored total changed.
+    """
+    ids = player_id_match(player_ids)
+    if not ids:
+        return 0
+    _, changed = await _sync_team_totals({"player_ids": {"$in": ids}}, include_value=False)
+    return changed
+
+
+async def apply_player_points_deltas(deltas: Dict[str, float]) -> int:
+    """Shift ``total_points`` of every team containing a player by that player's points delta.
+
+    ``deltas`` maps player id -> ``new_points - old_points``. Global totals are
+    the plain sum of player points, so the multiplier is 1. Each player becomes
+    one ``UpdateMany`` with ``$inc`` matched through the multikey ``player_ids``
+    index, and the operations go out as unordered bulk writes. Returns the
+    number of team documents modified.
+    """
+    now = now_ist()
+    ops = [
+        UpdateMany(
+            {"player_ids": {"$in": player_id_match([pid])}},
+            {"$inc": {"total_points": float(delta)}, "$set": {"updated_at": now}},
+        )
+        for pid, delta in deltas.items()
+        if pid and delta and ObjectId.is_valid(str(pid))
+    ]
+    modified = 0
+    for start in range(0, len(ops), POINTS_DELTA_BATCH_SIZE):
+        result = await Team.get_motor_collection().bulk_write(
+            ops[start: start + POINTS_DELTA_BATCH_SIZE], ordered=False
+        )
+        modified += result.modified_count
+    return modified
+
+
+async def reconcile_team_totals(batch_size: int = TEAM_TOTALS_BATCH_SIZE) -> Dict[str, float]:
+    """Recompute ``total_points`` and ``total_value`` of every team from current player data.
+
+    This is the only place besides the player points write paths that repairs
+    drifted totals; the leaderboard read path never writes. Returns a report
+    with the number of teams scanned and changed and the elapsed time.
+    """
+    started = time.perf_counter()
+    scanned, changed = await _sync_team_totals({}, include_value=True, batch_size=batch_size)
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Reconciled team totals: scanned=%s changed=%s duration_ms=%s", scanned, changed, duration_ms)
+    return {"scanned": scanned, "changed": changed, "duration_ms": duration_ms}
+
+
+async def run_reconcile_loop(interval_seconds: float) -> None:
+    """Run :func:`reconcile_team_totals` forever, sleeping ``interval_seconds`` between runs."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await reconcile_team_totals()
+        except Exception:
+            logger.exception("Team totals reconciliation failed")
+
+
+async def _sync_team_totals(
+    query: dict,
+    include_value: bool,
+    batch_size: int = TEAM_TOTALS_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """Stream teams matching ``query`` in batches and persist drifted totals.
+
+    Returns ``(scanned, changed)``.
+    """
+    projection = {"player_ids": 1, "total_points": 1}
+    if include_value:
+        projection["total_value"] = 1
+    cursor = Team.get_motor_collection().find(query, projection=projection)
+
+    scanned = 0
+    changed = 0
+    batch: List[dict] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            scanned += len(batch)
+            changed += await _write_team_totals(batch, include_value)
+            batch = []
+    if batch:
+        scanned += len(batch)
+        changed += await _write_team_totals(batch, include_value)
+    return scanned, changed
+
+
+async def _write_team_totals(team_docs: List[dict], include_value: bool) -> int:
+    """Sum player points (and prices) for a batch of raw team documents and persist drifted totals."""
+    # ObjectId elements are used as-is; only legacy string elements are converted
+    lineups = [
+        [player_oid(pid) for pid in doc.get("player_ids", []) if ObjectId.is_valid(pid)]
+        for doc in team_docs
+    ]
+    player_oids = {pid for pids in lineups for pid in pids}
+    points_by_id: Dict[ObjectId, float] = {}
+    price_by_id: Dict[ObjectId, float] = {}
+    if player_oids:
+        players = Player.get_motor_collection().find(
+            {"_id": {"$in": list(player_oids)}},
+            projection={"points": 1, "price": 1},
+        )
+        async for p in players:
+            points_by_id[p["_id"]] = float(p.get("points") or 0.0)
+            price_by_id[p["_id"]] = float(p.get("price") or 0.0)
+
+    now = now_ist()
+    ops: List[UpdateOne] = []
+    for doc, pids in zip(team_docs, lineups):
+        updates = {}
+        total = float(sum(points_by_id.get(pid, 0.0) for pid in pids))
+        if float(doc.get("total_points") or 0.0) != total:
+            updates["total_points"] = total
+        if include_value:
+            value = float(sum(price_by_id.get(pid, 0.0) for pid in pids))
+            if float(doc.get("total_value") or 0.0) != value:
+                updates["total_value"] = value
+        if updates:
+            updates["updated_at"] = now
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+
+    if not ops:
+        return 0
+    await Team.get_motor_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def get_leaderboard_page(skip: int = 0, limit: int = 100) -> List[Team]:
+    """Return one page of teams ordered by the materialized total."""
+    return await Team.find_all().sort(
+        [("total_points", -1), ("_id", 1)]
+    ).skip(skip).limit(limit).to_list()
+
+
+async def get_user_best_team(user_id: PydanticObjectId) -> Optional[Team]:
+    """Return the highest scoring team owned by ``user_id``."""
+    teams = await Team.find(Team.user_id == user_id).sort(
+        [("total_points", -1), ("_id", 1)]
+    ).limit(1).to_list()
+    return teams[0] if teams else None
+
+
+async def get_team_rank(team: Team) -> int:
+    """Return the 1-based position of ``team`` using the same ordering as the pages."""
+    points = float(team.total_points or 0.0)
+    ahead = await Team.find({
+        "$or": [
+            {"total_points": {"$gt": points}},
+            {"total_points": points, "_id": {"$lt": team.id}},
+        ]
+    }).count()
+    return ahead + 1
@@ -0,0 +1,53 @@
+"""Identical-lineup lookups built on ``Team.lineup_hash``."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services import scoring
+from app.utils.lineup import lineup_hash
+
+
+def team_lineup_hash(team: Team) -> str:
+    """Return the stored fingerprint of ``team``, computing it for teams saved before fingerprints existed."""
+    return team.lineup_hash or lineup_hash(team.player_ids, team.captain_id, team.vice_captain_id)
+
+
+async def count_lineup_twins(team: Team, contest_id: Optional[ObjectId] = None) -> Dict[str, int]:
+    """Count the other teams (and their distinct users, owner excluded) with ``team``'s exact lineup.
+
+    With ``contest_id`` only teams actively enrolled in that contest count.
+    """
+    docs = await Team.get_motor_collection().find(
+        {"lineup_hash": team_lineup_hash(team), "_id": {"$ne": team.id}},
+        projection={"user_id": 1},
+    ).to_list(length=None)
+    if contest_id is not None and docs:
+        enrolled = set(await TeamContestEnrollment.get_motor_collection().distinct(
+            "team_id",
+            {"contest_id": contest_id, "status": EnrollmentStatus.ACTIVE, "team_id": {"$in": [d["_id"] for d in docs]}},
+        ))
+        docs = [d for d in docs if d["_id"] in enrolled]
+    other_users = {d["user_id"] for d in docs if d.get("user_id") != team.user_id}
+    return {"other_teams": len(docs), "other_users": len(other_users)}
+
+
+async def contest_duplicate_lineups(contest: Contest) -> List[dict]:
+    """Return ``{lineup_hash, team_ids, user_ids}`` for every lineup entered more than once in ``contest``.
+
+    Read from the contest's cached lineup matrix, which already groups teams by lineup.
+    """
+    matrix = await scoring.get_lineup_matrix(contest)
+    return [
+        {
+            "lineup_hash": matrix.lineup_keys[matrix.lineup_of_team[rows[0]]],
+            "team_ids": [matrix.team_ids[r] for r in rows],
+            "user_ids": [matrix.user_ids[r] for r in rows],
+        }
+        for rows in matrix.duplicate_groups()
+    ]
@@ -0,0 +1,164 @@
+"""Request-scoped batched entity loaders.
+
+A loader collects every ``load`` call made in the same event-loop tick and
+resolves them with one ``$in`` query per collection, memoizing results for the
+rest of the request. Routes obtain a fresh :class:`Loaders` bundle through the
+``get_loaders`` dependency, so nothing is shared between requests.
+
+    loaders = Depends(get_loaders)
+    users = await loaders.users.load_many([t.user_id for t in teams])
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from beanie import Document
+from bson import ObjectId
+
+from app.models.admin.player import Player as AdminPlayer
+from app.models.admin.slot import Slot
+from app.models.contest import Contest
+from app.models.player import Player
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.user import User
+
+T = TypeVar("T")
+DocT = TypeVar("DocT", bound=Document)
+
+
+def to_object_id(value: Any) -> Optional[ObjectId]:
+    """Coerce a string/ObjectId key to ObjectId, returning None when invalid."""
+    if isinstance(value, ObjectId):
+        return value
+    if value is not None and ObjectId.is_valid(str(value)):
+        return ObjectId(str(value))
+    return None
+
+
+class BatchLoader(Generic[T]):
+    """Coalesce keys requested in the same tick into a single batch call.
+
+    ``batch_fn`` receives the normalized keys that are not yet memoized and
+    returns a mapping of key -> value; missing keys resolve to ``default``.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Any],
+        normalize: Callable[[Any], Any] = str,
+        default: Any = None,
+    ):
+        self._batch_fn = batch_fn
+        self._normalize = normalize
+        self._default = default
+        self._cache: Dict[Any, asyncio.Future] = {}
+        self._pending: List[Any] = []
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    def _key(self, key: Any) -> Any:
+        return self._normalize(key) if key is not None else None
+
+    def load(self, key: Any) -> "asyncio.Future[T]":
+        """Return an awaitable resolving to the value for ``key``."""
+        loop = asyncio.get_running_loop()
+        k = self._key(key)
+        fut = self._cache.get(k)
+        if fut is not None:
+            return fut
+        fut = loop.create_future()
+        self._cache[k] = fut
+        if k is None:
+            fut.set_result(self._default)
+            return fut
+        self._pending.append(k)
+        if self._dispatch_task is None:
+            # Runs after every coroutine already scheduled for this tick had a chance to enqueue keys
+            self._dispatch_task = loop.create_task(self._dispatch())
+        return fut
+
+    async def load_many(self, keys: Iterable[Any]) -> List[T]:
+        """Load several keys at once, preserving the input order."""
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: Any, value: T) -> None:
+        """Seed the memo with an already loaded value."""
+        k = self._key(key)
+        if k is None or (k in self._cache and self._cache[k].done()):
+            return
+        fut = self._cache.get(k)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._cache[k] = fut
+        fut.set_result(value)
+
+    async def _dispatch(self) -> None:
+        keys, self._pending, self._dispatch_task = self._pending, [], None
+        keys = [k for k in dict.fromkeys(keys) if not self._cache[k].done()]
+        if not keys:
+            return
+        try:
+            found = await self._batch_fn(keys)
+        except Exception as exc:
+            for k in keys:
+                fut = self._cache.pop(k)
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for k in keys:
+            fut = self._cache[k]
+            if not fut.done():
+                fut.set_result(found.get(k, self._default))
+
+
+def document_loader(model: Type[DocT]) -> BatchLoader[Optional[DocT]]:
+    """Loader resolving documents by ``_id`` (string or ObjectId keys)."""
+
+    async def batch(keys: List[str]) -> Dict[str, DocT]:
+        oids = [oid for oid in (to_object_id(k) for k in keys) if oid is not None]
+        if not oids:
+            return {}
+        docs = await model.find({"_id": {"$in": oids}}).to_list()
+        return {str(d.id): d for d in docs}
+
+    return BatchLoader(batch)
+
+
+def count_loader(model: Type[Document], field: str, as_object_id: bool = False) -> BatchLoader[int]:
+    """Loader resolving ``count(model where field == key)`` for many keys at once."""
+
+    async def batch(keys: List[str]) -> Dict[str, int]:
+        values: List[Any] = keys
+        if as_object_id:
+            values = [oid for oid in (to_object_id(k) for k in keys) if oid is not None]
+        if not values:
+            return {}
+        pipeline = [
+            {"$match": {field: {"$in": values}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        ]
+        rows = await model.get_motor_collection().aggregate(pipeline).to_list(length=None)
+        return {str(r["_id"]): int(r["count"]) for r in rows}
+
+    return BatchLoader(batch, default=0)
+
+
+class Loaders:
+    """Per-request bundle of loaders for the commonly joined collections."""
+
+    def __init__(self):
+        self.users = document_loader(User)
+        self.teams = document_loader(Team)
+        self.players = document_loader(Player)
+        self.admin_players = document_loader(AdminPlayer)
+        self.contests = document_loader(Contest)
+        self.slots = document_loader(Slot)
+        self.enrollments = document_loader(TeamContestEnrollment)
+        self.team_counts_by_user = count_loader(Team, "user_id", as_object_id=True)
+        self.player_counts_by_slot = count_loader(Player, "slot")
+
+
+def get_loaders() -> Loaders:
+    """FastAPI dependency returning a fresh loader bundle for the current request."""
+    return Loaders()
@@ -6,6 +6,8 @@ from fastapi import UploadFile
 
 from app.models.admin.player import Player
 from app.models.admin.import_log import ImportLog
+from app.services import catalog
+from app.services import leaderboard as leaderboard_svc
 from app.utils.import_players.import_parsers import parse_xlsx, parse_csv, detect_format
 from app.utils.import_players.import_validators import (
     validate_player_row,
@@ -187,6 +189,7 @@ class PlayerImportService:
         created_count = 0
         updated_count = 0
         skipped_count = 0
+        points_deltas: Dict[str, float] = {}
 
         # Process in chunks
         for i in range(0, len(valid_data), CHUNK_SIZE):
@@ -196,6 +199,7 @@ class PlayerImportService:
                 if validated_data.get("_is_update"):
                     # Update existing player
                     existing = validated_data["_existing_player"]
+                    previous_points = float(existing.points or 0.0)
                     existing.team = validated_data["team"]
                     existing.status = validated_data["status"]
                     existing.price = validated_data["price"]
@@ -206,6 +210,7 @@ class PlayerImportService:
                     existing.updated_at = datetime.utcnow()
                     await existing.save()
                     updated_count += 1
+                    points_deltas[str(existing.id)] = float(existing.points or 0.0) - previous_points
                 else:
                     # Create new player
                     new_player = Player(
@@ -223,6 +228,11 @@ class PlayerImportService:
                     await new_player.insert()
                     created_count += 1
 
+        if created_count or updated_count:
+            await catalog.invalidate_player_catalog()
+        # Updated players may carry new points; new players are not in any team yet
+        await leaderboard_svc.apply_player_points_deltas(points_deltas)
+
         return created_count, updated_count, skipped_count
 
     @staticmethod
@@ -0,0 +1,286 @@
+"""Periodic rank snapshots.
+
+A snapshot stores one leaderboard's ranking as two compact arrays (team ids in
+rank order and their points). Taking a snapshot also diffs the new ranks
+against the previous snapshot in a single pass and persists the result with
+unordered bulk writes: ``Team.rank`` / ``rank_change`` for the global
+leaderboard and ``TeamContestEnrollment.rank_change`` for contest leaderboards
+(whose live ``rank`` is maintained by the scoring path, see
+``scoring/standings.py``). Read paths then only return stored values.
+
+A snapshot is only taken when the ranking can have moved (a changed global
+ranking, or a new contest leaderboard version), so ``rank_change`` reflects
+the last actual movement rather than decaying to zero between runs. Contest
+``rank_change`` writes bump the contest's display version, so leaderboard
+ETags move with them.
+
+Snapshots are stored in chunks of ``SNAPSHOT_CHUNK_SIZE`` teams so that
+large leaderboards stay under MongoDB's 16 MB document limit. Only the
+latest ``RANK_SNAPSHOT_KEEP`` snapshots of each leaderboard are kept.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.common.enums.contests import ContestStatus
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.rank_snapshot import RankSnapshot
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services import scoring
+from app.utils.timezone import now_ist
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of rank updates sent per bulk write
+RANK_WRITE_BATCH_SIZE = 1000
+# Teams stored per snapshot document (about 3 MB of BSON)
+SNAPSHOT_CHUNK_SIZE = 100_000
+# Matches the first chunk of a snapshot (snapshots stored as one document have no offset)
+_HEAD_CHUNK = {"offset": {"$in": [0, None]}}
+
+
+def _rank_change(previous: Optional[int], rank: int) -> Optional[int]:
+    return previous - rank if previous is not None else None
+
+
+async def _bulk_write(collection, ops: List[UpdateOne]) -> None:
+    for start in range(0, len(ops), RANK_WRITE_BATCH_SIZE):
+        await collection.bulk_write(ops[start: start + RANK_WRITE_BATCH_SIZE], ordered=False)
+
+
+async def _insert_snapshot(
+    contest_id: Optional[ObjectId],
+    version: Optional[str],
+    team_ids: List[ObjectId],
+    points: List[float],
+) -> RankSnapshot:
+    """Store one ranking as chunks of ``SNAPSHOT_CHUNK_SIZE`` teams; returns the first chunk."""
+    snapshot_id = ObjectId()
+    taken_at = now_ist()
+    chunks = [
+        RankSnapshot(
+            contest_id=contest_id,
+            version=version,
+            snapshot_id=snapshot_id,
+            offset=start,
+            team_ids=team_ids[start: start + SNAPSHOT_CHUNK_SIZE],
+            points=points[start: start + SNAPSHOT_CHUNK_SIZE],
+            taken_at=taken_at,
+        )
+        for start in range(0, max(len(team_ids), 1), SNAPSHOT_CHUNK_SIZE)
+    ]
+    await RankSnapshot.insert_many(chunks)
+    await _prune_snapshots(contest_id)
+    return chunks[0]
+
+
+async def _prune_snapshots(contest_id: Optional[ObjectId]) -> None:
+    """Delete the snapshots of one leaderboard beyond the latest ``RANK_SNAPSHOT_KEEP``."""
+    keep = settings.rank_snapshot_keep
+    if keep <= 0:
+        return
+    coll = RankSnapshot.get_motor_collection()
+    newest_dropped = await coll.find_one(
+        {"contest_id": contest_id, **_HEAD_CHUNK},
+        projection={"taken_at": 1},
+        sort=[("taken_at", -1)],
+        skip=keep,
+    )
+    if newest_dropped:
+        # the chunks of a snapshot share taken_at, so they go together
+        await coll.delete_many({"contest_id": contest_id, "taken_at": {"$lte": newest_dropped["taken_at"]}})
+
+
+async def _snapshot_ranks(head: dict) -> Dict[str, int]:
+    """Return ``team_id -> rank`` of the snapshot whose first chunk is ``head``."""
+    chunks = [head]
+    if head.get("snapshot_id") is not None:
+        chunks += await RankSnapshot.get_motor_collection().find(
+            {"snapshot_id": head["snapshot_id"], "offset": {"$gt": 0}},
+            projection={"offset": 1, "team_ids": 1},
+        ).to_list(length=None)
+    ranks: Dict[str, int] = {}
+    for chunk in chunks:
+        offset = int(chunk.get("offset") or 0)
+        for i, tid in enumerate(chunk.get("team_ids", [])):
+            ranks[str(tid)] = offset + i + 1
+    return ranks
+
+
+async def take_global_snapshot() -> Optional[RankSnapshot]:
+    """Snapshot the global leaderboard and update ``Team.rank`` / ``Team.rank_change``.
+
+    Returns None (and writes nothing) when no team changed position.
+    """
+    cursor = Team.get_motor_collection().find(
+        {}, projection={"total_points": 1, "rank": 1}
+    ).sort([("total_points", -1), ("_id", 1)])
+
+    team_ids: List[ObjectId] = []
+    points: List[float] = []
+    ops: List[UpdateOne] = []
+    async for doc in cursor:
+        rank = len(team_ids) + 1
+        team_ids.append(doc["_id"])
+        points.append(float(doc.get("total_points") or 0.0))
+        previous = doc.get("rank")
+        if previous != rank:
+            ops.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"rank": rank, "rank_change": _rank_change(previous, rank)}},
+            ))
+
+    if not ops:
+        return None
+    await _bulk_write(Team.get_motor_collection(), ops)
+    return await _insert_snapshot(None, None, team_ids, points)
+
+
+async def take_contest_snapshot(contest: Contest) -> Optional[RankSnapshot]:
+    """Snapshot one contest leaderboard and update its enrollments' ``rank_change``.
+
+    Returns None when the latest snapshot already covers the current
+    leaderboard version.
+    """
+    version = scoring.leaderboard_version(contest)
+    latest = await RankSnapshot.get_motor_collection().find_one(
+        {"contest_id": contest.id, **_HEAD_CHUNK},
+        projection={"version": 1, "snapshot_id": 1, "offset": 1, "team_ids": 1},
+        sort=[("taken_at", -1)],
+    )
+    if latest and latest.get("version") == version:
+        return None
+    previous_ranks = await _snapshot_ranks(latest) if latest else {}
+
+    index = await scoring.get_rank_index(contest)
+    rows = index.page(0, len(index))
+    rank_by_team: Dict[str, int] = {tid: rank for rank, tid, _, _ in rows}
+
+    enrollments = TeamContestEnrollment.get_motor_collection().find(
+        {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE.value},
+        projection={"team_id": 1, "rank_change": 1},
+    )
+    ops: List[UpdateOne] = []
+    async for enr in enrollments:
+        team_id = str(enr["team_id"])
+        rank = rank_by_team.get(team_id)
+        if rank is None:
+            continue
+        change = _rank_change(previous_ranks.get(team_id), rank)
+        if enr.get("rank_change") != change:
+            ops.append(UpdateOne({"_id": enr["_id"]}, {"$set": {"rank_change": change}}))
+    await _bulk_write(TeamContestEnrollment.get_motor_collection(), ops)
+    if ops:
+        # leaderboards return rank_change; move their ETag without rescoring
+        await scoring.bump_display_version([contest.id])
+
+    return await _insert_snapshot(
+        contest.id,
+        version,
+        [ObjectId(tid) for _, tid, _, _ in rows],
+        [pts for _, _, _, pts in rows],
+    )
+
+
+async def take_rank_snapshots() -> Dict[str, float]:
+    """Snapshot the global leaderboard and every live or ongoing contest."""
+    started = time.perf_counter()
+    taken = 0
+    if await take_global_snapshot():
+        taken += 1
+    contests = await Contest.find(
+        {"status": {"$in": [ContestStatus.LIVE.value, ContestStatus.ONGOING.value]}}
+    ).to_list()
+    for contest in contests:
+        if await take_contest_snapshot(contest):
+            taken += 1
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Rank snapshots: contests=%s taken=%s duration_ms=%s", len(contests), taken, duration_ms)
+    return {"contests": len(contests), "taken": taken, "duration_ms": duration_ms}
+
+
+async def run_snapshot_loop(interval_seconds: float) -> None:
+    """Run :func:`take_rank_snapshots` forever, sleeping ``interval_seconds`` between runs."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await take_rank_snapshots()
+        except Exception:
+            logger.exception("Rank snapshot run failed")
+
+
+async def get_contest_rank_changes(contest_id: ObjectId, team_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Return ``team_id -> rank_change`` stored on the enrollments of ``contest_id``."""
+    oids = [ObjectId(tid) for tid in set(team_ids) if ObjectId.is_valid(tid)]
+    if not oids:
+        return {}
+    docs = await TeamContestEnrollment.get_motor_collection().find(
+        {"contest_id": contest_id, "team_id": {"$in": oids}, "status": EnrollmentStatus.ACTIVE.value},
+        projection={"team_id": 1, "rank_change": 1},
+    ).to_list(length=None)
+    return {str(d["team_id"]): d.get("rank_change") for d in docs}
+
+
+async def get_team_rank_history(
+    team_id: ObjectId,
+    contest_id: Optional[ObjectId] = None,
+    at: Optional[datetime] = None,
+    limit: int = 50,
+) -> List[dict]:
+    """Return ``{taken_at, rank, points}`` of ``team_id`` at the latest ``limit`` snapshots.
+
+    With ``at``, only snapshots taken at or before that time are considered, so
+    ``limit=1`` answers "what was the rank at time T". The lookup runs in
+    MongoDB; only the team's position leaves the server.
+    """
+    coll = RankSnapshot.get_motor_collection()
+    match: dict = {"contest_id": contest_id, **_HEAD_CHUNK}
+    if at is not None:
+        match["taken_at"] = {"$lte": at}
+    heads = await coll.find(match, projection={"taken_at": 1, "snapshot_id": 1}).sort(
+        [("taken_at", -1)]
+    ).limit(limit).to_list(length=None)
+    if not heads:
+        return []
+
+    # each snapshot is keyed by its snapshot_id, or by _id when stored as one document
+    keys = [h.get("snapshot_id") or h["_id"] for h in heads]
+    chunked = [h["snapshot_id"] for h in heads if h.get("snapshot_id") is not None]
+    single = [h["_id"] for h in heads if h.get("snapshot_id") is None]
+    pipeline = [
+        {"$match": {
+            "$or": [{"snapshot_id": {"$in": chunked}}, {"_id": {"$in": single}}],
+            "team_ids": team_id,
+        }},
+        {"$project": {
+            "_id": 0,
+            "key": {"$ifNull": ["$snapshot_id", "$_id"]},
+            "offset": {"$ifNull": ["$offset", 0]},
+            "points": 1,
+            "idx": {"$indexOfArray": ["$team_ids", team_id]},
+        }},
+        {"$project": {
+            "key": 1,
+            "rank": {"$add": ["$offset", "$idx", 1]},
+            "points": {"$arrayElemAt": ["$points", "$idx"]},
+        }},
+    ]
+    found = {d["key"]: d for d in await coll.aggregate(pipeline).to_list(length=None)}
+    return [
+        {
+            "taken_at": head["taken_at"],
+            "rank": found[key]["rank"] if key in found else None,
+            "points": found[key].get("points") if key in found else None,
+        }
+        for head, key in zip(heads, keys)
+    ]
@@ -0,0 +1,54 @@
+"""Contest scoring package"""
+from app.services.scoring.coalescer import PointsCoalescer, points_coalescer
+from app.services.scoring.engine import (
+    LineupMatrix,
+    bump_display_version,
+    bump_lineup_version,
+    bump_points_version,
+    bump_team_display_versions,
+    bump_team_lineup_versions,
+    get_lineup_matrix,
+    leaderboard_version,
+    load_contest_points,
+    player_multiplier,
+    score_contest,
+)
+from app.services.scoring.pipeline import ContestLeaderboardPage, aggregate_contest_leaderboard
+from app.services.scoring.points import apply_contest_points, mirror_player_points, upsert_contest_points
+from app.services.scoring.rank_index import ContestRankIndex, RankedRow, get_rank_index
+from app.services.scoring.standings import (
+    count_standings,
+    ensure_standings,
+    standings_page,
+    sync_standings,
+    user_standing,
+)
+
+__all__ = [
+    "ContestLeaderboardPage",
+    "ContestRankIndex",
+    "LineupMatrix",
+    "PointsCoalescer",
+    "RankedRow",
+    "aggregate_contest_leaderboard",
+    "apply_contest_points",
+    "bump_display_version",
+    "bump_lineup_version",
+    "bump_points_version",
+    "bump_team_display_versions",
+    "bump_team_lineup_versions",
+    "count_standings",
+    "ensure_standings",
+    "get_lineup_matrix",
+    "get_rank_index",
+    "leaderboard_version",
+    "load_contest_points",
+    "mirror_player_points",
+    "player_multiplier",
+    "points_coalescer",
+    "score_contest",
+    "standings_page",
+    "sync_standings",
+    "upsert_contest_points",
+    "user_standing",
+]
@@ -0,0 +1,155 @@
+"""Scoring-tick coalescer.
+
+During a live match many small contest points updates arrive per minute. With
+a tick configured (``SCORING_TICK_SECONDS``), updates are buffered per contest,
+merged per player (the latest value wins, as every update carries absolute
+points), and each tick applies one batched write and one leaderboard rescore
+per contest. Callers await the tick that carries their update, so responses
+still reflect persisted data. Without a tick, updates are applied immediately.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.models.contest import Contest
+from app.services.scoring.points import apply_contest_points
+from app.services.scoring.standings import sync_standings
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingContest:
+    def __init__(self, contest: Contest):
+        self.contest = contest
+        self.points: Dict[ObjectId, float] = {}
+        self.updates = 0
+        self.first_at = time.perf_counter()
+        self.waiters: List[asyncio.Future] = []
+
+
+class CoalescerMetrics:
+    """Counters describing recent scoring ticks."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.updates = 0
+        self.players_written = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_tick_latency_ms = 0.0
+        self.max_tick_latency_ms = 0.0
+        self.total_tick_latency_ms = 0.0
+
+    def record(self, updates: int, players: int, latency_ms: float) -> None:
+        self.ticks += 1
+        self.updates += updates
+        self.players_written += players
+        self.last_batch_size = players
+        self.max_batch_size = max(self.max_batch_size, players)
+        self.last_tick_latency_ms = latency_ms
+        self.max_tick_latency_ms = max(self.max_tick_latency_ms, latency_ms)
+        self.total_tick_latency_ms += latency_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "ticks": self.ticks,
+            "updates": self.updates,
+            "players_written": self.players_written,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": round(self.players_written / self.ticks, 1) if self.ticks else 0.0,
+            "last_tick_latency_ms": self.last_tick_latency_ms,
+            "max_tick_latency_ms": self.max_tick_latency_ms,
+            "avg_tick_latency_ms": round(self.total_tick_latency_ms / self.ticks, 1) if self.ticks else 0.0,
+        }
+
+
+class PointsCoalescer:
+    """Buffers contest points updates and flushes them once per tick."""
+
+    def __init__(self):
+        self.tick_seconds = 0.0
+        self.metrics = CoalescerMetrics()
+        self._pending: Dict[str, _PendingContest] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the tick configuration, buffered work and metrics."""
+        return {
+            "tick_seconds": self.tick_seconds,
+            "running": self.running,
+            "pending_contests": len(self._pending),
+            **self.metrics.as_dict(),
+        }
+
+    async def submit(
+        self,
+        contest: Contest,
+        points_by_player: Dict[ObjectId, float],
+    ) -> datetime:
+        """Apply ``points_by_player`` to ``contest``; returns the write timestamp.
+
+        Waits for the next tick when the coalescer runs, otherwise writes now.
+        """
+        if not self.running:
+            return await apply_contest_points(contest, points_by_player)
+        key = str(contest.id)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingContest(contest)
+        pending.contest = contest
+        pending.points.update(points_by_player)
+        pending.updates += 1
+        waiter = asyncio.get_running_loop().create_future()
+        pending.waiters.append(waiter)
+        return await waiter
+
+    def start(self, tick_seconds: float) -> asyncio.Task:
+        """Start ticking every ``tick_seconds`` (called once from the app lifespan)."""
+        self.tick_seconds = tick_seconds
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.tick_seconds)
+                await self.flush()
+        finally:
+            # apply whatever is still buffered on shutdown
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Apply every buffered contest update (one write and one rescore per contest)."""
+        batch, self._pending = self._pending, {}
+        for pending in batch.values():
+            try:
+                written_at = await apply_contest_points(pending.contest, pending.points)
+                # one rescore per tick; also materializes standings onto enrollments
+                contest = await Contest.get(pending.contest.id)
+                if contest:
+                    await sync_standings(contest)
+            except Exception as exc:
+                logger.exception("Scoring tick failed for contest %s", pending.contest.id)
+                for waiter in pending.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                continue
+            latency_ms = round((time.perf_counter() - pending.first_at) * 1000, 1)
+            self.metrics.record(pending.updates, len(pending.points), latency_ms)
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_result(written_at)
+
+
+points_coalescer = PointsCoalescer()
@@ -0,0 +1,267 @@
+"""Vectorized contest scoring.
+
+Each contest's enrolled lineups are kept as a sparse team x player incidence
+matrix (COO triplets ``rows``/``cols``/``weights``) where the weight carries the
+captain/vice-captain multiplier. Rescoring every team after a points update is
+then one sparse matrix-vector product (``np.bincount`` over the triplets)
+instead of a Python loop per team. Teams with an identical lineup (same
+``Team.lineup_hash``) share one matrix row, so each distinct lineup is scored
+once and its total is fanned out to every team that picked it.
+
+Matrices are cached per process and keyed on ``Contest.lineup_version``, which
+every write path that changes enrolled lineups bumps. ``Contest.points_version``
+is bumped by the contest points write path; the pair identifies one leaderboard
+snapshot.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+
+from app.common.consts.index import CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.catalog.contests import forget_contests
+from app.utils.lineup import lineup_hash
+
+
+def player_multiplier(player_id: str, captain_id: Optional[str], vice_captain_id: Optional[str]) -> float:
+    """Return the contest points multiplier of ``player_id`` within a lineup."""
+    if captain_id and player_id == str(captain_id):
+        return CAPTAIN_MULTIPLIER
+    if vice_captain_id and player_id == str(vice_captain_id):
+        return VICE_CAPTAIN_MULTIPLIER
+    return 1.0
+
+
+class LineupMatrix:
+    """Sparse lineup x player matrix of one contest's enrolled teams.
+
+    Rows are distinct lineups; ``lineup_of_team`` maps each team to its row.
+    """
+
+    def __init__(
+        self,
+        contest_id: str,
+        version: int,
+        team_ids: List[str],
+        user_ids: List[str],
+        player_ids: List[str],
+        lineup_of_team: np.ndarray,
+        lineup_keys: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray,
+    ):
+        self.contest_id = contest_id
+        self.version = version
+        self.team_ids = team_ids
+        self.user_ids = user_ids
+        self.player_ids = player_ids
+        self.player_index: Dict[str, int] = {pid: i for i, pid in enumerate(player_ids)}
+        self.lineup_of_team = lineup_of_team
+        self.lineup_keys = lineup_keys
+        self.rows = rows
+        self.cols = cols
+        self.weights = weights
+
+    @property
+    def team_count(self) -> int:
+        return len(self.team_ids)
+
+    @property
+    def lineup_count(self) -> int:
+        return len(self.lineup_keys)
+
+    @classmethod
+    def from_lineups(
+        cls,
+        contest_id: str,
+        version: int,
+        lineups: Iterable[Tuple[str, str, List[str], Optional[str], Optional[str], Optional[str]]],
+    ) -> "LineupMatrix":
+        """Build from ``(team_id, user_id, player_ids, captain_id, vice_captain_id, lineup_hash)`` tuples.
+
+        A missing ``lineup_hash`` (teams saved before fingerprints existed) is computed here.
+        """
+        team_ids: List[str] = []
+        user_ids: List[str] = []
+        lineup_of_team: List[int] = []
+        lineup_index: Dict[str, int] = {}
+        player_index: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        weights: List[float] = []
+        for team_id, user_id, player_ids, captain_id, vice_id, key in lineups:
+            team_ids.append(str(team_id))
+            user_ids.append(str(user_id))
+            key = key or lineup_hash(player_ids, captain_id, vice_id)
+            row = lineup_index.get(key)
+            if row is None:
+                row = lineup_index[key] = len(lineup_index)
+                for pid in player_ids:
+                    pid = str(pid)
+                    col = player_index.setdefault(pid, len(player_index))
+                    rows.append(row)
+                    cols.append(col)
+                    weights.append(player_multiplier(pid, captain_id, vice_id))
+            lineup_of_team.append(row)
+        return cls(
+            contest_id=contest_id,
+            version=version,
+            team_ids=team_ids,
+            user_ids=user_ids,
+            player_ids=list(player_index),
+            lineup_of_team=np.asarray(lineup_of_team, dtype=np.int32),
+            lineup_keys=list(lineup_index),
+            rows=np.asarray(rows, dtype=np.int32),
+            cols=np.asarray(cols, dtype=np.int32),
+            weights=np.asarray(weights, dtype=np.float64),
+        )
+
+    def points_vector(self, points_by_player: Dict[str, float]) -> np.ndarray:
+        """Project a ``player_id -> points`` mapping onto the matrix columns."""
+        vec = np.zeros(len(self.player_ids), dtype=np.float64)
+        for pid, pts in points_by_player.items():
+            col = self.player_index.get(pid)
+            if col is not None:
+                vec[col] = pts
+        return vec
+
+    def score(self, points: np.ndarray) -> np.ndarray:
+        """Return every team's total for the player ``points`` vector (one sparse mat-vec)."""
+        if not self.team_ids:
+            return np.zeros(0, dtype=np.float64)
+        lineup_totals = np.bincount(self.rows, weights=self.weights * points[self.cols], minlength=self.lineup_count)
+        return lineup_totals[self.lineup_of_team]
+
+    def duplicate_groups(self) -> List[List[int]]:
+        """Return the team rows of every lineup picked by more than one team."""
+        if self.lineup_count == self.team_count:
+            return []
+        order = np.argsort(self.lineup_of_team, kind="stable")
+        counts = np.bincount(self.lineup_of_team, minlength=self.lineup_count)
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        return [g.tolist() for g in groups if len(g) > 1]
+
+    def ranking(self, totals: np.ndarray) -> np.ndarray:
+        """Return row indices ordered by total desc, then team id asc."""
+        return np.lexsort((np.asarray(self.team_ids), -totals))
+
+
+_matrices: Dict[str, LineupMatrix] = {}
+_build_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_lineup_matrix(contest: Contest) -> LineupMatrix:
+    """Return the cached lineup matrix of ``contest``, rebuilding it when its lineup version moved."""
+    key = str(contest.id)
+    version = int(contest.lineup_version or 0)
+    cached = _matrices.get(key)
+    if cached is not None and cached.version == version:
+        return cached
+    lock = _build_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _matrices.get(key)
+        if cached is not None and cached.version == version:
+            return cached
+        matrix = await _build_lineup_matrix(contest, version)
+        _matrices[key] = matrix
+        return matrix
+
+
+async def _build_lineup_matrix(contest: Contest, version: int) -> LineupMatrix:
+    enrollments = await TeamContestEnrollment.get_motor_collection().find(
+        {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE},
+        projection={"team_id": 1, "user_id": 1},
+    ).to_list(length=None)
+    user_by_team = {enr["team_id"]: enr["user_id"] for enr in enrollments}
+    teams = []
+    if user_by_team:
+        teams = await Team.get_motor_collection().find(
+            {"_id": {"$in": list(user_by_team)}},
+            projection={"player_ids": 1, "captain_id": 1, "vice_captain_id": 1, "lineup_hash": 1},
+        ).to_list(length=None)
+    return LineupMatrix.from_lineups(
+        str(contest.id),
+        version,
+        (
+            (
+                t["_id"],
+                user_by_team[t["_id"]],
+                t.get("player_ids", []),
+                t.get("captain_id"),
+                t.get("vice_captain_id"),
+                t.get("lineup_hash"),
+            )
+            for t in teams
+        ),
+    )
+
+
+async def load_contest_points(contest: Contest, player_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Return ``player_id -> points`` of ``contest`` (optionally restricted to ``player_ids``)."""
+    query: dict = {"contest_id": contest.id}
+    if player_ids is not None:
+        query["player_id"] = {"$in": [ObjectId(pid) for pid in player_ids if ObjectId.is_valid(str(pid))]}
+    docs = await PlayerContestPoints.get_motor_collection().find(
+        query, projection={"player_id": 1, "points": 1}
+    ).to_list(length=None)
+    return {str(d["player_id"]): float(d.get("points") or 0.0) for d in docs}
+
+
+async def score_contest(contest: Contest) -> Tuple[LineupMatrix, np.ndarray]:
+    """Return the contest's lineup matrix and the current total of every team (row-aligned)."""
+    matrix = await get_lineup_matrix(contest)
+    points = await load_contest_points(contest)
+    return matrix, matrix.score(matrix.points_vector(points))
+
+
+def leaderboard_version(contest: Contest) -> str:
+    """Return the identifier of the current leaderboard snapshot of ``contest``."""
+    return f"{int(contest.lineup_version or 0)}.{int(contest.points_version or 0)}"
+
+
+async def _bump_version(field: str, contest_ids: Iterable[ObjectId]) -> None:
+    ids = list({ObjectId(str(cid)) for cid in contest_ids if cid is not None and ObjectId.is_valid(str(cid))})
+    if not ids:
+        return
+    await Contest.get_motor_collection().update_many({"_id": {"$in": ids}}, {"$inc": {field: 1}})
+    forget_contests(ids)
+
+
+async def bump_lineup_version(contest_ids: Iterable[ObjectId]) -> None:
+    """Mark the enrolled lineups of ``contest_ids`` as changed so cached matrices are rebuilt."""
+    await _bump_version("lineup_version", contest_ids)
+
+
+async def bump_points_version(contest_ids: Iterable[ObjectId]) -> None:
+    """Mark the player points of ``contest_ids`` as changed so cached leaderboards are rescored."""
+    await _bump_version("points_version", contest_ids)
+
+
+async def bump_display_version(contest_ids: Iterable[ObjectId]) -> None:
+    """Mark the leaderboard entries of ``contest_ids`` as changed (names, rank changes) without rescoring."""
+    await _bump_version("display_version", contest_ids)
+
+
+async def _team_contest_ids(team_id: ObjectId) -> List[ObjectId]:
+    return await TeamContestEnrollment.get_motor_collection().distinct(
+        "contest_id", {"team_id": team_id, "status": EnrollmentStatus.ACTIVE}
+    )
+
+
+async def bump_team_lineup_versions(team_id: ObjectId) -> None:
+    """Bump the lineup version of every contest ``team_id`` is actively enrolled in."""
+    await bump_lineup_version(await _team_contest_ids(team_id))
+
+
+async def bump_team_display_versions(team_id: ObjectId) -> None:
+    """Bump the display version of every contest ``team_id`` is actively enrolled in."""
+    await bump_display_version(await _team_contest_ids(team_id))
@@ -0,0 +1,225 @@
+"""Append-only player points ledger.
+
+Scoring events are appended to ``player_points_events`` with the player's
+running total (``cumulative``). The points of a player inside any
+``[start_at, end_at]`` window are then ``cumulative_at(end) -
+cumulative_at(before start)``: two indexed point lookups, independent of how
+many events fall inside the window. Every time-window contest overlapping a
+batch of events is refreshed from these prefix sums (through the scoring-tick
+coalescer), so one stream of match events feeds all of them.
+
+Workers serialize per player through ``ledger_leases`` documents: a batch
+takes the lease of each of its players (in id order, so batches cannot
+deadlock) before inserting, and keeps them until its contest refreshes are
+applied. A rebuild therefore never reads another batch's unset
+``cumulative``, and two batches for one player reach the contests in the
+order they were recorded.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.common.enums.contests import ContestStatus, PointsScope
+from app.models.contest import Contest
+from app.models.ledger_lease import LedgerLease
+from app.models.player_points_event import PlayerPointsEvent
+from app.services.scoring.coalescer import points_coalescer
+from app.utils.timezone import now_ist, to_ist
+
+logger = logging.getLogger(__name__)
+
+# Number of cumulative updates sent per bulk write
+LEDGER_WRITE_BATCH_SIZE = 1000
+# MongoDB duplicate key error code (replayed event_id)
+DUPLICATE_KEY_ERROR = 11000
+
+# A lease not released within this time (its worker died) can be taken over
+LEDGER_LEASE_SECONDS = 60.0
+# Pause between attempts to take a lease held by another batch
+LEDGER_LEASE_RETRY_SECONDS = 0.05
+
+
+def _events_collection():
+    return PlayerPointsEvent.get_motor_collection()
+
+
+async def _acquire_lease(player_id: ObjectId, owner: ObjectId) -> None:
+    """Wait until ``owner`` holds the ledger lease of ``player_id``."""
+    coll = LedgerLease.get_motor_collection()
+    while True:
+        now = now_ist()
+        try:
+            # matches a free (expired) or already owned lease; otherwise the upsert hits the unique index
+            await coll.update_one(
+                {"player_id": player_id, "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=LEDGER_LEASE_SECONDS)}},
+                upsert=True,
+            )
+            return
+        except DuplicateKeyError:
+            await asyncio.sleep(LEDGER_LEASE_RETRY_SECONDS)
+
+
+@asynccontextmanager
+async def _player_leases(player_ids: Iterable[ObjectId]) -> AsyncIterator[None]:
+    """Hold the ledger leases of ``player_ids`` (taken in id order) for the block."""
+    owner = ObjectId()
+    held: List[ObjectId] = []
+    try:
+        for pid in sorted(set(player_ids)):
+            await _acquire_lease(pid, owner)
+            held.append(pid)
+        yield
+    finally:
+        if held:
+            await LedgerLease.get_motor_collection().delete_many({"player_id": {"$in": held}, "owner": owner})
+
+
+async def record_points_events(events: List[PlayerPointsEvent]) -> Dict[str, int]:
+    """Append ``events`` to the ledger and refresh every overlapping time-window contest.
+
+    Events carrying an already recorded ``event_id`` are skipped. Returns the
+    number of recorded and duplicate events and of contests refreshed.
+    """
+    if not events:
+        return {"recorded": 0, "duplicates": 0, "contests": 0}
+
+    now = now_ist()
+    docs = []
+    for event in events:
+        doc = {
+            "player_id": ObjectId(str(event.player_id)),
+            "points": float(event.points),
+            "occurred_at": to_ist(event.occurred_at),
+            "cumulative": 0.0,
+            "source": event.source,
+            "created_at": now,
+        }
+        if event.event_id:
+            doc["event_id"] = event.event_id
+        docs.append(doc)
+
+    async with _player_leases(doc["player_id"] for doc in docs):
+        failed: Set[int] = set()
+        try:
+            await _events_collection().insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(err.get("code") != DUPLICATE_KEY_ERROR for err in errors):
+                raise
+            failed = {err["index"] for err in errors}
+        recorded = [doc for i, doc in enumerate(docs) if i not in failed]
+
+        # rebuild prefix sums from each player's earliest new event onwards
+        since_by_player: Dict[ObjectId, datetime] = {}
+        for doc in recorded:
+            pid = doc["player_id"]
+            if pid not in since_by_player or doc["occurred_at"] < since_by_player[pid]:
+                since_by_player[pid] = doc["occurred_at"]
+        for pid, since in since_by_player.items():
+            await _rebuild_prefix_sums(pid, since)
+
+        contests = await _refresh_time_window_contests(recorded) if recorded else 0
+    return {"recorded": len(recorded), "duplicates": len(failed), "contests": contests}
+
+
+async def _rebuild_prefix_sums(player_id: ObjectId, since: datetime) -> None:
+    """Recompute ``cumulative`` for the events of ``player_id`` at or after ``since``.
+
+    Appends in time order only touch the new events; a late event also shifts
+    the ones after it.
+    """
+    running = await cumulative_at(player_id, since, inclusive=False)
+    cursor = _events_collection().find(
+        {"player_id": player_id, "occurred_at": {"$gte": since}},
+        projection={"points": 1, "cumulative": 1},
+    ).sort([("occurred_at", 1), ("_id", 1)])
+    ops: List[UpdateOne] = []
+    async for doc in cursor:
+        running += float(doc.get("points") or 0.0)
+        if float(doc.get("cumulative") or 0.0) != running:
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"cumulative": running}}))
+    for start in range(0, len(ops), LEDGER_WRITE_BATCH_SIZE):
+        await _events_collection().bulk_write(ops[start: start + LEDGER_WRITE_BATCH_SIZE], ordered=False)
+
+
+async def cumulative_at(player_id: ObjectId, at: datetime, inclusive: bool = True) -> float:
+    """Return the running total of ``player_id`` at ``at`` (events at ``at`` count when ``inclusive``)."""
+    doc = await _events_collection().find_one(
+        {"player_id": player_id, "occurred_at": {"$lte" if inclusive else "$lt": at}},
+        projection={"cumulative": 1},
+        sort=[("occurred_at", -1), ("_id", -1)],
+    )
+    return float(doc.get("cumulative") or 0.0) if doc else 0.0
+
+
+async def window_points(player_ids: Iterable[ObjectId], start_at: datetime, end_at: datetime) -> Dict[ObjectId, float]:
+    """Return the points each player scored between ``start_at`` and ``end_at`` (inclusive)."""
+
+    async def one(pid: ObjectId) -> float:
+        end_total, start_total = await asyncio.gather(
+            cumulative_at(pid, end_at, inclusive=True),
+            cumulative_at(pid, start_at, inclusive=False),
+        )
+        return end_total - start_total
+
+    ids = list(player_ids)
+    totals = await asyncio.gather(*(one(pid) for pid in ids))
+    return dict(zip(ids, totals))
+
+
+async def _refresh_time_window_contests(recorded: List[dict]) -> int:
+    """Refresh every time-window contest whose window contains any of the ``recorded`` events.
+
+    Only players with a new event inside a contest's window are rewritten there.
+    """
+    first = min(doc["occurred_at"] for doc in recorded)
+    last = max(doc["occurred_at"] for doc in recorded)
+    contests = await Contest.find({
+        "points_scope": PointsScope.TIME_WINDOW.value,
+        "status": {"$ne": ContestStatus.ARCHIVED.value},
+        "start_at": {"$lte": last},
+        "end_at": {"$gte": first},
+    }).to_list()
+    submits = []
+    for contest in contests:
+        start_at, end_at = to_ist(contest.start_at), to_ist(contest.end_at)
+        player_ids = {doc["player_id"] for doc in recorded if start_at <= doc["occurred_at"] <= end_at}
+        if not player_ids:
+            continue
+        points = await window_points(player_ids, start_at, end_at)
+        submits.append(points_coalescer.submit(contest, points))
+    # submitted together, all contests are applied in the same scoring tick
+    await asyncio.gather(*submits)
+    refreshed = len(submits)
+    if refreshed:
+        logger.info("Ledger refreshed %s contests from %s events", refreshed, len(recorded))
+    return refreshed
+
+
+async def get_player_events(
+    player_id: ObjectId,
+    start_at: Optional[datetime] = None,
+    end_at: Optional[datetime] = None,
+    limit: int = 200,
+) -> List[PlayerPointsEvent]:
+    """Return the ledger entries of ``player_id``, newest first."""
+    query: dict = {"player_id": player_id}
+    window: dict = {}
+    if start_at is not None:
+        window["$gte"] = start_at
+    if end_at is not None:
+        window["$lte"] = end_at
+    if window:
+        query["occurred_at"] = window
+    return await PlayerPointsEvent.find(query).sort(
+        [("occurred_at", -1), ("_id", -1)]
+    ).limit(limit).to_list()
@@ -0,0 +1,124 @@
+"""Server-side contest leaderboard aggregation.
+
+An alternative to the in-process lineup matrix for very large contests: the
+whole join (enrollments -> teams -> player_contest_points), the captain /
+vice-captain multipliers, the sum per team and the ranking run inside MongoDB,
+and only the requested page plus the caller's row come back over the wire.
+Requires MongoDB 5.0+ (``$setWindowFields``).
+"""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from bson import ObjectId
+
+from app.common.consts.index import CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.scoring.rank_index import RankedRow
+
+
+class ContestLeaderboardPage:
+    """One page of an aggregated contest leaderboard."""
+
+    def __init__(self, total: int, rows: List[RankedRow], me: Optional[RankedRow] = None):
+        self.total = total
+        self.rows = rows
+        self.me = me
+
+
+def _ranked_teams_pipeline(contest_id: ObjectId) -> List[dict]:
+    """Stages producing one ``{_id: team_id, user_id, points, rank}`` document per enrolled team."""
+    return [
+        {"$match": {"contest_id": contest_id, "status": EnrollmentStatus.ACTIVE.value}},
+        {"$project": {"_id": 0, "team_id": 1, "user_id": 1}},
+        {"$lookup": {
+            "from": Team.Settings.name,
+            "localField": "team_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"player_ids": 1, "captain_id": 1, "vice_captain_id": 1}}],
+            "as": "team",
+        }},
+        {"$unwind": "$team"},
+        {"$unwind": {"path": "$team.player_ids", "preserveNullAndEmptyArrays": True}},
+        {"$lookup": {
+            "from": PlayerContestPoints.Settings.name,
+            "let": {
+                "pid": {"$convert": {"input": "$team.player_ids", "to": "objectId", "onError": None, "onNull": None}},
+            },
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$contest_id", contest_id]},
+                    {"$eq": ["$player_id", "$$pid"]},
+                ]}}},
+                {"$project": {"_id": 0, "points": 1}},
+                {"$limit": 1},
+            ],
+            "as": "pcp",
+        }},
+        {"$group": {
+            "_id": "$team_id",
+            "user_id": {"$first": "$user_id"},
+            "points": {"$sum": {"$multiply": [
+                {"$ifNull": [{"$first": "$pcp.points"}, 0]},
+                {"$switch": {
+                    "branches": [
+                        # captain/vice-captain ids are stored as strings
+                        {"case": {"$eq": [{"$toString": "$team.player_ids"}, "$team.captain_id"]}, "then": CAPTAIN_MULTIPLIER},
+                        {"case": {"$eq": [{"$toString": "$team.player_ids"}, "$team.vice_captain_id"]}, "then": VICE_CAPTAIN_MULTIPLIER},
+                    ],
+                    "default": 1,
+                }},
+            ]}},
+        }},
+        # same ordering as the lineup matrix: points desc, team id asc
+        {"$setWindowFields": {
+            "sortBy": {"points": -1, "_id": 1},
+            "output": {"rank": {"$documentNumber": {}}},
+        }},
+    ]
+
+
+def _to_row(doc: dict) -> RankedRow:
+    return int(doc["rank"]), str(doc["_id"]), str(doc["user_id"]), float(doc.get("points") or 0.0)
+
+
+async def aggregate_contest_leaderboard(
+    contest: Contest,
+    skip: int = 0,
+    limit: int = 100,
+    user_id: Optional[ObjectId] = None,
+    team_id: Optional[ObjectId] = None,
+) -> ContestLeaderboardPage:
+    """Rank ``contest`` inside MongoDB and return one page.
+
+    ``me`` is the best ranked team of ``user_id``, or the row of ``team_id``
+    when given.
+    """
+    facets: dict = {"total": [{"$count": "n"}]}
+    if limit > 0:
+        facets["page"] = [{"$sort": {"rank": 1}}, {"$skip": skip}, {"$limit": limit}]
+    me_match: Optional[dict] = None
+    if team_id is not None:
+        me_match = {"_id": team_id}
+    elif user_id is not None:
+        me_match = {"user_id": user_id}
+    if me_match is not None:
+        facets["me"] = [{"$match": me_match}, {"$sort": {"rank": 1}}, {"$limit": 1}]
+
+    pipeline = _ranked_teams_pipeline(contest.id) + [{"$facet": facets}]
+    result = await TeamContestEnrollment.get_motor_collection().aggregate(
+        pipeline, allowDiskUse=True
+    ).to_list(length=1)
+    facet = result[0] if result else {}
+
+    total_docs = facet.get("total") or []
+    me_docs = facet.get("me") or []
+    return ContestLeaderboardPage(
+        total=int(total_docs[0]["n"]) if total_docs else 0,
+        rows=[_to_row(d) for d in facet.get("page") or []],
+        me=_to_row(me_docs[0]) if me_docs else None,
+    )
@@ -0,0 +1,108 @@
+"""Contest player points writes.
+
+Points of one contest are written with a single unordered ``bulk_write`` of
+upserts keyed on ``(contest_id, player_id)``; the unique index on that pair
+makes replays idempotent. Full contests mirror the same values into
+``Player.points`` with one atomic ``find_one_and_update`` per player (run
+concurrently), whose returned old value gives the global leaderboard delta.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from app.common.enums.contests import ContestType
+from app.models.contest import Contest
+from app.models.player import Player
+from app.models.player_contest_points import PlayerContestPoints
+from app.services import catalog
+from app.services import leaderboard as leaderboard_svc
+from app.services.scoring.engine import bump_points_version
+from app.utils.timezone import now_ist
+
+logger = logging.getLogger(__name__)
+
+
+async def upsert_contest_points(contest: Contest, points_by_player: Dict[ObjectId, float]) -> datetime:
+    """Upsert the points of ``contest`` for every player in ``points_by_player``.
+
+    Returns the ``updated_at`` timestamp written to every document.
+    """
+    now = now_ist()
+    ops: List[UpdateOne] = [
+        UpdateOne(
+            {"contest_id": contest.id, "player_id": player_id},
+            {"$set": {"points": float(points), "updated_at": now}},
+            upsert=True,
+        )
+        for player_id, points in points_by_player.items()
+    ]
+    if ops:
+        await PlayerContestPoints.get_motor_collection().bulk_write(ops, ordered=False)
+    return now
+
+
+async def mirror_player_points(points_by_player: Dict[ObjectId, float]) -> Dict[str, float]:
+    """Set ``Player.points`` to the given values for players that exist.
+
+    Each player is written with ``find_one_and_update`` returning the document
+    as it was, so the old value comes from the write itself and concurrent
+    writers never compute their delta against the same stale value. Returns
+    ``player_id -> new - old`` for the global leaderboard.
+    """
+    now = now_ist()
+    coll = Player.get_motor_collection()
+
+    async def write(player_id: ObjectId, points: float) -> Optional[dict]:
+        return await coll.find_one_and_update(
+            {"_id": player_id},
+            {"$set": {"points": float(points), "updated_at": now}},
+            projection={"points": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+
+    items = list(points_by_player.items())
+    before = await asyncio.gather(*(write(pid, pts) for pid, pts in items))
+    deltas: Dict[str, float] = {}
+    written: Dict[str, float] = {}
+    for (player_id, points), doc in zip(items, before):
+        if doc is None:
+            continue
+        key = str(player_id)
+        deltas[key] = float(points) - float(doc.get("points") or 0.0)
+        written[key] = float(points)
+    if written:
+        # points only: patch the catalog instead of reloading every player on every worker
+        await catalog.update_player_points(written)
+    return deltas
+
+
+async def apply_contest_points(
+    contest: Contest,
+    points_by_player: Dict[ObjectId, float],
+) -> datetime:
+    """Write contest points and propagate them.
+
+    Upserts the points, bumps the contest's points version and, for full
+    contests, mirrors them into ``Player.points`` and shifts the global team
+    totals by the difference to the values the mirror replaced. Returns the
+    write timestamp.
+    """
+    now = await upsert_contest_points(contest, points_by_player)
+    # invalidate cached leaderboard snapshots (and their ETags) of this contest
+    await bump_points_version([contest.id])
+
+    if contest.contest_type != ContestType.DAILY and points_by_player:
+        try:
+            points_deltas = await mirror_player_points(points_by_player)
+            # Keep the materialized global leaderboard in sync with the mirrored points
+            await leaderboard_svc.apply_player_points_deltas(points_deltas)
+        except Exception:
+            # Non-blocking: the reconciliation job repairs global totals
+            logger.exception("Mirroring contest %s points into players failed", contest.id)
+    return now
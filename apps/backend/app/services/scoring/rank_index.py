@@ -0,0 +1,137 @@
+"""Per-contest rank index.
+
+A sorted list of ``(-points, team_id)`` keys answers "rank of team X" with a
+binary search, "page N" with a slice and "entries around my best team" with a
+search plus a slice. When scores move, only the teams whose total changed are
+re-positioned; a full re-sort happens only when the lineups themselves change
+or a large share of teams moved at once.
+
+The keys live in a ``sortedcontainers.SortedList`` (a list of bounded
+sublists with a positional index), so re-positioning a team and rank lookups
+are O(log n) rather than the O(n) memmove of a plain list insert.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sortedcontainers import SortedList
+
+from app.models.contest import Contest
+from app.services.scoring.engine import LineupMatrix, score_contest
+
+# (rank, team_id, user_id, points)
+RankedRow = Tuple[int, str, str, float]
+
+# Above this share of changed teams a rebuild is cheaper than repositioning one by one
+INCREMENTAL_UPDATE_MAX_RATIO = 0.05
+
+
+class ContestRankIndex:
+    """Sorted ``(-points, team_id)`` keys of one contest plus team/user lookups."""
+
+    def __init__(self, matrix: LineupMatrix, totals: np.ndarray, points_version: int = 0):
+        self.contest_id = matrix.contest_id
+        self.version = matrix.version
+        self.points_version = points_version
+        self.totals = totals.copy()
+        self._row_by_team: Dict[str, int] = {tid: i for i, tid in enumerate(matrix.team_ids)}
+        self._user_by_team: Dict[str, str] = dict(zip(matrix.team_ids, matrix.user_ids))
+        self._teams_by_user: Dict[str, Set[str]] = {}
+        for tid, uid in self._user_by_team.items():
+            self._teams_by_user.setdefault(uid, set()).add(tid)
+        order = matrix.ranking(totals)
+        self._keys = SortedList((-float(totals[r]), matrix.team_ids[r]) for r in order)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def points_of(self, team_id: str) -> Optional[float]:
+        row = self._row_by_team.get(team_id)
+        return float(self.totals[row]) if row is not None else None
+
+    def user_of(self, team_id: str) -> Optional[str]:
+        return self._user_by_team.get(team_id)
+
+    def rank(self, team_id: str) -> Optional[int]:
+        """1-based rank of ``team_id`` (O(log n))."""
+        points = self.points_of(team_id)
+        if points is None:
+            return None
+        return self._keys.bisect_left((-points, team_id)) + 1
+
+    def row(self, team_id: str) -> Optional[RankedRow]:
+        """Return the ranked row of ``team_id``, or None when it is not enrolled."""
+        rank = self.rank(team_id)
+        if rank is None:
+            return None
+        return rank, team_id, self._user_by_team[team_id], float(self.points_of(team_id))
+
+    def page(self, skip: int, limit: int) -> List[RankedRow]:
+        """Return the rows ranked ``skip + 1 .. skip + limit``."""
+        return [
+            (skip + i + 1, tid, self._user_by_team[tid], -neg_points)
+            for i, (neg_points, tid) in enumerate(self._keys.islice(skip, skip + limit))
+        ]
+
+    def best_team_of(self, user_id: str) -> Optional[str]:
+        """Return the best ranked team of ``user_id`` in this contest."""
+        team_ids = self._teams_by_user.get(str(user_id))
+        if not team_ids:
+            return None
+        return min(team_ids, key=lambda tid: (-(self.points_of(tid) or 0.0), tid))
+
+    def around(self, team_id: str, size: int) -> List[RankedRow]:
+        """Return about ``size`` entries centred on ``team_id``."""
+        rank = self.rank(team_id)
+        if rank is None or size <= 0:
+            return []
+        start = max(0, min(rank - 1 - size // 2, len(self._keys) - size))
+        return self.page(start, size)
+
+    def update(self, team_id: str, points: float) -> None:
+        """Re-position one team after its total changed."""
+        row = self._row_by_team.get(team_id)
+        if row is None:
+            return
+        self._keys.discard((-float(self.totals[row]), team_id))
+        self._keys.add((-float(points), team_id))
+        self.totals[row] = points
+
+    def apply_totals(self, matrix: LineupMatrix, totals: np.ndarray) -> bool:
+        """Bring the index in line with ``totals``; returns False when a rebuild is needed instead."""
+        if matrix.version != self.version or len(totals) != len(self.totals):
+            return False
+        changed = np.nonzero(totals != self.totals)[0]
+        if len(changed) > max(1, int(len(totals) * INCREMENTAL_UPDATE_MAX_RATIO)):
+            return False
+        for row in changed:
+            self.update(matrix.team_ids[row], float(totals[row]))
+        return True
+
+
+_indexes: Dict[str, ContestRankIndex] = {}
+
+
+async def get_rank_index(contest: Contest) -> ContestRankIndex:
+    """Return the rank index of ``contest``.
+
+    The cached index is a snapshot keyed on ``(lineup_version, points_version)``
+    and is returned as is while both are unchanged; otherwise the contest is
+    rescored and the index patched incrementally or rebuilt.
+    """
+    key = str(contest.id)
+    lineup_version = int(contest.lineup_version or 0)
+    points_version = int(contest.points_version or 0)
+    index = _indexes.get(key)
+    if index is not None and index.version == lineup_version and index.points_version == points_version:
+        return index
+
+    matrix, totals = await score_contest(contest)
+    # no awaits below: the cached index is swapped or patched atomically for this worker
+    index = _indexes.get(key)
+    if index is None or not index.apply_totals(matrix, totals):
+        index = ContestRankIndex(matrix, totals, points_version)
+        _indexes[key] = index
+    index.points_version = points_version
+    return index
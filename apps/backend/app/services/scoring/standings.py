@@ -0,0 +1,113 @@
+"""Contest standings materialized on enrollments.
+
+``TeamContestEnrollment.contest_points`` and ``rank`` mirror the rank index of
+their contest, so a leaderboard page is a range read on the
+``(contest_id, status, contest_points desc, team_id)`` index. Pages continue
+from a keyset cursor (the ``(points, team_id)`` of the previous page's last
+row) instead of ``skip``, which makes page 500 as cheap as page 1.
+
+Standings are written by the scoring tick and, for any other version change
+(enrollments, lineup edits), lazily by the first reader.
+``Contest.standings_version`` records which leaderboard version was written.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.scoring.engine import leaderboard_version
+from app.services.scoring.rank_index import RankedRow, get_rank_index
+
+# Number of standing updates sent per bulk write
+STANDINGS_WRITE_BATCH_SIZE = 1000
+
+_sync_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _enrollments():
+    return TeamContestEnrollment.get_motor_collection()
+
+
+async def sync_standings(contest: Contest) -> int:
+    """Write the current ``contest_points`` / ``rank`` of every active enrollment of ``contest``.
+
+    Only enrollments whose values changed are written. Returns that count.
+    """
+    version = leaderboard_version(contest)
+    index = await get_rank_index(contest)
+    cursor = _enrollments().find(
+        {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE.value},
+        projection={"team_id": 1, "contest_points": 1, "rank": 1},
+    )
+    ops: List[UpdateOne] = []
+    async for enr in cursor:
+        team_id = str(enr["team_id"])
+        rank = index.rank(team_id)
+        points = index.points_of(team_id) or 0.0
+        if enr.get("rank") != rank or float(enr.get("contest_points") or 0.0) != points:
+            ops.append(UpdateOne({"_id": enr["_id"]}, {"$set": {"contest_points": points, "rank": rank}}))
+    for start in range(0, len(ops), STANDINGS_WRITE_BATCH_SIZE):
+        await _enrollments().bulk_write(ops[start: start + STANDINGS_WRITE_BATCH_SIZE], ordered=False)
+    await Contest.get_motor_collection().update_one({"_id": contest.id}, {"$set": {"standings_version": version}})
+    contest.standings_version = version
+    return len(ops)
+
+
+async def ensure_standings(contest: Contest) -> None:
+    """Bring the materialized standings of ``contest`` up to its current leaderboard version."""
+    if contest.standings_version == leaderboard_version(contest):
+        return
+    lock = _sync_locks.setdefault(str(contest.id), asyncio.Lock())
+    async with lock:
+        current = await Contest.get_motor_collection().find_one(
+            {"_id": contest.id}, projection={"standings_version": 1}
+        )
+        if current and current.get("standings_version") == leaderboard_version(contest):
+            contest.standings_version = current["standings_version"]
+            return
+        await sync_standings(contest)
+
+
+def _to_row(doc: dict) -> RankedRow:
+    return int(doc.get("rank") or 0), str(doc["team_id"]), str(doc["user_id"]), float(doc.get("contest_points") or 0.0)
+
+
+async def standings_page(
+    contest: Contest,
+    after: Optional[Tuple[float, str]],
+    limit: int,
+) -> List[RankedRow]:
+    """Return up to ``limit`` rows ranked after ``after`` (``(points, team_id)`` of the previous page's last row)."""
+    query: dict = {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE.value}
+    if after is not None:
+        points, team_id = after
+        query["$or"] = [
+            {"contest_points": {"$lt": points}},
+            {"contest_points": points, "team_id": {"$gt": ObjectId(team_id)}},
+        ]
+    docs = await _enrollments().find(
+        query, projection={"team_id": 1, "user_id": 1, "contest_points": 1, "rank": 1}
+    ).sort([("contest_points", -1), ("team_id", 1)]).limit(limit).to_list(length=limit)
+    return [_to_row(d) for d in docs]
+
+
+async def user_standing(contest: Contest, user_id: ObjectId) -> Optional[RankedRow]:
+    """Return the best ranked row of ``user_id`` in ``contest``."""
+    docs = await _enrollments().find(
+        {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE.value, "user_id": user_id},
+        projection={"team_id": 1, "user_id": 1, "contest_points": 1, "rank": 1},
+    ).sort([("contest_points", -1), ("team_id", 1)]).limit(1).to_list(length=1)
+    return _to_row(docs[0]) if docs else None
+
+
+async def count_standings(contest: Contest) -> int:
+    """Return the number of ranked (active) enrollments of ``contest``."""
+    return await _enrollments().count_documents(
+        {"contest_id": contest.id, "status": EnrollmentStatus.ACTIVE.value}
+    )
@@ -0,0 +1,97 @@
+"""Team edit lock state.
+
+A team is locked (no update or rename) while one of its active enrollments
+is in an ongoing contest: not archived and ``start_at <= now < end_at``. The
+stored ``status`` is not consulted, since it only becomes ``ongoing`` when the
+lifecycle scheduler runs after ``start_at``.
+
+Rather than two queries per edit, this module caches:
+
+- the contest ids each team is actively enrolled in. Entries are dropped by
+  every enrollment write on the worker that made it, and they expire after
+  ``TEAM_LOCK_CACHE_TTL_SECONDS`` elsewhere.
+- each contest's time window, read from the contest cache
+  (``catalog/contests.py``), which contest writes and status transitions
+  invalidate.
+
+The lock is evaluated against the clock on every check, so a contest that
+starts while a team is cached locks it at ``start_at`` with no invalidation.
+A "locked" answer from the cache is confirmed against the database before it
+is returned. A stale entry can therefore never refuse an edit, and refusing
+is rare (only during live contests).
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.common.enums.enrollments import EnrollmentStatus
+from app.models.contest import Contest
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.services.catalog.contests import get_contests
+from config.settings import settings
+
+# Team entries kept before the cache is cleared
+MAX_CACHED_TEAMS = 100_000
+
+# team id -> (loaded at, active enrollment contest ids)
+_teams: Dict[ObjectId, Tuple[float, Tuple[ObjectId, ...]]] = {}
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    # stored datetimes are naive UTC, like ``now``
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _may_be_live(contest: Optional[Contest], now: datetime) -> bool:
+    # decided by the time window alone: the stored status only flips to ongoing when the
+    # lifecycle scheduler runs, and other workers see it after their contest cache check
+    if contest is None or contest.status == ContestStatus.ARCHIVED:
+        return False
+    return _naive_utc(contest.start_at) <= now < _naive_utc(contest.end_at)
+
+
+async def team_contest_ids(team_id: ObjectId) -> Tuple[ObjectId, ...]:
+    """Return the contests ``team_id`` is actively enrolled in (cached)."""
+    cached = _teams.get(team_id)
+    if cached is not None and time.monotonic() - cached[0] < settings.team_lock_cache_ttl_seconds:
+        return cached[1]
+    docs = await TeamContestEnrollment.get_motor_collection().find(
+        {"team_id": team_id, "status": EnrollmentStatus.ACTIVE.value},
+        projection={"contest_id": 1},
+    ).to_list(length=None)
+    contest_ids = tuple(dict.fromkeys(d["contest_id"] for d in docs))
+    if len(_teams) >= MAX_CACHED_TEAMS:
+        _teams.clear()
+    _teams[team_id] = (time.monotonic(), contest_ids)
+    return contest_ids
+
+
+async def is_team_locked(team_id: ObjectId, now: Optional[datetime] = None) -> bool:
+    """Return True when ``team_id`` is enrolled in a contest that is ongoing at ``now``."""
+    now = now or datetime.utcnow()
+    contest_ids = await team_contest_ids(team_id)
+    if not contest_ids:
+        return False
+    contests = await get_contests(contest_ids)
+    if not any(_may_be_live(c, now) for c in contests):
+        return False
+    # confirm from the database so a stale entry never blocks an edit
+    invalidate_teams([team_id])
+    contest_ids = await team_contest_ids(team_id)
+    return bool(contest_ids) and await Contest.find({
+        "_id": {"$in": list(contest_ids)},
+        "status": {"$ne": ContestStatus.ARCHIVED.value},
+        "start_at": {"$lte": now},
+        "end_at": {"$gt": now},
+    }).count() > 0
+
+
+def invalidate_teams(team_ids: Iterable[ObjectId]) -> None:
+    """Call after enrollment writes: drops the cached enrollments of ``team_ids`` on this worker."""
+    for team_id in team_ids:
+        _teams.pop(team_id, None)
@@ -0,0 +1,88 @@
+"""Online migration of ``Team.player_ids`` from strings to ObjectIds.
+
+Teams written before ``player_ids`` held ObjectIds store them as strings.
+Reads accept both forms (``TEAM_PLAYER_IDS_DUAL_READ``) while this migration
+rewrites legacy teams in batches. Progress needs no bookkeeping: only teams
+that still contain a string element match, so an interrupted run resumes
+where it stopped. Each update is guarded by the array it read, so a team
+edited mid-batch (which already writes ObjectIds) is left alone.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.models.team import Team
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+LEGACY_QUERY = {"player_ids": {"$type": "string"}}
+
+
+async def count_legacy_teams() -> int:
+    """Return the number of teams that still hold string player ids."""
+    return await Team.get_motor_collection().count_documents(LEGACY_QUERY)
+
+
+async def migrate_batch(batch_size: int = DEFAULT_BATCH_SIZE, after: Optional[ObjectId] = None) -> Dict[str, object]:
+    """Convert up to ``batch_size`` legacy teams with ``_id`` greater than ``after``.
+
+    Invalid string elements (not ObjectIds) are kept as they are. Returns the
+    number of teams scanned and migrated and the last ``_id`` seen.
+    """
+    query = dict(LEGACY_QUERY)
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    col = Team.get_motor_collection()
+    docs = await col.find(query, projection={"player_ids": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+    ops = []
+    for doc in docs:
+        current = doc.get("player_ids", [])
+        converted = [ObjectId(pid) if isinstance(pid, str) and ObjectId.is_valid(pid) else pid for pid in current]
+        if converted != current:
+            ops.append(UpdateOne({"_id": doc["_id"], "player_ids": current}, {"$set": {"player_ids": converted}}))
+    migrated = 0
+    if ops:
+        result = await col.bulk_write(ops, ordered=False)
+        migrated = result.modified_count
+    return {"scanned": len(docs), "migrated": migrated, "last_id": docs[-1]["_id"] if docs else None}
+
+
+async def migrate_team_player_ids(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+) -> Dict[str, float]:
+    """Migrate every legacy team, ``batch_size`` at a time, sleeping ``pause_seconds`` between batches."""
+    started = time.perf_counter()
+    scanned = migrated = 0
+    after: Optional[ObjectId] = None
+    while True:
+        batch = await migrate_batch(batch_size, after)
+        scanned += batch["scanned"]
+        migrated += batch["migrated"]
+        if batch["scanned"] < batch_size:
+            break
+        after = batch["last_id"]
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
+    remaining = await count_legacy_teams()
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(
+        "Team player_ids migration: scanned=%s migrated=%s remaining=%s duration_ms=%s",
+        scanned, migrated, remaining, duration_ms,
+    )
+    return {"scanned": scanned, "migrated": migrated, "remaining": remaining, "duration_ms": duration_ms}
+
+
+async def run_background_migration(batch_size: int) -> None:
+    """Run :func:`migrate_team_player_ids` once at low priority (called from the app lifespan)."""
+    try:
+        await migrate_team_player_ids(batch_size, pause_seconds=0.5)
+    except Exception:
+        logger.exception("Team player_ids migration failed; it resumes on the next start")
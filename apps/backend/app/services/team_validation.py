@@ -0,0 +1,156 @@
+"""Team lineup validation.
+
+Team create/update, contest enrollment and the batch validate endpoint share
+one rule set: captain / vice-captain membership, known players, per-slot
+selection limits and a daily contest's allowed real teams.
+:func:`compile_rules` binds the slot and player catalogs and the contest
+once; the returned :class:`LineupRules` then checks any number of lineups
+without further reads.
+"""
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Union
+
+from bson import ObjectId
+
+from app.models.contest import Contest
+from app.services import catalog
+
+
+class LineupError:
+    """One failed rule. ``data`` carries the structured details of the failure."""
+
+    __slots__ = ("code", "message", "data")
+
+    def __init__(self, code: str, message: str, data: Optional[dict] = None):
+        self.code = code
+        self.message = message
+        self.data = data
+
+    @property
+    def http_detail(self) -> Union[str, dict]:
+        """``detail`` of the 400 response the team routes return for this error."""
+        return {"message": self.message, **self.data} if self.data else self.message
+
+    def as_dict(self) -> dict:
+        return {"code": self.code, "message": self.message, "details": self.data}
+
+
+class LineupCheck:
+    """Outcome of validating one lineup, with the totals of its known players."""
+
+    def __init__(self, errors: List[LineupError], players: List[catalog.PlayerEntry]):
+        self.errors = errors
+        self.players = players
+        self.total_value = float(sum(p.price for p in players))
+        self.total_points = float(sum(p.points for p in players))
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+def check_captains(
+    player_ids: List[str],
+    captain_id: Optional[str],
+    vice_captain_id: Optional[str],
+    require_roles: bool = True,
+) -> List[LineupError]:
+    """Captain and vice-captain must be distinct selected players.
+
+    With ``require_roles=False`` (partial team updates) unset roles are skipped.
+    """
+    errors: List[LineupError] = []
+    if not captain_id:
+        if require_roles:
+            errors.append(LineupError("captain_required", "Captain is required"))
+    elif captain_id not in player_ids:
+        errors.append(LineupError("captain_not_selected", "Captain must be one of the selected players"))
+    if not vice_captain_id:
+        if require_roles:
+            errors.append(LineupError("vice_captain_required", "Vice-captain is required"))
+    elif vice_captain_id not in player_ids:
+        errors.append(LineupError("vice_captain_not_selected", "Vice-captain must be one of the selected players"))
+    if captain_id and vice_captain_id and captain_id == vice_captain_id:
+        errors.append(LineupError("captain_is_vice_captain", "Captain and vice-captain must be different players"))
+    return errors
+
+
+class LineupRules:
+    """Lineup rules compiled against one slot catalog, player catalog and (optional) contest."""
+
+    def __init__(
+        self,
+        slots: catalog.SlotCatalog,
+        players: catalog.PlayerCatalog,
+        allowed_teams: Optional[Iterable[str]] = None,
+    ):
+        self.slots = slots
+        self.players = players
+        self.allowed_teams: Optional[FrozenSet[str]] = frozenset(allowed_teams) if allowed_teams else None
+        self._allowed_list = list(allowed_teams) if allowed_teams else []
+
+    def check_allowed_teams(self, players: List[catalog.PlayerEntry]) -> Optional[LineupError]:
+        """Players of a restricted daily contest must come from its allowed real teams."""
+        if self.allowed_teams is None:
+            return None
+        disallowed = [p.name for p in players if p.team and p.team not in self.allowed_teams]
+        if not disallowed:
+            return None
+        return LineupError(
+            "disallowed_teams",
+            "Selected players include teams disallowed for this daily contest",
+            {"disallowed_players": disallowed, "allowed_teams": self._allowed_list},
+        )
+
+    def check(
+        self,
+        player_ids: List[str],
+        captain_id: Optional[str],
+        vice_captain_id: Optional[str],
+        require_roles: bool = True,
+    ) -> LineupCheck:
+        """Run every rule against one lineup; errors are listed in the order the routes report them.
+
+        ``require_roles`` is passed to :func:`check_captains`.
+        """
+        errors = check_captains(player_ids, captain_id, vice_captain_id, require_roles)
+
+        invalid = next((pid for pid in player_ids if not ObjectId.is_valid(pid)), None)
+        if invalid is not None:
+            errors.append(LineupError("invalid_player_id", f"Invalid player ID: {invalid}"))
+            return LineupCheck(errors, [])
+
+        players = [p for p in self.players.get_many(dict.fromkeys(player_ids)) if p]
+        # duplicates count as invalid, like a short $in result did
+        if len(players) != len(player_ids):
+            errors.append(LineupError("unknown_players", "Some player IDs are invalid"))
+
+        slot_counts: Dict[str, int] = {}
+        for p in players:
+            if p.slot:
+                slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
+        violations = self.slots.violations(slot_counts)
+        if violations:
+            errors.append(LineupError(
+                "slot_constraints",
+                "Team violates per-slot selection constraints",
+                {"violations": violations},
+            ))
+
+        disallowed = self.check_allowed_teams(players)
+        if disallowed is not None:
+            errors.append(disallowed)
+        return LineupCheck(errors, players)
+
+
+async def compile_rules(contest: Optional[Contest] = None) -> LineupRules:
+    """Compile the lineup rules, including ``contest``'s allowed teams when it is a restricted daily contest."""
+    allowed_teams = None
+    if contest is not None and contest.contest_type == "daily" and contest.allowed_teams:
+        allowed_teams = contest.allowed_teams
+    return LineupRules(
+        await catalog.get_slot_catalog(),
+        await catalog.get_player_catalog(),
+        allowed_teams,
+    )
@@ -0,0 +1,43 @@
+"""Canonical lineup fingerprints.
+
+Two teams have the same lineup when they pick the same players with the same
+captain and vice-captain, in any ``player_ids`` order. ``Team.lineup_hash``
+stores the fingerprint so identical lineups are one index lookup apart.
+
+``Team.player_ids`` holds ObjectIds; teams written before that still hold
+strings until ``scripts/migrate_team_player_ids.py`` (or the background
+migration) converts them, so queries match both forms meanwhile.
+"""
+import hashlib
+from typing import Iterable, List, Optional, Union
+
+from bson import ObjectId
+
+from config.settings import settings
+
+
+def lineup_hash(player_ids: Iterable[str], captain_id: Optional[str], vice_captain_id: Optional[str]) -> str:
+    """Return the SHA-1 hex fingerprint of the sorted player ids plus the captain/vice-captain pair."""
+    canonical = "{}|{}|{}".format(
+        ",".join(sorted(str(pid) for pid in player_ids)),
+        captain_id or "",
+        vice_captain_id or "",
+    )
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def player_oid(player_id: Union[str, ObjectId]) -> ObjectId:
+    """Return a ``Team.player_ids`` element as ObjectId (legacy elements are strings)."""
+    return player_id if isinstance(player_id, ObjectId) else ObjectId(player_id)
+
+
+def player_id_match(player_ids: Iterable[Union[str, ObjectId]]) -> List[Union[str, ObjectId]]:
+    """Return the stored forms to ``$in``-match ``player_ids`` against ``Team.player_ids``.
+
+    ObjectIds, plus the legacy string forms while ``TEAM_PLAYER_IDS_DUAL_READ`` is on.
+    """
+    oids = {player_oid(pid) for pid in player_ids if pid and ObjectId.is_valid(str(pid))}
+    values: List[Union[str, ObjectId]] = list(oids)
+    if settings.team_player_ids_dual_read:
+        values.extend(str(oid) for oid in oids)
+    return values
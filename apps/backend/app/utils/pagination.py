@@ -0,0 +1,139 @@
+"""Opaque keyset cursors.
+
+A cursor encodes the sort key of the last row of a page; the next page starts
+strictly after it, so deep pages cost the same index seek as the first one.
+
+:func:`paginate` applies this to any Beanie query: given the endpoint's sort
+fields (``_id`` is appended as the tie-breaker) it returns one page plus the
+``next_cursor`` of the following page. Total counts are a second query, so
+they are only run when the caller asks for them.
+"""
+import base64
+import json
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from beanie.odm.queries.find import FindMany
+from bson import json_util
+
+T = TypeVar("T")
+
+# (field, 1 for ascending | -1 for descending)
+SortSpec = List[Tuple[str, int]]
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode a sort key (JSON-serializable values) into an opaque URL-safe cursor."""
+    raw = json.dumps(key, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by :func:`encode_cursor`; raises ValueError when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(key, dict):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def with_id_tiebreak(sort: Sequence[Tuple[str, int]]) -> SortSpec:
+    """Return ``sort`` ending with ``_id`` (in the direction of the last field) so keys are unique."""
+    spec = [("_id" if field == "id" else field, direction) for field, direction in sort]
+    if not any(field == "_id" for field, _ in spec):
+        spec.append(("_id", spec[-1][1] if spec else 1))
+    return spec
+
+
+def encode_keyset(row: Any, sort: SortSpec) -> str:
+    """Encode the ``sort`` field values of ``row`` (a document or a raw dict) as a cursor.
+
+    Values go through extended JSON, so ObjectIds and datetimes survive the round trip.
+    """
+    key = []
+    for field, _ in sort:
+        if isinstance(row, dict):
+            value = row.get(field)
+        else:
+            value = getattr(row, "id" if field == "_id" else field, None)
+        key.append(value)
+    raw = json_util.dumps({"s": [field for field, _ in sort], "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_keyset(cursor: str, sort: SortSpec) -> List[Any]:
+    """Decode a cursor from :func:`encode_keyset`; raises ValueError when malformed or for another sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+        fields, key = payload["s"], payload["k"]
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    # a cursor of another sort order would select the wrong rows
+    if fields != [field for field, _ in sort] or not isinstance(key, list) or len(key) != len(sort):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def _after(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """Filter on ``field`` alone for values after ``value``; None when nothing can follow it.
+
+    MongoDB sorts null (and missing) before every other value, so nulls come
+    first ascending and last descending, and ``$gt`` / ``$lt`` never match them.
+    """
+    if value is None:
+        return {field: {"$ne": None}} if direction > 0 else None
+    if direction > 0:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: SortSpec, key: List[Any]) -> Dict[str, Any]:
+    """Return the filter selecting rows strictly after ``key`` in ``sort`` order (nullable fields included)."""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        after = _after(field, direction, key[i])
+        if after is None:
+            continue
+        clause: Dict[str, Any] = {f: key[j] for j, (f, _) in enumerate(sort[:i])}
+        clause.update(after)
+        clauses.append(clause)
+    # the tie-breaking _id is never null, so at least one clause remains
+    return {"$or": clauses}
+
+
+class Page(Generic[T]):
+    """One page of rows, the cursor of the next page (None on the last) and the optional total."""
+
+    def __init__(self, items: List[T], next_cursor: Optional[str], total: Optional[int]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+
+
+async def paginate(
+    query: FindMany,
+    sort: Sequence[Tuple[str, int]],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    include_total: bool = False,
+) -> Page:
+    """Return one page of ``query`` in ``sort`` order.
+
+    With ``cursor`` the page starts after the cursor's row (``skip`` is
+    ignored); without it ``skip`` rows are skipped, for page-number clients.
+    One extra row is read to tell whether a next page exists. Raises
+    ValueError for a malformed cursor.
+    """
+    spec = with_id_tiebreak(sort)
+    total = await query.count() if include_total else None
+    if cursor:
+        query = query.find(keyset_filter(spec, decode_keyset(cursor, spec)))
+    elif skip:
+        query = query.skip(skip)
+    rows = await query.sort(spec).limit(limit + 1).to_list()
+    next_cursor = encode_keyset(rows[limit - 1], spec) if len(rows) > limit else None
+    return Page(rows[:limit], next_cursor, total)
@@ -12,6 +12,10 @@ from app.models.admin.slot import Slot
 from app.models.admin.import_log import ImportLog
 from app.models.player import Player as PublicPlayer
 from app.models.player_contest_points import PlayerContestPoints
+from app.models.player_points_event import PlayerPointsEvent
+from app.models.ledger_lease import LedgerLease
+from app.models.rank_snapshot import RankSnapshot
+from app.models.cache_version import CacheVersion
 from app.models.password_reset import PasswordResetSession, PasswordResetToken
 
 settings = get_settings()
@@ -45,10 +49,14 @@ async def connect_to_mongo():
                 AdminPlayer,
                 PublicPlayer,
                 PlayerContestPoints,
+                PlayerPointsEvent,
+                LedgerLease,
                 Slot,
                 ImportLog,
                 Contest,
                 TeamContestEnrollment,
+                RankSnapshot,
+                CacheVersion,
                 PasswordResetSession,
                 PasswordResetToken,
             ]
@@ -51,6 +51,29 @@ class Settings(BaseSettings):
     otp_expiry_seconds: int = Field(default=600, alias="OTP_EXPIRY_SECONDS")
     otp_max_attempts: int = Field(default=5, alias="OTP_MAX_ATTEMPTS")
     reset_token_ttl_seconds: int = Field(default=600, alias="RESET_TOKEN_TTL_SECONDS")
+
+    # Background jobs (0 disables the job)
+    team_totals_reconcile_interval_seconds: int = Field(default=0, alias="TEAM_TOTALS_RECONCILE_INTERVAL_SECONDS")
+    rank_snapshot_interval_seconds: int = Field(default=0, alias="RANK_SNAPSHOT_INTERVAL_SECONDS")
+    # Rank snapshots kept per leaderboard; older ones are deleted after each new snapshot (0 keeps all)
+    rank_snapshot_keep: int = Field(default=200, alias="RANK_SNAPSHOT_KEEP")
+    # Buffer contest points updates and apply them once per tick (0 = apply immediately)
+    scoring_tick_seconds: float = Field(default=0, alias="SCORING_TICK_SECONDS")
+    # Convert legacy string Team.player_ids to ObjectIds in the background, this many teams per batch
+    team_player_ids_migration_batch_size: int = Field(default=0, alias="TEAM_PLAYER_IDS_MIGRATION_BATCH_SIZE")
+    # Also match legacy string player ids in Team queries (turn off once the migration reports 0 remaining)
+    team_player_ids_dual_read: bool = Field(default=True, alias="TEAM_PLAYER_IDS_DUAL_READ")
+    # How long a team's cached enrollments serve edit lock checks on workers that did not write them
+    team_lock_cache_ttl_seconds: float = Field(default=30, alias="TEAM_LOCK_CACHE_TTL_SECONDS")
+    # How long a cached contest document serves reads (leaderboard version bumps on other workers lag by this)
+    contest_cache_ttl_seconds: float = Field(default=2, alias="CONTEST_CACHE_TTL_SECONDS")
+    # How long a cached public contest list response is served (0 disables)
+    contest_list_cache_ttl_seconds: float = Field(default=30, alias="CONTEST_LIST_CACHE_TTL_SECONDS")
+    # Persist contest status transitions at each start_at/end_at; longest sleep between checks (0 disables)
+    contest_lifecycle_max_sleep_seconds: float = Field(default=60, alias="CONTEST_LIFECYCLE_MAX_SLEEP_SECONDS")
+
+    # Contest leaderboard ranking: "index" (in-process rank index) or "pipeline" (MongoDB aggregation)
+    contest_leaderboard_mode: str = Field(default="index", alias="CONTEST_LEADERBOARD_MODE")
     
     @property
     def cors_origins_list(self) -> list[str]:
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
@@ -20,7 +21,15 @@ from app.routes.admin import (
     players_import_router as admin_players_import_router,
     contests_router as admin_contests_router,
     users_teams_router as admin_users_teams_router,
+    leaderboard_router as admin_leaderboard_router,
+    points_events_router as admin_points_events_router,
 )
+from app.services import contest_lifecycle
+from app.services import leaderboard as leaderboard_svc
+from app.services import rank_snapshots as rank_snapshots_svc
+from app.services import team_player_ids as team_player_ids_svc
+from app.services import scoring
+from app.services import catalog
 
 # Logging configuration
 logging.basicConfig(
@@ -34,8 +43,34 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup: Connect to MongoDB
     await connect_to_mongo()
+    # Warm in-process reference data used by team validation and player reads
+    await catalog.load_slot_catalog()
+    await catalog.load_player_catalog()
+    background_tasks = []
+    if settings.team_totals_reconcile_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            leaderboard_svc.run_reconcile_loop(settings.team_totals_reconcile_interval_seconds)
+        ))
+    if settings.rank_snapshot_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            rank_snapshots_svc.run_snapshot_loop(settings.rank_snapshot_interval_seconds)
+        ))
+    if settings.scoring_tick_seconds > 0:
+        background_tasks.append(scoring.points_coalescer.start(settings.scoring_tick_seconds))
+    if settings.contest_lifecycle_max_sleep_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            contest_lifecycle.run_lifecycle_scheduler(settings.contest_lifecycle_max_sleep_seconds)
+        ))
+    if settings.team_player_ids_migration_batch_size > 0:
+        background_tasks.append(asyncio.create_task(
+            team_player_ids_svc.run_background_migration(settings.team_player_ids_migration_batch_size)
+        ))
     yield
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Stop background jobs (the scoring coalescer flushes what it buffered),
+    # then close MongoDB connection
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
     await close_mongo_connection()
 
 
@@ -73,6 +108,8 @@ app.include_router(admin_slots_router)
 app.include_router(admin_players_import_router)
 app.include_router(admin_contests_router)
 app.include_router(admin_users_teams_router)
+app.include_router(admin_leaderboard_router)
+app.include_router(admin_points_events_router)
 app.include_router(players_router)
 app.include_router(players_hot_router)
 app.include_router(slots_router)
@@ -0,0 +1,23 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.services.contest_lifecycle import apply_transitions
+
+
+async def main() -> None:
+    await connect_to_mongo()
+    try:
+        moved = await apply_transitions()
+        summary = " ".join(f"{status}={count}" for status, count in moved.items()) or "none"
+        print(f"[LIFECYCLE] moved {summary}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Backfill: set Team.lineup_hash on teams saved before lineup fingerprints existed.
+Only teams without a fingerprint are touched, so the script can be re-run safely.
+Run: python scripts/backfill_team_lineup_hash.py
+"""
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+from pymongo import UpdateOne
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.models.team import Team
+from app.utils.lineup import lineup_hash
+
+BATCH_SIZE = 1000
+
+
+async def main() -> None:
+    await connect_to_mongo()
+    try:
+        col = Team.get_motor_collection()
+        cursor = col.find(
+            {"$or": [{"lineup_hash": {"$exists": False}}, {"lineup_hash": None}]},
+            projection={"player_ids": 1, "captain_id": 1, "vice_captain_id": 1},
+        )
+        ops = []
+        updated = 0
+        async for doc in cursor:
+            key = lineup_hash(doc.get("player_ids", []), doc.get("captain_id"), doc.get("vice_captain_id"))
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"lineup_hash": key}}))
+            if len(ops) >= BATCH_SIZE:
+                await col.bulk_write(ops, ordered=False)
+                updated += len(ops)
+                ops = []
+        if ops:
+            await col.bulk_write(ops, ordered=False)
+            updated += len(ops)
+        print(f"[BACKFILL] teams fingerprinted -> {updated}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
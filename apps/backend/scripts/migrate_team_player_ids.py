@@ -0,0 +1,31 @@
+"""
+Migration: store Team.player_ids as ObjectIds instead of strings.
+- Only teams that still hold string ids are touched, so the script can be stopped and re-run.
+- Reads match both forms while TEAM_PLAYER_IDS_DUAL_READ is on; turn it off once this reports remaining=0.
+Run: python scripts/migrate_team_player_ids.py [batch_size]
+"""
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.services.team_player_ids import DEFAULT_BATCH_SIZE, migrate_team_player_ids
+
+
+async def main(batch_size: int) -> None:
+    await connect_to_mongo()
+    try:
+        report = await migrate_team_player_ids(batch_size)
+        print(
+            f"[MIGRATION] scanned={report['scanned']} migrated={report['migrated']} "
+            f"remaining={report['remaining']} duration_ms={report['duration_ms']}"
+        )
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE))
@@ -0,0 +1,58 @@
+"""
+Migration: make player_contest_points unique per (contest_id, player_id).
+- Removes duplicate documents, keeping the most recently updated one per pair.
+- Drops the old non-unique (contest_id, player_id) index, which conflicts with the new one.
+- Creates the unique index `contest_player_unique`.
+Connects without Beanie because app startup cannot create the unique index until this has run.
+Run: python scripts/migrate_unique_player_contest_points.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DeleteMany
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+OLD_INDEX_KEY = [("contest_id", 1), ("player_id", 1)]
+
+
+async def migrate() -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        col = client[settings.mongodb_db_name]["player_contest_points"]
+
+        # Keep the newest document of every (contest_id, player_id) pair
+        duplicates = col.aggregate([
+            {"$sort": {"updated_at": -1, "_id": -1}},
+            {"$group": {"_id": {"c": "$contest_id", "p": "$player_id"}, "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+            {"$match": {"n": {"$gt": 1}}},
+        ], allowDiskUse=True)
+        stale_ids = []
+        async for group in duplicates:
+            stale_ids.extend(group["ids"][1:])
+        if stale_ids:
+            await col.bulk_write([DeleteMany({"_id": {"$in": stale_ids}})], ordered=False)
+        print(f"[MIGRATION] removed duplicate player_contest_points -> {len(stale_ids)}")
+
+        async for index in col.list_indexes():
+            if list(index["key"].items()) == OLD_INDEX_KEY and not index.get("unique"):
+                await col.drop_index(index["name"])
+                print(f"[MIGRATION] dropped index {index['name']}")
+
+        await col.create_index(
+            [("contest_id", ASCENDING), ("player_id", ASCENDING)], unique=True, name="contest_player_unique"
+        )
+        print("[MIGRATION] ensured unique index contest_player_unique")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,24 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.services.leaderboard import reconcile_team_totals
+
+
+async def main() -> None:
+    await connect_to_mongo()
+    try:
+        report = await reconcile_team_totals()
+        print(
+            f"[RECONCILE] scanned={report['scanned']} changed={report['changed']} duration_ms={report['duration_ms']}"
+        )
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,6 +25,7 @@ export function usePlayersSection() {
       const params: GetPlayersParams = {
         page,
         page_size: pageSize,
+        include_total: true,
       };
 
       if (searchQuery) params.search = searchQuery;
@@ -32,7 +33,7 @@ export function usePlayersSection() {
 
       const response = await playersApi.getPlayers(params);
       setPlayers(response.players);
-      setTotalPlayers(response.total);
+      setTotalPlayers(response.total ?? 0);
     } catch (err: any) {
       console.error("Error fetching players:", err);
       setError(err?.response?.data?.detail || "Failed to load players");
@@ -43,25 +43,24 @@ export function TeamsEditSection() {
     setError(null);
     try {
       const pageSize = 100; // backend enforces le=100
-      let page = 1;
-      let total = Infinity;
+      let cursor: string | undefined;
+      let pages = 0;
       const all: Player[] = [];
       const seen = new Set<string>();
 
-      while (all.length < total) {
-        const res = await playersApi.getPlayers({ page, page_size: pageSize });
-        total = res.total;
+      do {
+        const res = await playersApi.getPlayers({ page_size: pageSize, cursor });
         for (const p of res.players) {
           if (!seen.has(p.id)) {
             seen.add(p.id);
             all.push(p);
           }
         }
-        if (res.players.length < pageSize) break; // no more pages
-        page += 1;
+        cursor = res.next_cursor ?? undefined; // absent on the last page
+        pages += 1;
         // Safety cap to prevent infinite loops
-        if (page > 1000) break;
-      }
+        if (pages > 1000) break;
+      } while (cursor);
 
       setPlayers(all);
     } catch (e: unknown) {
@@ -14,9 +14,10 @@ export interface CarouselImage {
 
 export interface CarouselImagesListResponse {
     images: CarouselImage[];
-    total: number;
+    total?: number; // only sent with include_total=true
     page: number;
     page_size: number;
+    next_cursor?: string | null;
 }
 
 export interface CarouselImageCreate {
@@ -23,9 +23,10 @@ export interface Contest {
 
 export interface ContestListResponse {
   contests: Contest[];
-  total: number;
+  total?: number; // only sent with include_total=true
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface ContestCreate {
@@ -38,9 +38,10 @@ export interface PlayerUpdate {
 
 export interface PlayerListResponse {
   players: Player[];
-  total: number;
+  total?: number; // only sent with include_total=true
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface GetPlayersParams {
@@ -50,6 +51,8 @@ export interface GetPlayersParams {
   status?: string;
   sort_by?: string;
   sort_order?: 'asc' | 'desc';
+  cursor?: string;
+  include_total?: boolean;
 }
 
 export const playersApi = {
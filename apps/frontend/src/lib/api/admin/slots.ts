@@ -32,9 +32,10 @@ export interface SlotUpdate {
 
 export interface SlotListResponse {
   slots: Slot[];
-  total: number;
+  total?: number; // only sent with include_total=true
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface GetSlotsParams {
@@ -44,6 +45,8 @@ export interface GetSlotsParams {
   category?: string;
   sort_by?: string;
   sort_order?: "asc" | "desc";
+  cursor?: string;
+  include_total?: boolean;
 }
 
 export interface PlayerSummary {
@@ -26,7 +26,8 @@ export interface TeamResponse {
 
 export interface TeamsListResponse {
   teams: TeamResponse[];
-  total: number;
+  total?: number; // only sent with include_total=true
+  next_cursor?: string | null;
 }
 
 /**